@@ -835,7 +835,8 @@ def generate_installment_detail(installment_id: int) -> dict:
         ),
         "steps": [
             "1) Provide Dockerfile and a compose file for local dev services (storage, optional mlflow).",
-            "2) Implement sync_service.py to pull approved Earth facts to local cache when online.",
+            "2) Implement sync_service.py: watermark-based delta export/import of facts, hypotheses and retractions "
+            "with checksummed manifests, so offline nodes catch up on what changed when online.",
             "3) Add CLI flag to run system in offline-mode reading only local caches."
         ],
         "templates": [
@@ -853,14 +854,12 @@ def generate_installment_detail(installment_id: int) -> dict:
             {
                 "path": f"{base}\\src\\sync\\sync_service.py",
                 "content": (
-                    "# sync_service.py — minimal safe skeleton\n"
-                    "from src.motherboard.api import get_universe_hypotheses, get_earth_facts\n\n"
-                    "def sync_to_local(cache_dir: str = 'cache'):\n"
-                    "    # in prod: fetch from remote motherboard; here we read current local state\n"
-                    "    hyps = get_universe_hypotheses()\n"
-                    "    facts = get_earth_facts()\n    \n"
-                    "    # write simple cache manifests\n"
-                    "    print('synced', len(hyps), 'hypotheses and', len(facts), 'facts')\n"
+                    "# sync_service.py — delta sync of offline replicas\n"
+                    "from src.sync.sync_service import publish, remote_for, sync_from\n\n"
+                    "def sync_to_local(source: str):\n"
+                    "    # primary: publish(export_dir) after writes; replica: pull only the new chunks\n"
+                    "    totals = sync_from(remote_for(source))\n"
+                    "    print('synced', totals['records'], 'records,', totals['stored'], 'new')\n"
                 )
             }
         ]
@@ -0,0 +1,216 @@
+"""
+Columnar analytics snapshot of the Earth facts.
+
+The snapshot keeps confidence, timestamp, trust_tier and source as NumPy
+columns on disk (tiers and sources dictionary-encoded) and opens them
+memory-mapped, so dashboards and threshold audits aggregate vectorized without
+touching fact payloads. It is rebuilt from the store when it falls behind.
+"""
+import json
+import os
+import shutil
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from src.common.logging import get_logger
+from src.motherboard.api import EARTH_DIR, earth_generation, iter_earth_facts
+
+log = get_logger("analytics")
+
+SNAPSHOT_DIR = EARTH_DIR / "analytics"
+CURRENT = "CURRENT"
+SNAPSHOT_FIELDS = ("confidence", "timestamp", "trust_tier", "source")
+
+def _encode(value: Optional[str], codes: Dict[str, int]) -> int:
+    key = "" if value is None else str(value)
+    if key not in codes:
+        codes[key] = len(codes)
+    return codes[key]
+
+def build_snapshot(directory: Path = SNAPSHOT_DIR) -> Dict[str, Any]:
+    """
+    Scans the store once and publishes a new snapshot version. Each record is
+    still parsed in full as it is read; only the SNAPSHOT_FIELDS header values
+    are kept. Readers switch over atomically via the CURRENT pointer.
+    """
+    generation = earth_generation()
+    confidence, timestamp, tier, source = array("d"), array("q"), array("i"), array("i")
+    tier_codes: Dict[str, int] = {}
+    source_codes: Dict[str, int] = {}
+    for fact in iter_earth_facts(projection=SNAPSHOT_FIELDS):
+        c = fact.get("confidence")
+        confidence.append(float(c) if c is not None else float("nan"))
+        timestamp.append(int(fact.get("timestamp") or 0))
+        tier.append(_encode(fact.get("trust_tier"), tier_codes))
+        source.append(_encode(fact.get("source"), source_codes))
+
+    directory.mkdir(parents=True, exist_ok=True)
+    version = f"v{generation:012d}-{time.time_ns()}"
+    target = directory / version
+    staging = directory / f"{version}.tmp"
+    staging.mkdir()
+    columns = {
+        "confidence": np.frombuffer(confidence, dtype=np.float64),
+        "timestamp": np.frombuffer(timestamp, dtype=np.int64),
+        "tier": np.frombuffer(tier, dtype=np.int32),
+        "source": np.frombuffer(source, dtype=np.int32),
+    }
+    for name, values in columns.items():
+        np.save(staging / f"{name}.npy", values)
+    manifest = {
+        "generation": generation,
+        "rows": len(confidence),
+        "built_at": int(time.time()),
+        "tiers": list(tier_codes),
+        "sources": list(source_codes),
+    }
+    with open(staging / "manifest.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(staging, target)
+
+    pointer = directory / f"{CURRENT}.tmp"
+    pointer.write_text(version, encoding="utf-8")
+    os.replace(pointer, directory / CURRENT)
+    _prune(directory, keep=version)
+    log.info(f"Built analytics snapshot {version} ({manifest['rows']} facts)")
+    return manifest
+
+def _prune(directory: Path, keep: str) -> None:
+    """Removes older versions; one previous version stays for readers still holding it."""
+    versions = sorted(p for p in directory.iterdir() if p.is_dir() and p.name != keep)
+    for old in versions[:-1]:
+        shutil.rmtree(old, ignore_errors=True)
+
+class FactSnapshot:
+    """Read-only, memory-mapped view of one snapshot version."""
+
+    def __init__(self, directory: Path = SNAPSHOT_DIR):
+        version = (directory / CURRENT).read_text(encoding="utf-8").strip()
+        path = directory / version
+        with open(path / "manifest.json", "r", encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self.version = version
+        self.tiers: List[str] = self.manifest["tiers"]
+        self.sources: List[str] = self.manifest["sources"]
+        self.confidence = np.load(path / "confidence.npy", mmap_mode="r")
+        self.timestamp = np.load(path / "timestamp.npy", mmap_mode="r")
+        self.tier = np.load(path / "tier.npy", mmap_mode="r")
+        self.source = np.load(path / "source.npy", mmap_mode="r")
+
+    @property
+    def generation(self) -> int:
+        return self.manifest["generation"]
+
+    def __len__(self) -> int:
+        return self.manifest["rows"]
+
+    def _mask(self, tier: Optional[str] = None, source: Optional[str] = None,
+              since: Optional[int] = None, until: Optional[int] = None) -> np.ndarray:
+        mask = np.ones(len(self), dtype=bool)
+        if tier is not None:
+            mask &= self.tier == (self.tiers.index(tier) if tier in self.tiers else -1)
+        if source is not None:
+            mask &= self.source == (self.sources.index(source) if source in self.sources else -1)
+        if since is not None:
+            mask &= self.timestamp >= since
+        if until is not None:
+            mask &= self.timestamp <= until
+        return mask
+
+    def count(self, min_confidence: Optional[float] = None, **filters) -> int:
+        """Number of facts matching tier/source/since/until and an optional confidence floor."""
+        mask = self._mask(**filters)
+        if min_confidence is not None:
+            mask &= self.confidence >= min_confidence
+        return int(mask.sum())
+
+    def tier_histogram(self) -> Dict[str, int]:
+        counts = np.bincount(self.tier, minlength=len(self.tiers))
+        return {name: int(n) for name, n in zip(self.tiers, counts)}
+
+    def confidence_histogram(self, bins: int = 10, value_range: Tuple[float, float] = (0.0, 1.0),
+                             **filters) -> Dict[str, List[float]]:
+        values = self.confidence[self._mask(**filters)]
+        counts, edges = np.histogram(values[~np.isnan(values)], bins=bins, range=value_range)
+        return {"edges": edges.tolist(), "counts": counts.tolist()}
+
+    def group_by_tier(self, **filters) -> Dict[str, Dict[str, float]]:
+        """count / mean / min / max confidence per trust tier."""
+        mask = self._mask(**filters) & ~np.isnan(self.confidence)
+        codes = self.tier[mask]
+        values = self.confidence[mask]
+        if not len(codes):
+            return {}
+        n = len(self.tiers)
+        counts = np.bincount(codes, minlength=n)
+        sums = np.bincount(codes, weights=values, minlength=n)
+        order = np.argsort(codes, kind="stable")
+        sorted_codes, sorted_values = codes[order], values[order]
+        starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+        present = sorted_codes[starts]
+        mins = np.minimum.reduceat(sorted_values, starts)
+        maxs = np.maximum.reduceat(sorted_values, starts)
+        return {
+            self.tiers[code]: {
+                "count": int(counts[code]),
+                "mean": float(sums[code] / counts[code]),
+                "min": float(lo),
+                "max": float(hi),
+            }
+            for code, lo, hi in zip(present, mins, maxs)
+        }
+
+    def time_buckets(self, width: int = 3600, **filters) -> Dict[str, List[float]]:
+        """Fact count and mean confidence per `width`-second bucket (bucket start timestamps)."""
+        mask = self._mask(**filters)
+        stamps = self.timestamp[mask]
+        if not len(stamps):
+            return {"start": [], "counts": [], "mean_confidence": []}
+        values = np.nan_to_num(self.confidence[mask])
+        buckets = (stamps - stamps.min()) // width
+        counts = np.bincount(buckets)
+        sums = np.bincount(buckets, weights=values)
+        used = np.flatnonzero(counts)
+        return {
+            "start": (stamps.min() + used * width).tolist(),
+            "counts": counts[used].tolist(),
+            "mean_confidence": (sums[used] / counts[used]).tolist(),
+        }
+
+_snapshot: Optional[FactSnapshot] = None
+_snapshot_lock = threading.Lock()
+
+def get_snapshot(max_age: int = 300, directory: Path = SNAPSHOT_DIR) -> FactSnapshot:
+    """
+    Returns the current snapshot, rebuilding it first if none exists or it lags
+    the store and is older than `max_age` seconds.
+    """
+    global _snapshot
+    with _snapshot_lock:
+        if not (directory / CURRENT).exists():
+            build_snapshot(directory)
+        current = FactSnapshot(directory)
+        stale = current.generation < earth_generation()
+        if stale and time.time() - current.manifest["built_at"] >= max_age:
+            build_snapshot(directory)
+            current = FactSnapshot(directory)
+        if _snapshot is None or _snapshot.version != current.version:
+            _snapshot = current
+        return _snapshot
+
+def start_snapshot_refresher(interval: int = 300, directory: Path = SNAPSHOT_DIR) -> threading.Thread:
+    """Rebuilds the snapshot every `interval` seconds on a daemon thread."""
+    def loop():
+        while True:
+            try:
+                get_snapshot(max_age=interval, directory=directory)
+            except Exception as e:
+                log.error(f"Analytics snapshot refresh failed: {e}")
+            time.sleep(interval)
+
+    thread = threading.Thread(target=loop, name="analytics-snapshot", daemon=True)
+    thread.start()
+    return thread
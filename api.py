@@ -1,9 +1,26 @@
 from pathlib import Path
-from typing import Dict, Any, List
-from src.common.fileio import read_json, write_json, append_line
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional, Sequence, Mapping, Tuple, Union
+from src.common.fileio import append_lines
 from src.common.ids import make_id
 from src.common.logging import get_logger
+from src.motherboard.storage import FACTS, HYPOTHESES, StorageBackend, backend_kind, open_backend
+from src.motherboard.mvcc import UPDATE
+from src.motherboard.retractions import RETRACT
+from src.motherboard.lineage import LineageGraph
+from src.motherboard.vector_index import VectorIndex, embedding_available
+from src.motherboard.content_hash import content_hash, fact_hash, hypothesis_hash
+from src.motherboard.sharding import (
+    DEFAULT_SHARD, RECORD_TYPES, Shard, ShardRouter, ShardedRecords, decode_feed_cursor, decode_query_cursor,
+    encode_feed_cursor, encode_query_cursor, sharding_mode,
+)
+from src.motherboard.records import decode
+from src.motherboard.retention import PROVISIONAL, STATUSES, compact, retention_ttls
+import heapq
+import json
+import os
+import threading
 import time
+from itertools import islice
 
 log = get_logger("motherboard_api")
 
@@ -13,43 +30,766 @@ UNIVERSE_DIR = ROOT / "universe"
 
 EARTH_FACTS = EARTH_DIR / "facts.json"
 EARTH_LINEAGE = EARTH_DIR / "lineage.log"
+EARTH_LINEAGE_MAP = EARTH_DIR / "lineage_map.json"
+EARTH_VECTOR_INDEX = EARTH_DIR / "vector_index.npz"
 UNIVERSE_HYPS = UNIVERSE_DIR / "hypotheses.json"
+RETRACTED_LOG = UNIVERSE_DIR / "retracted.log"
 
-def get_earth_facts() -> List[Dict[str, Any]]:
-    """Retrieves all approved facts from the Motherboard."""
-    return read_json(str(EARTH_FACTS)).get("facts", [])
+# Append-only record logs backing the stores. The JSON files above are only read
+# once, to seed an empty store from a pre-existing installation.
+EARTH_LOG_DIR = EARTH_DIR / "facts_log"
+UNIVERSE_LOG_DIR = UNIVERSE_DIR / "hypotheses_log"
+# Hypotheses moved out of the hot store by compaction (see retention).
+UNIVERSE_COLD_DIR = UNIVERSE_DIR / "cold"
+SQLITE_DB = ROOT / "motherboard.db"
 
-def add_earth_fact(content: Dict[str, Any], source: str, lineage: str, trust_tier: str, confidence: float) -> Dict[str, Any]:
+# Shards other than the default one live under SHARDS_DIR/<name>/ (see sharding).
+SHARDS_DIR = ROOT / "shards"
+SHARD_SCAN_INTERVAL = 1.0
+
+_router: Optional[ShardRouter] = None
+_shards: Dict[str, Shard] = {}
+_shards_scanned_at = 0.0
+_lineage: Optional[LineageGraph] = None
+_vectors: Optional[VectorIndex] = None
+_state_lock = threading.RLock()
+
+LEGACY_SOURCES = {
+    FACTS: (EARTH_FACTS, "facts"),
+    HYPOTHESES: (UNIVERSE_HYPS, "hypotheses"),
+}
+
+def _shard(name: str) -> Shard:
+    """Opens a shard on first use. The default shard keeps the original file layout."""
+    with _state_lock:
+        if name not in _shards:
+            kind = backend_kind()
+            if name == DEFAULT_SHARD:
+                backend = open_backend(kind, {FACTS: EARTH_LOG_DIR, HYPOTHESES: UNIVERSE_LOG_DIR}, SQLITE_DB)
+                _shards[name] = Shard(name, backend, LEGACY_SOURCES, RETRACTED_LOG, UNIVERSE_COLD_DIR)
+            else:
+                directory = SHARDS_DIR / name
+                directory.mkdir(parents=True, exist_ok=True)
+                backend = open_backend(kind, {FACTS: directory / "facts_log", HYPOTHESES: directory / "hypotheses_log"},
+                                       directory / "motherboard.db")
+                _shards[name] = Shard(name, backend, cold_dir=directory / "cold")
+            log.info(f"Motherboard shard '{name}' on storage engine: {backend.name}")
+        return _shards[name]
+
+def _all_shards() -> List[Shard]:
+    """Every shard, including ones created by other processes: default first, then by name."""
+    global _shards_scanned_at
+    with _state_lock:
+        if time.monotonic() - _shards_scanned_at >= SHARD_SCAN_INTERVAL:
+            _shards_scanned_at = time.monotonic()
+            if SHARDS_DIR.is_dir():
+                for path in SHARDS_DIR.iterdir():
+                    if path.is_dir() and path.name not in _shards:
+                        _shard(path.name)
+        _shard(DEFAULT_SHARD)
+        return [_shards[DEFAULT_SHARD]] + [_shards[n] for n in sorted(_shards) if n != DEFAULT_SHARD]
+
+def shard_for(domain: Optional[str]) -> str:
+    """Name of the shard that stores records of `domain` (MOTHERBOARD_SHARDING)."""
+    global _router
+    with _state_lock:
+        if _router is None:
+            _router = ShardRouter(sharding_mode())
+        return _router.shard_for(domain)
+
+def get_backend(domain: Optional[str] = None) -> StorageBackend:
+    """The storage engine selected by MOTHERBOARD_BACKEND for `domain`'s shard (opened on first use)."""
+    return _shard(shard_for(domain)).backend
+
+def _locate(fact_id: str, catch_up: bool = True) -> Optional[Shard]:
+    """The shard holding `fact_id`. Cached shards are checked before any store is read."""
+    shards = _all_shards()
+    for shard in shards:
+        if shard.cache().peek(fact_id) is not None:
+            return shard
+    if catch_up:
+        for shard in shards:
+            if shard.cache().chain(fact_id) is not None:
+                return shard
+    return None
+
+def _stream_key(shard: Shard, name: str) -> str:
+    return name if shard.name == DEFAULT_SHARD else f"{shard.name}:{name}"
+
+def _parse_stream_key(key: str) -> Tuple[Shard, str]:
+    shard, _, name = key.rpartition(":")
+    if name not in (FACTS, HYPOTHESES):
+        raise ValueError(f"Unknown stream: {key!r}")
+    return _shard(shard or DEFAULT_SHARD), name
+
+def _lineage_graph() -> LineageGraph:
+    """The lineage graph, restored from its checkpoint and caught up with every shard."""
+    global _lineage
+    streams = {_stream_key(shard, name): shard.stream(name) for shard in _all_shards() for name in (FACTS, HYPOTHESES)}
+    with _state_lock:
+        if _lineage is None:
+            _lineage = LineageGraph(EARTH_LINEAGE_MAP, _shard(DEFAULT_SHARD).backend.name)
+            _lineage.load(streams)
+    _lineage.refresh(streams)
+    return _lineage
+
+def _vector_index() -> Optional[VectorIndex]:
+    """The semantic index of Earth facts, restored and caught up with every shard. None without an embedding model."""
+    global _vectors
+    if not embedding_available():
+        return None
+    streams = {_stream_key(shard, FACTS): shard.stream(FACTS) for shard in _all_shards()}
+    with _state_lock:
+        if _vectors is None:
+            _vectors = VectorIndex(EARTH_VECTOR_INDEX, _shard(DEFAULT_SHARD).backend.name)
+            _vectors.load(streams)
+    _vectors.refresh(streams)
+    return _vectors
+
+class EarthSnapshot:
+    """
+    A consistent, read-only view of the Earth facts pinned at one generation of every shard.
+    Later promotions and updates are invisible to it, and holding it never blocks writers.
+    """
+
+    def __init__(self, view: ShardedRecords):
+        self.facts = view
+
+    @property
+    def generation(self) -> int:
+        return self.facts.generation
+
+    @property
+    def generations(self) -> Dict[str, int]:
+        return self.facts.generations
+
+    def get_fact(self, fact_id: str) -> Optional[Mapping[str, Any]]:
+        shard = _locate(fact_id, catch_up=False)
+        if shard is None or shard.name not in self.facts.views:
+            return None
+        seq = self.facts.views[shard.name].generation
+        if shard.retractions.is_retracted(fact_id, at_seq=seq):
+            return None
+        return shard.cache().peek(fact_id).at_seq(seq)
+
+    def query_facts(self, **kwargs) -> Dict[str, Any]:
+        """query_facts() evaluated against this snapshot."""
+        return query_facts(_view=self.facts, **kwargs)
+
+def snapshot() -> EarthSnapshot:
+    """Pins the current generation of every shard's Earth facts for consistent reads."""
+    return EarthSnapshot(ShardedRecords({shard.name: shard.cache().records() for shard in _all_shards()}))
+
+def get_fact(fact_id: str, as_of: Optional[int] = None) -> Optional[Mapping[str, Any]]:
+    """
+    Returns the current version of a fact, or the version that was current at
+    unix time `as_of`. None if the fact does not exist (yet) or was retracted by then.
+    """
+    shard = _locate(fact_id)
+    if shard is None or shard.retractions.is_retracted(fact_id, as_of=as_of):
+        return None
+    chain = shard.cache().peek(fact_id)
+    return chain.latest if as_of is None else chain.as_of(as_of)
+
+def get_fact_history(fact_id: str) -> List[Mapping[str, Any]]:
+    """Every version of a fact, oldest first."""
+    shard = _locate(fact_id)
+    return [] if shard is None else list(shard.cache().peek(fact_id).versions)
+
+def get_earth_facts() -> Sequence[Mapping[str, Any]]:
+    """
+    Retrieves all approved, non-retracted facts from the Motherboard, across shards.
+    Served from the process-local caches as a read-only view; copy a fact with dict() to modify it.
+    """
+    return snapshot().facts
+
+def query_facts(fact_id: Optional[str] = None, source: Optional[str] = None,
+                trust_tier: Optional[str] = None, lineage: Optional[str] = None,
+                since: Optional[int] = None, until: Optional[int] = None,
+                descending: bool = False, limit: int = 100,
+                cursor: Optional[str] = None, domain: Optional[str] = None,
+                _view: Optional[ShardedRecords] = None) -> Dict[str, Any]:
+    """
+    Looks up Earth facts through the secondary indexes instead of scanning the store.
+    Equality filters are combined with AND, `since`/`until` bound the timestamp
+    (inclusive), and results come in timestamp order. Pass the returned
+    `next_cursor` back in to fetch the next page. Every shard is queried (only
+    `domain`'s shard if given) and the per-shard results are merged.
+    """
+    filters = {"fact_id": fact_id, "source": source, "trust_tier": trust_tier, "lineage": lineage}
+    shards = [_shard(shard_for(domain))] if domain is not None else _all_shards()
+    if _view is not None:
+        shards = [shard for shard in shards if shard.name in _view.views]
+    position = decode_query_cursor(cursor) if cursor is not None else None
+    per_shard = []
+    for shard in shards:
+        after = None
+        if position is not None:
+            ts, pos, name = position
+            # Global order is (timestamp, shard, position): translate the cursor for this shard.
+            after = (ts, pos) if shard.name == name else (ts, -1 if shard.name > name else 1 << 62)
+        cache = shard.cache()
+
+        def scan(view, shard=shard, cache=cache, after=after):
+            found = cache.index.scan(_view.views[shard.name] if _view is not None else view,
+                                     filters, since, until, descending, after)
+            return [((key[0], shard.name, key[1]), record) for key, record in islice(found, limit + 1)]
+
+        per_shard.append(cache.read(scan))
+    merged = heapq.merge(*per_shard, key=lambda item: item[0], reverse=descending)
+    page = list(islice(merged, limit + 1))
+    next_cursor = None
+    if len(page) > limit > 0:
+        ts, name, pos = page[limit - 1][0]
+        next_cursor = encode_query_cursor(ts, pos, name)
+    return {"facts": [record for _, record in page[:limit]], "next_cursor": next_cursor}
+
+RecordFilter = Union[Callable[[Dict[str, Any]], bool], Dict[str, Any], None]
+Generation = Union[int, Mapping[str, int], None]
+
+def _iter_stream(shard: Shard, name: str, filter: RecordFilter,
+                 fields: Optional[tuple], at_generation: Optional[int]) -> Iterator[Mapping[str, Any]]:
+    stream = shard.stream(name)
+    overlay = shard.overlay(name)
+    upto = stream.refresh() if at_generation is None else at_generation
+    with shard.overlay_lock:
+        if overlay.generation < upto:
+            overlay.feed(stream.replay(after=overlay.generation))
+    retractions = overlay.retractions
+    record_type = RECORD_TYPES[name]
+    for seq, raw in stream.replay_raw():
+        if seq > upto:
+            break
+        record = decode(raw, record_type)
+        if record.get("op") is not None:
+            continue
+        if retractions is not None and retractions.is_retracted(record.get(overlay.key), at_seq=upto):
+            continue
+        record = overlay.merge(record, upto)
+        if filter is not None and not filter(record):
+            continue
+        if fields is not None:
+            record = {f: record[f] for f in fields if f in record}
+        yield record
+
+def _iter_shards(name: str, filter: RecordFilter, projection: Optional[Iterable[str]],
+                 at_generation: Generation, domain: Optional[str]) -> Iterator[Mapping[str, Any]]:
+    if isinstance(filter, dict):
+        wanted = filter
+        filter = lambda record: all(record.get(k) == v for k, v in wanted.items())
+    fields = tuple(projection) if projection is not None else None
+    shards = [_shard(shard_for(domain))] if domain is not None else _all_shards()
+    for shard in shards:
+        if isinstance(at_generation, Mapping):
+            upto = at_generation.get(shard.name, 0)
+        else:
+            upto = at_generation if shard.name == DEFAULT_SHARD else None
+        yield from _iter_stream(shard, name, filter, fields, upto)
+
+def iter_earth_facts(filter: RecordFilter = None, projection: Optional[Iterable[str]] = None,
+                     at_generation: Generation = None, domain: Optional[str] = None) -> Iterator[Mapping[str, Any]]:
+    """
+    Streams the current version of each non-retracted Earth fact straight from
+    storage, one record at a time, without materializing the store. Facts come
+    as read-only records.Fact, whose content is only decoded when read. `filter` is a predicate
+    or a dict of field equalities; `projection` keeps only the listed top-level
+    fields; `at_generation` pins the read to earlier generations: a mapping from
+    earth_generations(), or an int for the default shard. `domain` limits the
+    read to that domain's shard.
+    """
+    return _iter_shards(FACTS, filter, projection, at_generation, domain)
+
+def iter_universe_hypotheses(filter: RecordFilter = None, projection: Optional[Iterable[str]] = None,
+                             at_generation: Generation = None, domain: Optional[str] = None) -> Iterator[Mapping[str, Any]]:
+    """Streams Universe hypotheses (records.Hypothesis); same arguments as iter_earth_facts."""
+    return _iter_shards(HYPOTHESES, filter, projection, at_generation, domain)
+
+def export_earth_facts(path: str, filter: RecordFilter = None, projection: Optional[Iterable[str]] = None) -> int:
+    """Writes matching facts to `path` as JSON lines, streaming. Returns the number written."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for fact in iter_earth_facts(filter, projection):
+            f.write(json.dumps(dict(fact), ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+def earth_generation() -> int:
+    """Current generation of the Earth fact store: the total number of changes across shards."""
+    return sum(earth_generations().values())
+
+def earth_generations() -> Dict[str, int]:
+    """Current generation (last sequence number) of each shard's Earth facts, for pinning reads."""
+    return {shard.name: shard.generation() for shard in _all_shards()}
+
+def fact_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters and generation of the Earth fact caches, totalled and per shard."""
+    per_shard = {shard.name: shard.cache().stats() for shard in _all_shards()}
+    totals = {k: sum(stats[k] for stats in per_shard.values()) for k in ("hits", "misses", "generation", "size")}
+    return dict(totals, shards=per_shard)
+
+def get_universe_hypotheses() -> List[Mapping[str, Any]]:
+    """Retrieves all provisional hypotheses from the Universe."""
+    return list(iter_universe_hypotheses())
+
+def add_earth_fact(content: Dict[str, Any], source: str, lineage: str, trust_tier: str, confidence: float,
+                   domain: Optional[str] = None) -> Dict[str, Any]:
     """
     Adds a new, approved fact to the Motherboard.
     This is the primary function for promoting knowledge from the Approver GOD.
     """
-    data = read_json(str(EARTH_FACTS))
-    facts = data.get("facts", [])
-
-    fact = {
-        "fact_id": make_id("FACT"),
-        "version": 1,
-        "status": "approved",
-        "trust_tier": trust_tier,
-        "source": source,
-        "confidence": confidence,
-        "lineage": lineage,
-        "content": content,
-        "timestamp": int(time.time())
-    }
-
-    facts.append(fact)
-    write_json(str(EARTH_FACTS), {"facts": facts})
-    append_line(str(EARTH_LINEAGE), f"{fact['fact_id']} | {lineage}")
-    log.info(f"Added Earth Fact: {fact['fact_id']} (Source: {source})")
-    return fact
-
-def add_universe_hypothesis(hyp: Dict[str, Any]) -> Dict[str, Any]:
+    entry = {"content": content, "source": source, "lineage": lineage,
+             "trust_tier": trust_tier, "confidence": confidence}
+    return add_earth_facts_bulk([entry], domain)[0]
+
+def _group_by_shard(items: List[Dict[str, Any]], domain: Optional[str]) -> Dict[str, List[int]]:
+    groups: Dict[str, List[int]] = {}
+    for i, item in enumerate(items):
+        groups.setdefault(shard_for(item.get("domain", domain)), []).append(i)
+    return groups
+
+def add_earth_facts_bulk(entries: List[Dict[str, Any]], domain: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Adds a batch of approved facts with one store write (one transaction / fsync)
+    per shard and one lineage append. Each entry carries the add_earth_fact arguments:
+    content, source, lineage, trust_tier and confidence, and optionally its own domain.
+    Facts are content-addressed: an entry whose content is already in its shard (and
+    not retracted) is not stored again, and the existing fact is returned in its place.
+    """
+    if not entries:
+        return []
+    results: List[Optional[Dict[str, Any]]] = [None] * len(entries)
+    added: List[Dict[str, Any]] = []
+    for name, positions in _group_by_shard(entries, domain).items():
+        stored, new = _add_facts_to_shard(_shard(name), [entries[i] for i in positions], domain)
+        for i, fact in zip(positions, stored):
+            results[i] = fact
+        added.extend(new)
+    append_lines(str(EARTH_LINEAGE), [f"{f['fact_id']} | {f['lineage']}" for f in added])
+    for fact in added:
+        log.info(f"Added Earth Fact: {fact['fact_id']} (Source: {fact['source']})")
+    return results
+
+def _add_facts_to_shard(shard: Shard, entries: List[Dict[str, Any]],
+                        domain: Optional[str]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """(one result per input, the facts actually stored)"""
+    now = int(time.time())
+    index = shard.content_index(FACTS)
+    with index.lock:
+        results: List[Dict[str, Any]] = []
+        facts: List[Dict[str, Any]] = []
+        batch: Dict[str, Dict[str, Any]] = {}
+        for e in entries:
+            digest = content_hash(e["content"])
+            existing = batch.get(digest) or _live_fact(shard, index.get(digest))
+            if existing is not None:
+                log.info(f"Duplicate content; keeping Earth Fact {existing['fact_id']}")
+                results.append(existing)
+                continue
+            fact = {
+                "fact_id": make_id("FACT"),
+                "version": 1,
+                "status": "approved",
+                "trust_tier": e["trust_tier"],
+                "source": e["source"],
+                "confidence": e["confidence"],
+                "lineage": e["lineage"],
+                "content": e["content"],
+                "content_hash": digest,
+                "timestamp": now
+            }
+            if e.get("domain", domain) is not None:
+                fact["domain"] = e.get("domain", domain)
+            batch[digest] = fact
+            facts.append(fact)
+            results.append(fact)
+        if facts:
+            last = shard.stream(FACTS).append_many(facts)
+            cache = shard.cache()
+            for seq, fact in enumerate(facts, start=last - len(facts) + 1):
+                cache.apply(seq, fact)
+                index.put(fact["content_hash"], fact["fact_id"])
+    if facts:
+        shard.notify()
+    return results, facts
+
+def _live_fact(shard: Shard, fact_id: Optional[str]) -> Optional[Dict[str, Any]]:
+    if fact_id is None or fact_id in shard.retractions:
+        return None
+    chain = shard.cache().chain(fact_id)
+    return None if chain is None else dict(chain.latest)
+
+def find_earth_fact_by_content(digest: str, domain: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """The live Earth fact with content hash `digest` (see content_hash) in `domain`'s shard, or any shard."""
+    shards = [_shard(shard_for(domain))] if domain is not None else _all_shards()
+    for shard in shards:
+        fact = _live_fact(shard, shard.content_index(FACTS).get(digest))
+        if fact is not None:
+            return fact
+    return None
+
+def find_hypothesis_by_content(digest: str, domain: Optional[str] = None) -> Optional[str]:
+    """ID of the Universe hypothesis (hot or archived) with content hash `digest` in `domain`'s shard, or any shard."""
+    shards = [_shard(shard_for(domain))] if domain is not None else _all_shards()
+    for shard in shards:
+        found = shard.content_index(HYPOTHESES).get(digest) or shard.archive().find_by_content(digest)
+        if found is not None:
+            return found
+    return None
+
+def update_earth_fact(fact_id: str, changes: Dict[str, Any]) -> Mapping[str, Any]:
+    """
+    Records a new version of a fact. Only the changed fields are stored (as a
+    delta); earlier versions stay readable through get_fact(as_of=...) and snapshots.
+    """
+    shard = _locate(fact_id)
+    if shard is None:
+        raise KeyError(f"Unknown Earth fact: {fact_id}")
+    delta = {"op": UPDATE, "fact_id": fact_id, "changes": changes, "timestamp": int(time.time())}
+    seq = shard.stream(FACTS).append(delta)
+    shard.cache().apply(seq, delta)
+    shard.notify()
+    current = get_fact(fact_id)
+    log.info(f"Updated Earth Fact: {fact_id} (version {current['version']})")
+    return current
+
+def retract_earth_fact(fact_id: str, reason: str) -> bool:
+    """
+    Retracts a fact: it disappears from every read path from this generation on.
+    The retraction is stored in the fact's shard and mirrored to retracted.log.
+    Returns False if the fact was already retracted.
+    """
+    return bool(retract_earth_facts([fact_id], reason))
+
+def retract_earth_facts(fact_ids: Iterable[str], reason: str) -> List[str]:
+    """
+    Retracts a batch of facts with one store write per shard and one retracted.log append.
+    Unknown and already retracted IDs are skipped; returns the IDs retracted now.
+    """
+    groups: Dict[str, List[str]] = {}
+    for fact_id in dict.fromkeys(fact_ids):
+        shard = _locate(fact_id)
+        if shard is not None and fact_id not in shard.retractions:
+            groups.setdefault(shard.name, []).append(fact_id)
+    now = int(time.time())
+    retracted: List[str] = []
+    for name, pending in groups.items():
+        shard = _shard(name)
+        records = [{"op": RETRACT, "fact_id": f, "reason": reason, "timestamp": now} for f in pending]
+        last = shard.stream(FACTS).append_many(records)
+        cache = shard.cache()
+        for seq, record in enumerate(records, start=last - len(records) + 1):
+            cache.apply(seq, record)
+            shard.retractions.add(record["fact_id"], seq, now, reason)
+        shard.notify()
+        retracted.extend(pending)
+    append_lines(str(RETRACTED_LOG), [f"{f} | {reason}" for f in retracted])
+    return retracted
+
+def changes_since(seq: Union[int, str, None] = 0, limit: int = 1000, wait: float = 0.0) -> Dict[str, Any]:
+    """
+    Earth fact changes (promotions, updates, retractions) after change sequence
+    `seq`, oldest first within each shard. With `wait` > 0 this long-polls: it
+    blocks up to `wait` seconds for the first change. Pass `next_seq` back in to
+    continue; it stays an int until a second shard exists.
+    """
+    positions = decode_feed_cursor(seq)
+    feeds = [(shard, shard.change_feed()) for shard in _all_shards()]
+    if wait > 0:
+        _wait_for_changes([(feed, positions.get(shard.name, 0)) for shard, feed in feeds], wait)
+    streams = []
+    for shard, feed in feeds:
+        events, _ = feed.changes_since(positions.get(shard.name, 0), limit)
+        streams.append([dict(event, shard=shard.name) for event in events])
+    merged = heapq.merge(*streams, key=lambda event: (event.get("timestamp") or 0, event["shard"], event["seq"]))
+    changes = list(islice(merged, limit))
+    for event in changes:
+        positions[event["shard"]] = max(positions.get(event["shard"], 0), event["seq"])
+    return {"changes": changes, "next_seq": encode_feed_cursor(positions)}
+
+def _wait_for_changes(feeds: List[tuple], timeout: float) -> bool:
+    """Blocks until any feed moves past its position. The first feed is waited on, the others polled."""
+    deadline = time.monotonic() + timeout
+    while True:
+        if any(feed.wait(after, 0) for feed, after in feeds):
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        feed, after = feeds[0]
+        feed.wait(after, min(remaining, feed.poll_interval if len(feeds) > 1 else remaining))
+
+def change_feed_stats() -> Dict[str, Any]:
+    return {shard.name: shard.change_feed().stats() for shard in _all_shards()}
+
+def get_ancestors(node_id: str, max_depth: Optional[int] = None) -> List[str]:
+    """IDs of the hypotheses, facts and sources `node_id` was derived from, nearest first."""
+    return _lineage_graph().ancestors(node_id, max_depth)
+
+def get_descendants(node_id: str, max_depth: Optional[int] = None) -> List[str]:
+    """IDs of the hypotheses and facts derived from `node_id`, nearest first."""
+    return _lineage_graph().descendants(node_id, max_depth)
+
+def retract_cascade(node_id: str, reason: str) -> List[str]:
+    """
+    Retracts `node_id` (if it is a fact) and every fact derived from it. Only the
+    affected subgraph is walked; `node_id` may also be a hypothesis or a source.
+    Returns the IDs retracted now.
+    """
+    affected = [node_id] + _lineage_graph().descendants(node_id)
+    retracted = retract_earth_facts(affected, reason)
+    log.info(f"Cascading retraction from {node_id}: {len(retracted)} facts retracted")
+    return retracted
+
+def lineage_stats() -> Dict[str, int]:
+    """Size and covered generations of the lineage graph."""
+    return _lineage_graph().stats()
+
+def _fact_at(fact_id: str, at_generation: Generation) -> Optional[Mapping[str, Any]]:
+    shard = _locate(fact_id)
+    if shard is None:
+        return None
+    if isinstance(at_generation, Mapping):
+        upto = at_generation.get(shard.name, 0)
+    else:
+        upto = at_generation if shard.name == DEFAULT_SHARD else None
+    if upto is None:
+        return None if shard.retractions.is_retracted(fact_id) else shard.cache().peek(fact_id).latest
+    if shard.retractions.is_retracted(fact_id, at_seq=upto):
+        return None
+    return shard.cache().peek(fact_id).at_seq(upto)
+
+def search_earth_facts(queries: List[str], k: int = 10,
+                       at_generation: Generation = None) -> Optional[List[List[Mapping[str, Any]]]]:
+    """
+    The `k` Earth facts semantically closest to each query, best first, from the
+    in-process vector index (see vector_index). `at_generation` pins the facts
+    as in iter_earth_facts; facts retracted since may be missing from the
+    results. None when no embedding model is installed.
+    """
+    index = _vector_index()
+    if index is None:
+        return None
+    results = []
+    # Over-fetch: legacy retractions and facts newer than a pinned generation are still indexed.
+    for hits in index.search(queries, 2 * k):
+        facts = (_fact_at(fact_id, at_generation) for fact_id, _ in hits)
+        results.append(list(islice((f for f in facts if f is not None), k)))
+    return results
+
+def vector_index_stats() -> Optional[Dict[str, Any]]:
+    """Size, layout and covered generations of the vector index; None without an embedding model."""
+    index = _vector_index()
+    return None if index is None else index.stats()
+
+def is_retracted(fact_id: str) -> bool:
+    """O(1) check (per shard) against the in-memory retraction indexes."""
+    return any(fact_id in shard.retractions for shard in _all_shards())
+
+def get_retractions() -> Dict[str, Dict[str, Any]]:
+    """All known retractions keyed by fact_id."""
+    retractions: Dict[str, Dict[str, Any]] = {}
+    for shard in _all_shards():
+        shard.cache().records()
+        retractions.update((fact_id, entry._asdict()) for fact_id, entry in shard.retractions.items())
+    return retractions
+
+def add_universe_hypothesis(hyp: Dict[str, Any], domain: Optional[str] = None) -> Dict[str, Any]:
     """Adds a provisional hypothesis to the Universe for later testing."""
-    data = read_json(str(UNIVERSE_HYPS))
-    hyps = data.get("hypotheses", [])
-    hyps.append(hyp)
-    write_json(str(UNIVERSE_HYPS), {"hypotheses": hyps})
-    log.info(f"Added Universe Hypothesis: {hyp.get('hypothesis_id')}")
-    return hyp
\ No newline at end of file
+    return add_universe_hypotheses_bulk([hyp], domain)[0]
+
+def add_universe_hypotheses_bulk(hyps: List[Dict[str, Any]], domain: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Adds a batch of provisional hypotheses with a single store write per shard, stamped
+    with their content hash. A hypothesis whose claim, assumptions and payload
+    are already in its shard, hot or archived (see retention), is not stored
+    again; it comes back carrying the existing hypothesis_id, so callers can
+    tell duplicates by a changed ID.
+    """
+    if not hyps:
+        return []
+    results: List[Optional[Dict[str, Any]]] = [None] * len(hyps)
+    for name, positions in _group_by_shard(hyps, domain).items():
+        group = [hyps[i] for i in positions]
+        for i, hyp in zip(positions, _add_hypotheses_to_shard(_shard(name), group)[0]):
+            results[i] = hyp
+    return results
+
+def _add_hypotheses_to_shard(shard: Shard, hyps: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """(one result per input, the hypotheses actually stored)"""
+    now = int(time.time())
+    index = shard.content_index(HYPOTHESES)
+    with index.lock:
+        results: List[Dict[str, Any]] = []
+        fresh: List[Dict[str, Any]] = []
+        batch: Dict[str, Any] = {}
+        for hyp in hyps:
+            digest = hypothesis_hash(hyp)
+            existing = batch.get(digest) or index.get(digest) or shard.archive().find_by_content(digest)
+            if existing is not None:
+                log.info(f"Duplicate content; keeping Universe Hypothesis {existing}")
+                results.append(dict(hyp, hypothesis_id=existing, content_hash=digest))
+                continue
+            stored = dict(hyp, content_hash=digest)
+            stored.setdefault("status", PROVISIONAL)
+            stored.setdefault("timestamp", now)
+            if stored.get("hypothesis_id") is not None:
+                batch[digest] = stored["hypothesis_id"]
+            fresh.append(stored)
+            results.append(stored)
+        if fresh:
+            shard.stream(HYPOTHESES).append_many(fresh)
+            for hyp in fresh:
+                if hyp.get("hypothesis_id") is not None:
+                    index.put(hyp["content_hash"], hyp["hypothesis_id"])
+    for hyp in fresh:
+        log.info(f"Added Universe Hypothesis: {hyp.get('hypothesis_id')}")
+    return results, fresh
+
+def set_hypothesis_statuses(statuses: Mapping[str, str], domain: Optional[str] = None) -> int:
+    """
+    Records validation outcomes ({hypothesis_id: status}, see retention.STATUSES)
+    as update records in the domain's shard, with one store write. Returns the last seq.
+    """
+    for status in statuses.values():
+        if status not in STATUSES:
+            raise ValueError(f"Unknown hypothesis status: {status!r}")
+    if not statuses:
+        return 0
+    now = int(time.time())
+    shard = _shard(shard_for(domain))
+    return shard.stream(HYPOTHESES).append_many([
+        {"op": UPDATE, "hypothesis_id": hypothesis_id, "changes": {"status": status}, "timestamp": now}
+        for hypothesis_id, status in statuses.items()
+    ])
+
+def compact_universe(ttls: Optional[Mapping[str, Optional[int]]] = None, now: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Moves hypotheses whose status TTL expired (UNIVERSE_TTL_<STATUS>, see
+    retention) from every shard's hot store into its cold archive, and drops
+    them from this process's content indexes and overlays; deduplication then
+    finds them in the archive. Other processes are not told: their content
+    indexes keep mapping the archived hashes to the same (now archived) IDs,
+    which deduplicates the same way, and their overlays keep the dropped
+    deltas in memory until they restart.
+    """
+    ttls = retention_ttls() if ttls is None else ttls
+    per_shard = {}
+    for shard in _all_shards():
+        result = compact(shard.stream(HYPOTHESES), shard.archive(), ttls, now)
+        hashes = result.pop("hashes")
+        index = shard.content_index(HYPOTHESES)
+        for hypothesis_id, digest in hashes.items():
+            index.forget(digest, hypothesis_id)
+        overlay = shard.overlay(HYPOTHESES)
+        with shard.overlay_lock:
+            for hypothesis_id in hashes:
+                overlay.deltas.pop(hypothesis_id, None)
+        per_shard[shard.name] = result
+    totals = {k: sum(r[k] for r in per_shard.values()) for k in ("archived", "records")}
+    return dict(totals, shards=per_shard)
+
+def get_archived_hypothesis(hypothesis_id: str) -> Optional[Dict[str, Any]]:
+    """An archived hypothesis (last version), from whichever shard's cold tier holds it."""
+    for shard in _all_shards():
+        if hypothesis_id in shard.archive():
+            return shard.archive().get(hypothesis_id)
+    return None
+
+def query_archived_hypotheses(status: Optional[str] = None, since: Optional[int] = None,
+                              until: Optional[int] = None, limit: int = 100,
+                              domain: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Index entries of archived hypotheses (ID, status, timestamp, content hash), newest first."""
+    shards = [_shard(shard_for(domain))] if domain is not None else _all_shards()
+    entries = [e for shard in shards for e in shard.archive().query(status, since, until, limit)]
+    return heapq.nsmallest(limit, entries, key=lambda e: -(e["timestamp"] or 0))
+
+def stream_generations() -> Dict[str, int]:
+    """
+    Last sequence number of every stream of every shard, keyed "facts" /
+    "hypotheses" for the default shard and "<shard>:facts" etc. for the others.
+    """
+    return {_stream_key(shard, name): shard.stream(name).refresh()
+            for shard in _all_shards() for name in (FACTS, HYPOTHESES)}
+
+def close_stores() -> None:
+    """Closes the storage engine of every open shard; the next call reopens them."""
+    global _shards_scanned_at
+    with _state_lock:
+        for shard in _shards.values():
+            shard.backend.close()
+        _shards.clear()
+        _shards_scanned_at = 0.0
+
+def replay_stream(key: str, after: int = 0) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Raw (seq, record) pairs of one stream (see stream_generations) after `after`, ops included."""
+    shard, name = _parse_stream_key(key)
+    return shard.stream(name).replay(after=after)
+
+def import_records(name: str, records: List[Dict[str, Any]]) -> int:
+    """
+    Merges raw records exported by another Motherboard (see sync_service) into
+    this one, keeping their IDs. `name` is FACTS or HYPOTHESES. Facts,
+    hypotheses and retractions are sets keyed by ID (hypotheses by content),
+    so records that are already here are skipped, as are updates the fact
+    already reflects, and re-importing is harmless.
+    Base records go to the shard of their domain, updates and retractions to
+    the shard holding their fact. Returns the number of records stored.
+    """
+    if name == HYPOTHESES:
+        bases = [r for r in records if r.get("op") is None]
+        stored = 0
+        for shard_name, positions in _group_by_shard(bases, None).items():
+            group = [bases[i] for i in positions]
+            stored += len(_add_hypotheses_to_shard(_shard(shard_name), group)[1])
+        return stored
+
+    # Base records first, so updates and retractions in the same batch find their fact.
+    bases: Dict[str, List[Dict[str, Any]]] = {}
+    for record in records:
+        if record.get("op") is None and record.get("fact_id") and _locate(record["fact_id"]) is None:
+            bases.setdefault(shard_for(record.get("domain")), []).append(record)
+    added: List[Dict[str, Any]] = []
+    for shard_name, group in bases.items():
+        shard = _shard(shard_name)
+        index = shard.content_index(FACTS)
+        with index.lock:
+            last = shard.stream(FACTS).append_many(group)
+            cache = shard.cache()
+            for seq, fact in enumerate(group, start=last - len(group) + 1):
+                cache.apply(seq, fact)
+                index.put(fact_hash(fact), fact["fact_id"])
+        shard.notify()
+        added.extend(group)
+
+    ops: Dict[str, List[Dict[str, Any]]] = {}
+    retracting, pending = set(), set()
+    for record in records:
+        op = record.get("op")
+        if op is None:
+            continue
+        shard = _locate(record.get("fact_id"))
+        if shard is None or record["fact_id"] in shard.retractions or record["fact_id"] in retracting:
+            continue  # unknown here, or already retracted: nothing left to change
+        if op == UPDATE and record["fact_id"] not in pending:
+            live = _live_fact(shard, record["fact_id"])
+            if all(live.get(k) == v for k, v in record.get("changes", {}).items()):
+                continue  # already applied
+            pending.add(record["fact_id"])
+        ops.setdefault(shard.name, []).append(record)
+        if op == RETRACT:
+            retracting.add(record["fact_id"])
+    for shard_name, group in ops.items():
+        shard = _shard(shard_name)
+        last = shard.stream(FACTS).append_many(group)
+        cache = shard.cache()
+        for seq, record in enumerate(group, start=last - len(group) + 1):
+            cache.apply(seq, record)
+            if record["op"] == RETRACT:
+                shard.retractions.add(record["fact_id"], seq, record.get("timestamp"), record.get("reason", ""))
+        shard.notify()
+
+    append_lines(str(EARTH_LINEAGE), [f"{f['fact_id']} | {f.get('lineage')}" for f in added])
+    retracted = [r["fact_id"] for group in ops.values() for r in group if r["op"] == RETRACT]
+    append_lines(str(RETRACTED_LOG), [f"{f} | imported" for f in retracted])
+    return len(added) + sum(len(group) for group in ops.values())
@@ -0,0 +1,97 @@
+"""
+Change feed over the Earth fact store.
+
+Every promotion, update and retraction is a record in the facts stream, so its
+stream sequence number doubles as the change sequence: monotonically
+increasing, shared by all processes and stable across restarts. Recent changes
+are kept in a bounded in-memory buffer, so any number of subscribers polling
+from roughly the same position cost one storage read per new change in total.
+"""
+import threading
+import time
+from bisect import bisect_right
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+from src.motherboard.mvcc import UPDATE
+from src.motherboard.retractions import RETRACT
+from src.motherboard.storage import Stream
+
+PROMOTE = "promote"
+
+def to_event(seq: int, record: Dict[str, Any]) -> Dict[str, Any]:
+    """Turns one facts-stream record into a change event."""
+    op = record.get("op")
+    event = {"seq": seq, "op": op or PROMOTE, "fact_id": record.get("fact_id"), "timestamp": record.get("timestamp")}
+    if op is None:
+        event["fact"] = record
+    elif op == UPDATE:
+        event["changes"] = record.get("changes", {})
+    elif op == RETRACT:
+        event["reason"] = record.get("reason")
+    return event
+
+class ChangeFeed:
+    """Buffered, blocking reader of a stream's tail."""
+
+    def __init__(self, stream: Stream, buffer_size: int = 10000, poll_interval: float = 0.5):
+        self._stream = stream
+        self.poll_interval = poll_interval
+        self._cond = threading.Condition()
+        self._seqs: deque = deque(maxlen=buffer_size)
+        self._events: deque = deque(maxlen=buffer_size)
+        self.generation = stream.refresh()
+
+    def _catch_up(self) -> int:
+        """Buffers everything appended since the last call (by any process)."""
+        last = self._stream.refresh()
+        with self._cond:
+            if last > self.generation:
+                for seq, record in self._stream.replay(after=self.generation):
+                    self._seqs.append(seq)
+                    self._events.append(to_event(seq, record))
+                    self.generation = seq
+                self._cond.notify_all()
+            return self.generation
+
+    def notify(self) -> None:
+        """Called by writers in this process right after an append, to wake waiters."""
+        self._catch_up()
+
+    def changes_since(self, after: int = 0, limit: int = 1000) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Events with a seq greater than `after`, oldest first, at most `limit` of
+        them, plus the seq to pass back next time.
+        """
+        self._catch_up()
+        with self._cond:
+            if self._seqs and after >= self._seqs[0] - 1:
+                start = bisect_right(self._seqs, after)
+                events = [self._events[i] for i in range(start, min(start + limit, len(self._events)))]
+                return events, events[-1]["seq"] if events else max(after, 0)
+        # Too far behind for the buffer: read the range straight from storage.
+        events = []
+        for seq, record in self._stream.replay(after=after):
+            if len(events) >= limit:
+                break
+            events.append(to_event(seq, record))
+        return events, events[-1]["seq"] if events else after
+
+    def wait(self, after: int, timeout: float) -> bool:
+        """Blocks until there is a change past `after` or `timeout` seconds passed."""
+        deadline = time.monotonic() + timeout
+        while self._catch_up() <= after:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            with self._cond:
+                if self.generation <= after:
+                    self._cond.wait(min(remaining, self.poll_interval))
+        return True
+
+    def stats(self) -> Dict[str, Optional[int]]:
+        with self._cond:
+            return {
+                "generation": self.generation,
+                "buffered": len(self._seqs),
+                "oldest_buffered": self._seqs[0] if self._seqs else None,
+            }
@@ -0,0 +1,97 @@
+"""
+Per-check statistics and adaptive ordering for the gatekeeper.
+
+The gatekeeper's checks are independent and any one rejection decides a
+hypothesis, so running them in sequence and stopping at the first rejection
+costs, in expectation, c1 + (1 - p1) c2 + (1 - p1)(1 - p2) c3 + ..., where c
+is a check's latency and p its rejection rate. That sum is smallest when the
+checks are sorted by c / p, ascending: cheap checks that often reject go first.
+
+Latency is the check's own run time, measured where it runs (see timed), so
+waiting in a busy pool does not make a check look expensive. Latency and
+rejection rate are tracked as exponentially weighted averages, so
+the order follows drift (a slower model, a stricter policy). Until every check
+has MIN_SAMPLES runs the declared order is kept. A later check only runs on
+hypotheses the earlier ones passed, so every EXPLORE_EVERY-th hypothesis gets
+the order rotated by one, which keeps every check's estimates current.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+MIN_SAMPLES = 20
+EXPLORE_EVERY = 20
+DECAY = 0.05
+MIN_REJECTION_RATE = 0.01
+
+def timed(fn: Callable, *args) -> Tuple[Any, float]:
+    """(fn(*args), seconds it ran). Submit this to a pool to leave the queue wait out of the timing."""
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+class _Estimate:
+    __slots__ = ("runs", "rejections", "latency", "rejection_rate")
+
+    def __init__(self):
+        self.runs = 0
+        self.rejections = 0
+        self.latency = 0.0
+        self.rejection_rate = 0.0
+
+    def update(self, seconds: float, rejected: bool) -> None:
+        self.runs += 1
+        self.rejections += rejected
+        # The first samples are averaged plainly, then the average decays.
+        weight = max(1.0 / self.runs, DECAY)
+        self.latency += weight * (seconds - self.latency)
+        self.rejection_rate += weight * (float(rejected) - self.rejection_rate)
+
+    @property
+    def score(self) -> float:
+        """Expected latency spent per rejection: lower runs earlier."""
+        return self.latency / max(self.rejection_rate, MIN_REJECTION_RATE)
+
+class CheckStats:
+    """Thread-safe latency / rejection-rate estimates per check, and the check order they imply."""
+
+    def __init__(self, checks: Sequence[str]):
+        self.declared = list(checks)
+        self._lock = threading.Lock()
+        self._estimates: Dict[str, _Estimate] = {name: _Estimate() for name in checks}
+        self._calls = 0
+
+    def record(self, check: str, seconds: float, rejected: bool) -> None:
+        with self._lock:
+            self._estimates.setdefault(check, _Estimate()).update(seconds, rejected)
+
+    def _ranked(self) -> List[str]:
+        if any(self._estimates[name].runs < MIN_SAMPLES for name in self.declared):
+            return list(self.declared)
+        return sorted(self.declared, key=lambda name: self._estimates[name].score)
+
+    def order(self) -> List[str]:
+        """The order to run the checks in for the next hypothesis."""
+        with self._lock:
+            self._calls += 1
+            ranked = self._ranked()
+            if self._calls % EXPLORE_EVERY == 0 and len(ranked) > 1:
+                ranked = ranked[1:] + ranked[:1]
+            return ranked
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Per-check counters and estimates, and the current (unrotated) order."""
+        with self._lock:
+            return {
+                "order": self._ranked(),
+                "checks": {
+                    name: {
+                        "runs": e.runs,
+                        "rejections": e.rejections,
+                        "latency_ms": round(e.latency * 1000, 3),
+                        "rejection_rate": round(e.rejection_rate, 4),
+                        "score": round(e.score, 6),
+                    }
+                    for name, e in self._estimates.items()
+                },
+            }
@@ -0,0 +1,62 @@
+import pytest
+from src.motherboard import api
+from src.motherboard.storage import FACTS, HYPOTHESES
+
+def _close_shards():
+    for shard in api._shards.values():
+        shard.backend.close()
+
+def _use_stores(monkeypatch, root):
+    """Points the Motherboard API at the stores under `root`, dropping every open shard."""
+    _close_shards()
+    earth, universe = root / "earth", root / "universe"
+    paths = {
+        "ROOT": root,
+        "EARTH_DIR": earth,
+        "UNIVERSE_DIR": universe,
+        "EARTH_FACTS": earth / "facts.json",
+        "EARTH_LINEAGE": earth / "lineage.log",
+        "EARTH_LINEAGE_MAP": earth / "lineage_map.json",
+        "EARTH_VECTOR_INDEX": earth / "vector_index.npz",
+        "UNIVERSE_HYPS": universe / "hypotheses.json",
+        "RETRACTED_LOG": universe / "retracted.log",
+        "EARTH_LOG_DIR": earth / "facts_log",
+        "UNIVERSE_LOG_DIR": universe / "hypotheses_log",
+        "UNIVERSE_COLD_DIR": universe / "cold",
+        "SQLITE_DB": root / "motherboard.db",
+        "SHARDS_DIR": root / "shards",
+    }
+    for name, path in paths.items():
+        monkeypatch.setattr(api, name, path)
+    monkeypatch.setattr(api, "LEGACY_SOURCES", {
+        FACTS: (paths["EARTH_FACTS"], "facts"),
+        HYPOTHESES: (paths["UNIVERSE_HYPS"], "hypotheses"),
+    })
+    for name, value in {"_shards": {}, "_router": None, "_lineage": None, "_vectors": None,
+                        "_shards_scanned_at": 0.0}.items():
+        monkeypatch.setattr(api, name, value)
+
+@pytest.fixture(params=["log", "sqlite"])
+def motherboard(request, tmp_path, monkeypatch):
+    """
+    The Motherboard API over empty stores under tmp_path, once per storage
+    engine. Sharding follows MOTHERBOARD_SHARDING as set in the environment.
+    """
+    monkeypatch.setenv("MOTHERBOARD_BACKEND", request.param)
+    _use_stores(monkeypatch, tmp_path)
+    yield api
+    _close_shards()
+
+@pytest.fixture
+def switch_motherboard(motherboard, monkeypatch):
+    """switch_motherboard(root): re-points the API at the stores under `root`, e.g. a second replica."""
+    return lambda root: _use_stores(monkeypatch, root)
+
+@pytest.fixture
+def add_fact(motherboard):
+    """add_fact(claim, **fields): adds an Earth fact with content {"claim": claim} and test defaults."""
+    def add(claim: str, **fields):
+        args = dict(source="test", lineage="HYP_test", trust_tier="T1", confidence=0.9)
+        args.update(fields)
+        return motherboard.add_earth_fact({"claim": claim}, **args)
+    return add
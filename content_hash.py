@@ -0,0 +1,87 @@
+"""
+Content addressing for Motherboard records.
+
+A record's content hash is the SHA-256 of its canonical JSON form: keys sorted,
+strings whitespace-normalized and case-folded, assumptions treated as a set,
+and identity / bookkeeping fields dropped. Two hypotheses that state the same
+claim under the same assumptions therefore hash alike whatever their IDs,
+timestamps or scores. A fact hashes by its content, so a promoted fact carries
+the hash of the hypothesis it came from.
+"""
+import hashlib
+import json
+import threading
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, Tuple
+
+# Fields that identify or describe a record rather than state its content.
+VOLATILE_FIELDS = frozenset({
+    "hypothesis_id", "fact_id", "content_hash", "timestamp", "created_at", "updated_at",
+    "version", "status", "derived_from", "retrieved_context", "novelty_score", "confidence_score", "confidence", "domain",
+})
+UNORDERED_FIELDS = frozenset({"assumptions"})
+
+def _normalize(value: Any, unordered: bool = False) -> Any:
+    if isinstance(value, str):
+        return " ".join(value.split()).casefold()
+    if isinstance(value, Mapping):
+        return {str(k): _normalize(v, k in UNORDERED_FIELDS) for k, v in value.items() if k not in VOLATILE_FIELDS}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_normalize(v) for v in value]
+        if unordered or isinstance(value, (set, frozenset)):
+            items = sorted(items, key=lambda v: json.dumps(v, sort_keys=True))
+        return items
+    return value
+
+def canonicalize(value: Any) -> str:
+    """The canonical JSON text that content hashes are computed over."""
+    return json.dumps(_normalize(value), sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+
+def content_hash(value: Any) -> str:
+    return hashlib.sha256(canonicalize(value).encode("utf-8")).hexdigest()
+
+def hypothesis_hash(hypothesis: Mapping[str, Any]) -> str:
+    """Hash of claim + assumptions + the rest of the hypothesis payload."""
+    return hypothesis.get("content_hash") or content_hash(hypothesis)
+
+def fact_hash(fact: Mapping[str, Any]) -> str:
+    """Hash of a fact's content (for promoted facts, the hypothesis)."""
+    return fact.get("content_hash") or content_hash(fact.get("content"))
+
+class ContentIndex:
+    """
+    content hash -> ID of the latest record stored with that content, fed from a
+    store stream like mvcc.DeltaOverlay. Records written before hashes were
+    stored are hashed as they are replayed. Inserts dedupe against this index,
+    so the latest record only differs from the first when the first was retracted.
+    """
+
+    def __init__(self, key: str, hasher: Callable[[Mapping[str, Any]], str]):
+        self.key = key
+        self.hasher = hasher
+        self.generation = 0
+        self.lock = threading.RLock()
+        self._ids: Dict[str, Any] = {}
+
+    def feed(self, records: Iterator[Tuple[int, Dict[str, Any]]]) -> None:
+        with self.lock:
+            for seq, record in records:
+                if record.get("op") is None and record.get(self.key) is not None:
+                    self._ids[self.hasher(record)] = record[self.key]
+                self.generation = seq
+
+    def get(self, digest: str) -> Optional[Any]:
+        return self._ids.get(digest)
+
+    def put(self, digest: str, record_id: Any) -> None:
+        """Points `digest` at a record this process just stored."""
+        with self.lock:
+            self._ids[digest] = record_id
+
+    def forget(self, digest: str, record_id: Any) -> None:
+        """Drops `digest` if it still points at `record_id` (e.g. after the record was archived)."""
+        with self.lock:
+            if self._ids.get(digest) == record_id:
+                del self._ids[digest]
+
+    def __len__(self) -> int:
+        return len(self._ids)
@@ -1,6 +1,10 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from src.approver_god.validation.contradiction_engine import default_engine
 
-def check_for_contradictions(hypothesis: Dict[str, Any], facts: List[Dict[str, Any]]) -> bool:
-    """Checks if a hypothesis contradicts established Earth facts."""
-    # Placeholder: In a real system, this would use NLI models.
-    return True # Assume no contradictions for now
\ No newline at end of file
+def check_for_contradictions(hypothesis: Dict[str, Any], facts: Optional[List[Dict[str, Any]]]) -> bool:
+    """
+    Checks if a hypothesis contradicts established Earth facts. Only the facts
+    nearest to the hypothesis are scored, and verdicts are memoized by content
+    hash (see contradiction_engine); with `facts` None the nearest are looked up.
+    """
+    return default_engine().is_consistent(hypothesis, facts)
\ No newline at end of file
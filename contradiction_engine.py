@@ -0,0 +1,172 @@
+"""
+Contradiction-check engine for the gatekeeper.
+
+Pairwise contradiction scoring (NLI-style: does this fact contradict this
+hypothesis?) is the expensive part of validation, so the engine keeps the
+number of scored pairs independent of the store size:
+
+1. Pruning: only `k` facts are candidates: those sharing the most entity
+   terms with the hypothesis, ties going to the earlier fact. The facts handed
+   in are usually already the nearest ones by embedding (see retrieve /
+   vector_index), so a fact sharing no terms is still a candidate when too few
+   do: a contradiction may well be worded differently. With no facts given, the
+   engine asks the vector index for them itself.
+2. Batching: candidate pairs missing from the memo are scored in batches of
+   `batch_size` by the pluggable `scorer`.
+3. Memoization: verdicts are cached per (hypothesis hash, fact hash) pair (see
+   content_hash), so the same claim is never scored twice against the same
+   fact, whatever the IDs.
+
+A scorer takes (fact text, hypothesis text) pairs and returns, per pair, the
+probability that the fact contradicts the hypothesis.
+"""
+import heapq
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, FrozenSet, Hashable, List, Mapping, Optional, Sequence, Tuple
+from src.motherboard.api import search_earth_facts
+from src.motherboard.content_hash import fact_hash, hypothesis_hash
+from src.motherboard.vector_index import fact_text
+
+PairScorer = Callable[[List[Tuple[str, str]]], List[float]]
+
+TERM = re.compile(r"[a-z0-9]+")
+MIN_TERM_LENGTH = 3
+STOPWORDS = frozenset({
+    "the", "and", "for", "are", "was", "were", "with", "that", "this", "from", "into", "than", "then",
+    "but", "all", "any", "can", "could", "would", "should", "may", "might", "has", "have", "had",
+    "its", "their", "there", "which", "when", "where", "what", "who", "how", "about", "over", "under",
+    "some", "such", "only", "also", "more", "most", "less", "very", "been", "being", "does", "did",
+})
+
+def terms(text: str) -> FrozenSet[str]:
+    """
+    The entity-like terms of `text`: lower-cased words, minus stopwords and very
+    short tokens. Negations ("not") are kept: they are what a contradiction turns on.
+    """
+    return frozenset(t for t in TERM.findall(text.lower()) if len(t) >= MIN_TERM_LENGTH and t not in STOPWORDS)
+
+def placeholder_scorer(pairs: List[Tuple[str, str]]) -> List[float]:
+    # Placeholder: In a real system, this would be an NLI cross-encoder scoring each batch.
+    return [0.0] * len(pairs)
+
+class _LRU:
+    """A bounded, thread-safe mapping that evicts the least recently used entry."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._lock = threading.Lock()
+        self._items: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.size:
+                self._items.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+class ContradictionEngine:
+    """Prunes, batches and memoizes contradiction scoring; see the module docstring."""
+
+    def __init__(self, scorer: Optional[PairScorer] = None, k: int = 16, threshold: float = 0.5,
+                 batch_size: int = 32, cache_size: int = 100000):
+        self.scorer = scorer or placeholder_scorer
+        self.k = k
+        self.threshold = threshold
+        self.batch_size = batch_size
+        self._verdicts = _LRU(cache_size)
+        self._terms = _LRU(cache_size)
+        self._lock = threading.Lock()
+        self._stats = {"checks": 0, "candidates": 0, "scored": 0, "memo_hits": 0}
+
+    def _fact_terms(self, fact: Mapping[str, Any]) -> FrozenSet[str]:
+        key = (fact.get("fact_id"), fact.get("version"))
+        found = self._terms.get(key) if key[0] is not None else None
+        if found is None:
+            found = terms(fact_text(fact.get("content")))
+            if key[0] is not None:
+                self._terms.put(key, found)
+        return found
+
+    def candidates(self, hypothesis: Mapping[str, Any],
+                   facts: Optional[Sequence[Mapping[str, Any]]]) -> List[Tuple[str, Mapping[str, Any]]]:
+        """(fact hash, fact) for the at most `k` facts worth scoring against `hypothesis`."""
+        if facts is None:
+            found = search_earth_facts([fact_text(hypothesis)], self.k)
+            facts = found[0] if found is not None else []
+        if len(facts) > self.k:
+            # One spare: the hypothesis' own promoted fact, if retrieved, is dropped below.
+            wanted = terms(fact_text(hypothesis))
+            overlap = ((len(wanted & self._fact_terms(fact)), -i) for i, fact in enumerate(facts))
+            best = heapq.nlargest(self.k + 1, overlap)
+            facts = [facts[-j] for _, j in best]  # best first, so the spare is the one cut below
+        own = hypothesis_hash(hypothesis)
+        # A fact promoted from this very hypothesis hashes alike; it cannot contradict it.
+        hashed = [(digest, fact) for digest, fact in ((fact_hash(f), f) for f in facts) if digest != own]
+        return hashed[:self.k]
+
+    def scores(self, hypothesis: Mapping[str, Any],
+               facts: Optional[Sequence[Mapping[str, Any]]]) -> List[Tuple[Mapping[str, Any], float]]:
+        """Contradiction probability of `hypothesis` against each candidate fact."""
+        own = hypothesis_hash(hypothesis)
+        candidates = self.candidates(hypothesis, facts)
+        verdicts = [self._verdicts.get((own, digest)) for digest, _ in candidates]
+        missing = [i for i, verdict in enumerate(verdicts) if verdict is None]
+        if missing:
+            text = fact_text(hypothesis)
+            for start in range(0, len(missing), self.batch_size):
+                batch = missing[start:start + self.batch_size]
+                pairs = [(fact_text(candidates[i][1].get("content")), text) for i in batch]
+                for i, score in zip(batch, self.scorer(pairs)):
+                    verdicts[i] = float(score)
+                    self._verdicts.put((own, candidates[i][0]), verdicts[i])
+        with self._lock:
+            self._stats["checks"] += 1
+            self._stats["candidates"] += len(candidates)
+            self._stats["scored"] += len(missing)
+            self._stats["memo_hits"] += len(candidates) - len(missing)
+        return [(fact, verdict) for (_, fact), verdict in zip(candidates, verdicts)]
+
+    def contradictions(self, hypothesis: Mapping[str, Any],
+                       facts: Optional[Sequence[Mapping[str, Any]]]) -> List[Mapping[str, Any]]:
+        """The candidate facts that contradict `hypothesis` (score at or above `threshold`)."""
+        return [fact for fact, score in self.scores(hypothesis, facts) if score >= self.threshold]
+
+    def is_consistent(self, hypothesis: Mapping[str, Any],
+                      facts: Optional[Sequence[Mapping[str, Any]]]) -> bool:
+        return not self.contradictions(hypothesis, facts)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats, memo_size=len(self._verdicts))
+
+_engine: Optional[ContradictionEngine] = None
+_engine_lock = threading.Lock()
+
+def default_engine() -> ContradictionEngine:
+    """
+    The process-wide engine. CONTRADICTION_TOP_K, CONTRADICTION_THRESHOLD,
+    CONTRADICTION_BATCH_SIZE and CONTRADICTION_CACHE_SIZE override its settings.
+    """
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = ContradictionEngine(
+                k=int(os.getenv("CONTRADICTION_TOP_K", "16")),
+                threshold=float(os.getenv("CONTRADICTION_THRESHOLD", "0.5")),
+                batch_size=int(os.getenv("CONTRADICTION_BATCH_SIZE", "32")),
+                cache_size=int(os.getenv("CONTRADICTION_CACHE_SIZE", "100000")),
+            )
+        return _engine
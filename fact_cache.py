@@ -0,0 +1,188 @@
+import threading
+from bisect import bisect_right
+from collections.abc import Sequence
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set, Type, TypeVar
+from src.motherboard.mvcc import UPDATE, VersionChain, apply_delta
+from src.motherboard.records import Record, decode
+from src.motherboard.retractions import RETRACT, RetractionIndex
+from src.motherboard.storage import Stream
+
+T = TypeVar("T")
+
+class FrozenRecords(Sequence):
+    """
+    Read-only view over the first `length` cached records, pinned at generation `seq`,
+    minus the positions retracted by then. Chains only ever grow, so a view never
+    changes after it is handed out. `offsets` holds, for each excluded position
+    in ascending order, how many live positions precede it; indexing maps a live
+    index to its raw position by bisecting it.
+    """
+
+    __slots__ = ("_chains", "_length", "_seq", "_excluded", "_offsets")
+
+    def __init__(self, chains: List[VersionChain], length: int, seq: int, excluded: Set[int],
+                 offsets: Sequence = ()):
+        self._chains = chains
+        self._length = length
+        self._seq = seq
+        self._excluded = excluded
+        self._offsets = offsets
+
+    @property
+    def generation(self) -> int:
+        return self._seq
+
+    def at_position(self, position: int) -> Optional[Mapping[str, Any]]:
+        """The record at a raw cache position, or None if it is retracted or not visible in this view."""
+        if position >= self._length or position in self._excluded:
+            return None
+        return self._chains[position].at_seq(self._seq)
+
+    def __len__(self) -> int:
+        return self._length - len(self._excluded)
+
+    def __iter__(self):
+        chains, excluded, seq = self._chains, self._excluded, self._seq
+        for position in range(self._length):
+            if position not in excluded:
+                yield chains[position].at_seq(seq)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self[i] for i in range(*index.indices(len(self))))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("record index out of range")
+        if self._excluded:
+            index += bisect_right(self._offsets, index)
+        return self._chains[index].at_seq(self._seq)
+
+    def __repr__(self) -> str:
+        return f"FrozenRecords({len(self)} records @ {self._seq})"
+
+class RecordCache:
+    """
+    Process-local cache of a store stream, stamped with its generation (last seq).
+
+    Readers get an immutable FrozenRecords view; a read only touches the log when
+    its generation moved, and then only replays the new tail. Writers in this
+    process hand their records over with `apply` so nothing is re-parsed.
+    Every record identified by `key` keeps its full version history (see mvcc).
+    An optional index (see fact_index.FactIndex) is fed every cached version, and
+    retraction records are forwarded to the shared RetractionIndex.
+    With a `record_type` (see records), base records are held as compact
+    slotted records built straight from the store encoding.
+    """
+
+    def __init__(self, store: Stream, key: str = "fact_id", index=None,
+                 retractions: Optional[RetractionIndex] = None,
+                 record_type: Optional[Type[Record]] = None):
+        self._store = store
+        self.key = key
+        self.record_type = record_type
+        self.index = index
+        self.retractions = retractions if retractions is not None else RetractionIndex()
+        self._lock = threading.Lock()
+        self._chains: List[VersionChain] = []
+        self._positions: Dict[Any, int] = {}
+        self._retracted: Dict[int, int] = {}  # position -> seq of its retraction
+        self._excluded = (None, set(), [])
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _ingest(self, seq: int, record: Dict[str, Any]) -> None:
+        op = record.get("op")
+        if op is None:
+            position = len(self._chains)
+            chain = VersionChain(seq, record)
+            if record.get(self.key) is not None:
+                self._positions[record[self.key]] = position
+                if record[self.key] in self.retractions:
+                    self._exclude(record[self.key])
+            if self.index is not None:
+                self.index.add(position, chain.latest)
+            self._chains.append(chain)
+        elif op == UPDATE:
+            position = self._positions.get(record.get(self.key))
+            if position is None:
+                return
+            chain = self._chains[position]
+            previous = chain.latest
+            current = chain.add(seq, record.get("timestamp"), apply_delta(previous, record, self.key))
+            if self.index is not None:
+                self.index.update(position, previous, current)
+        elif op == RETRACT:
+            key_value = record.get(self.key)
+            self.retractions.add(key_value, seq, record.get("timestamp"), record.get("reason", ""))
+            self._exclude(key_value)
+
+    def _exclude(self, key_value: Any) -> None:
+        position = self._positions.get(key_value)
+        entry = self.retractions.get(key_value)
+        if position is not None and entry is not None:
+            self._retracted[position] = entry.seq
+
+    def apply(self, seq: int, record: Dict[str, Any]) -> None:
+        """Adds a record this process just appended at `seq`. Out-of-order writes are left to the next refresh."""
+        if self.record_type is not None and record.get("op") is None:
+            record = self.record_type.from_dict(record)
+        with self._lock:
+            if seq == self._generation + 1:
+                self._ingest(seq, record)
+                self._generation = seq
+
+    def _refresh_locked(self, generation: int) -> None:
+        if generation == self._generation:
+            self.hits += 1
+            return
+        self.misses += 1
+        if self.record_type is None:
+            tail = self._store.replay(after=self._generation)
+        else:
+            tail = ((seq, decode(raw, self.record_type)) for seq, raw in self._store.replay_raw(after=self._generation))
+        for seq, record in tail:
+            self._ingest(seq, record)
+            self._generation = seq
+
+    def _view(self) -> FrozenRecords:
+        seq = self._generation
+        stamp = (seq, len(self._retracted))
+        if self._excluded[0] != stamp:
+            # Computed once per generation and shared by its views: O(retracted), not O(records).
+            excluded = sorted(p for p, retracted_at in self._retracted.items() if retracted_at <= seq)
+            self._excluded = (stamp, set(excluded), [p - i for i, p in enumerate(excluded)])
+        _, excluded, offsets = self._excluded
+        return FrozenRecords(self._chains, len(self._chains), seq, excluded, offsets)
+
+    def records(self) -> FrozenRecords:
+        return self.read(lambda view: view)
+
+    def read(self, fn: Callable[[FrozenRecords], T]) -> T:
+        """Runs `fn` against an up-to-date view while the index is guaranteed not to move."""
+        generation = self._store.refresh()
+        with self._lock:
+            self._refresh_locked(generation)
+            return fn(self._view())
+
+    def chain(self, key_value: Any) -> Optional[VersionChain]:
+        """The version chain of one record, after catching up with the store."""
+        return self.read(lambda view: self._chain_locked(key_value))
+
+    def peek(self, key_value: Any) -> Optional[VersionChain]:
+        """Chain lookup without catching up or locking, for readers pinned to an older view."""
+        return self._chain_locked(key_value)
+
+    def _chain_locked(self, key_value: Any) -> Optional[VersionChain]:
+        position = self._positions.get(key_value)
+        return None if position is None else self._chains[position]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "generation": self._generation,
+                "size": len(self._chains),
+            }
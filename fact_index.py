@@ -0,0 +1,124 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+INDEXED_FIELDS = ("source", "trust_tier", "lineage")
+
+# Postings are kept sorted by (timestamp, position) so equality lookups, time
+# ranges and cursor pagination are all bisect operations on the same list.
+_Key = Tuple[int, int]
+
+def encode_cursor(key: _Key) -> str:
+    return f"{key[0]}:{key[1]}"
+
+def decode_cursor(cursor: str) -> _Key:
+    try:
+        ts, pos = cursor.split(":", 1)
+        return int(ts), int(pos)
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+
+def _insert(keys: List[_Key], key: _Key) -> None:
+    if not keys or keys[-1] <= key:
+        keys.append(key)
+    else:
+        insort(keys, key)
+
+class FactIndex:
+    """
+    Secondary indexes over cached fact records, addressed by cache position:
+    a primary `fact_id` map, equality postings for INDEXED_FIELDS and a global
+    timestamp ordering.
+    """
+
+    def __init__(self):
+        self.by_id: Dict[str, int] = {}
+        self.postings: Dict[str, Dict[Any, List[_Key]]] = {f: {} for f in INDEXED_FIELDS}
+        self.by_time: List[_Key] = []
+
+    def add(self, position: int, record: Mapping[str, Any]) -> None:
+        key = (int(record.get("timestamp") or 0), position)
+        fact_id = record.get("fact_id")
+        if fact_id is not None:
+            self.by_id[fact_id] = position
+        for field in INDEXED_FIELDS:
+            value = record.get(field)
+            if value is not None:
+                _insert(self.postings[field].setdefault(value, []), key)
+        _insert(self.by_time, key)
+
+    def update(self, position: int, previous: Mapping[str, Any], current: Mapping[str, Any]) -> None:
+        """
+        Indexes a new version. Postings for old values are left in place and
+        filtered out at query time against the version being read.
+        """
+        key = (int(current.get("timestamp") or 0), position)
+        for field in INDEXED_FIELDS:
+            value = current.get(field)
+            if value is not None and value != previous.get(field):
+                _insert(self.postings[field].setdefault(value, []), key)
+        if current.get("timestamp") != previous.get("timestamp"):
+            _insert(self.by_time, key)
+
+    def query(self, records, filters: Dict[str, Any],
+              since: Optional[int] = None, until: Optional[int] = None,
+              descending: bool = False, limit: int = 100,
+              cursor: Optional[str] = None) -> Tuple[List[Mapping[str, Any]], Optional[str]]:
+        """
+        `records` is a fact_cache.FrozenRecords view; positions it hides
+        (retracted, or newer than the view) are skipped.
+        Returns up to `limit` records matching every equality filter and the
+        inclusive [since, until] timestamp range, in timestamp order, plus the
+        cursor for the next page (None when exhausted).
+        """
+        after = decode_cursor(cursor) if cursor is not None else None
+        page: List[Mapping[str, Any]] = []
+        last: Optional[_Key] = None
+        for key, record in self.scan(records, filters, since, until, descending, after):
+            if len(page) >= limit:
+                # An empty page has no last key to resume after; there is nothing to page through.
+                return page, encode_cursor(last) if last is not None else None
+            page.append(record)
+            last = key
+        return page, None
+
+    def scan(self, records, filters: Dict[str, Any],
+             since: Optional[int] = None, until: Optional[int] = None,
+             descending: bool = False, after: Optional[_Key] = None) -> Iterator[Tuple[_Key, Mapping[str, Any]]]:
+        """Lazily yields the (timestamp, position) key and record of every match past `after`, in order."""
+        filters = {k: v for k, v in filters.items() if v is not None}
+        unknown = set(filters) - set(INDEXED_FIELDS) - {"fact_id"}
+        if unknown:
+            raise ValueError(f"Unindexed filter fields: {sorted(unknown)}")
+
+        if "fact_id" in filters:
+            position = self.by_id.get(filters.pop("fact_id"))
+            record = None if position is None else records.at_position(position)
+            if record is None:
+                return
+            keys = [(int(record.get("timestamp") or 0), position)]
+        elif filters:
+            candidates = [self.postings[f].get(v, []) for f, v in filters.items()]
+            keys = min(candidates, key=len)
+        else:
+            keys = self.by_time
+
+        lo = 0 if since is None else bisect_left(keys, (since, -1))
+        hi = len(keys) if until is None else bisect_right(keys, (until, float("inf")))
+        if after is not None:
+            if descending:
+                hi = min(hi, bisect_left(keys, after))
+            else:
+                lo = max(lo, bisect_right(keys, after))
+
+        span = range(hi - 1, lo - 1, -1) if descending else range(lo, hi)
+        seen = set()
+        for i in span:
+            key = keys[i]
+            if key[1] in seen:
+                continue  # an older posting of the same record
+            record = records.at_position(key[1])
+            if record is None or int(record.get("timestamp") or 0) != key[0]:
+                continue  # retracted, not visible in this view, or a stale version
+            if all(record.get(f) == v for f, v in filters.items()):
+                seen.add(key[1])
+                yield key, record
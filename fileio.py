@@ -1,27 +1,122 @@
 import json
 import yaml
 import os
-from typing import Any, Dict
+import tempfile
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import orjson
+except ImportError:  # stdlib json is used instead
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # .msgpack files cannot be read or written
+    msgpack = None
+
+class Codec:
+    """Turns a document into bytes and back. Registered per file extension in CODECS."""
+
+    def __init__(self, name: str, dumps: Callable[[Any, bool], bytes], loads: Callable[[bytes], Any]):
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+
+def _json_dumps(data: Any, pretty: bool = False) -> bytes:
+    if orjson is not None:
+        try:
+            option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+            return orjson.dumps(data, option=option)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; the stdlib handles them
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def _json_loads(raw: bytes) -> Any:
+    return orjson.loads(raw) if orjson is not None else json.loads(raw.decode("utf-8"))
+
+def _msgpack_dumps(data: Any, pretty: bool = False) -> bytes:
+    if msgpack is None:
+        raise RuntimeError("msgpack is not installed")
+    return msgpack.packb(data, use_bin_type=True)
+
+def _msgpack_loads(raw: bytes) -> Any:
+    if msgpack is None:
+        raise RuntimeError("msgpack is not installed")
+    return msgpack.unpackb(raw, raw=False, strict_map_key=False)
+
+JSON = Codec("json", _json_dumps, _json_loads)
+MSGPACK = Codec("msgpack", _msgpack_dumps, _msgpack_loads)
+
+# Codec used to write a file, by extension; anything else is written as JSON.
+CODECS: Dict[str, Codec] = {".json": JSON, ".msgpack": MSGPACK, ".mpk": MSGPACK}
+
+def register_codec(extension: str, codec: Codec) -> None:
+    CODECS[extension.lower()] = codec
+
+def codec_for(path: str) -> Codec:
+    return CODECS.get(os.path.splitext(path)[1].lower(), JSON)
+
+def sniff_codec(raw: bytes, path: str = "") -> Codec:
+    """Picks the codec from the file header: JSON text starts with '{', '[' or whitespace."""
+    head = raw[:1]
+    if not head or head in b"{[ \t\r\n\xef":  # \xef: UTF-8 byte order mark
+        return JSON
+    if 0x80 <= head[0] <= 0x9f or head[0] in (0xdc, 0xdd, 0xde, 0xdf):  # msgpack map / array
+        return MSGPACK
+    return codec_for(path)
+
+def atomic_write_bytes(path: str, raw: bytes) -> None:
+    """Writes `path` via a temporary file and rename, so readers never see a partial file."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(raw)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
 
 def read_json(path: str) -> Dict[str, Any]:
+    """Reads a JSON or msgpack document (detected from its header). {} if missing or unreadable."""
     if not os.path.exists(path):
         return {}
-    with open(path, "r", encoding="utf-8") as f:
-        try:
-            return json.load(f)
-        except json.JSONDecodeError:
-            return {}
+    with open(path, "rb") as f:
+        raw = f.read()
+    if raw.startswith(b"\xef\xbb\xbf"):
+        raw = raw[3:]
+    try:
+        return sniff_codec(raw, path).loads(raw)
+    except (ValueError, RuntimeError):  # RuntimeError: msgpack document without msgpack installed
+        return {}
 
-def write_json(path: str, data: Dict[str, Any]) -> None:
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+def write_json(path: str, data: Dict[str, Any], pretty: bool = False, codec: Optional[Codec] = None) -> None:
+    """
+    Atomically writes `data` with the codec for the file's extension: compact
+    JSON (through orjson when installed) by default, msgpack for .msgpack/.mpk.
+    """
+    codec = codec or codec_for(path)
+    atomic_write_bytes(path, codec.dumps(data, pretty))
 
 def append_line(path: str, line: str) -> None:
     os.makedirs(os.path.dirname(path), exist_ok=True)
     with open(path, "a", encoding="utf-8") as f:
         f.write(line.rstrip() + "\n")
 
+def append_lines(path: str, lines: List[str]) -> None:
+    """Appends several lines with a single write."""
+    if not lines:
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("".join(line.rstrip() + "\n" for line in lines))
+
 def read_yaml(path: str) -> Dict[str, Any]:
     if not os.path.exists(path):
         return {}
@@ -1,43 +1,196 @@
-from typing import Dict, Any, List
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from src.common.logging import get_logger
+from src.approver_god.gating.check_stats import CheckStats, timed
 from src.approver_god.intake.request_schema import IntakeRequest
-from src.approver_god.retrieval.retrieve import retrieve_relevant_facts
+from src.approver_god.retrieval.retrieve import retrieve_relevant_facts_batch
 from src.approver_god.hypothesis.generate import generate_hypotheses
 from src.approver_god.validation.stats_tests import run_stats_tests
 from src.approver_god.validation.contradiction_checks import check_for_contradictions
-from src.approver_god.promotion.promote import promote_to_earth
-from src.motherboard.api import add_universe_hypothesis
+from src.approver_god.validation.scheduler import deciding_threshold
+from src.approver_god.validation.validation_cache import validation_cache
+from src.approver_god.policy.thresholds import GATEKEEPER_THRESHOLDS
+from src.approver_god.policy.vectorized import compile_policy
+from src.approver_god.promotion.promote import promote_many_to_earth
+from src.motherboard.api import (
+    add_universe_hypotheses_bulk, earth_generations, find_earth_fact_by_content, set_hypothesis_statuses,
+)
+from src.motherboard.retention import APPROVED, REJECTED
 
 log = get_logger("gatekeeper")
 
+# Validation pools, shared by all requests. Stats tests are CPU-bound and run in
+# processes (GATEKEEPER_STATS_POOL=process|thread); contradiction checks wait on
+# models and stores, so they run in threads. GATEKEEPER_STATS_WORKERS and
+# GATEKEEPER_CHECKS_WORKERS size the pools (default: the executors' own).
+# Stats workers are never forked: the pool is created from a checks thread
+# that may hold a SQLite connection (see validation_cache), locks and other
+# pools' threads, none of which survive a fork.
+STATS_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+_pools: Dict[str, Executor] = {}
+_pools_lock = threading.Lock()
+
+def _pool(name: str) -> Executor:
+    with _pools_lock:
+        if name not in _pools:
+            kind = os.getenv("GATEKEEPER_STATS_POOL", "process") if name == "stats" else "thread"
+            workers = int(os.getenv(f"GATEKEEPER_{name.upper()}_WORKERS", "0")) or None
+            if kind == "process":
+                _pools[name] = ProcessPoolExecutor(max_workers=workers,
+                                                   mp_context=multiprocessing.get_context(STATS_START_METHOD))
+            elif kind == "thread":
+                _pools[name] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"gatekeeper-{name}")
+            else:
+                raise ValueError(f"Unknown GATEKEEPER_STATS_POOL: {kind!r}")
+        return _pools[name]
+
+def _stats_check(hyp: Dict[str, Any], facts: List[Dict[str, Any]]) -> Tuple[float, float]:
+    """run_stats_tests in the stats pool, timed there; a cached result skips the pool round trip."""
+    start = time.perf_counter()
+    cache = validation_cache()
+    cached = cache.get(run_stats_tests, hyp) if cache is not None else None
+    if cached is not None:
+        return cached, time.perf_counter() - start
+    return _pool("stats").submit(timed, run_stats_tests, hyp).result()
+
+def _contradiction_check(hyp: Dict[str, Any], facts: List[Dict[str, Any]]) -> Tuple[float, float]:
+    consistent, seconds = timed(check_for_contradictions, hyp, facts)
+    return 0.0 if consistent else 1.0, seconds
+
+# Gating checks: name -> (metric, check(hypothesis, relevant facts) -> (value, seconds it ran)).
+# They are independent, and any one failing its threshold rejects.
+CHECKS: Dict[str, Tuple[str, Callable[[Dict[str, Any], List[Dict[str, Any]]], Tuple[float, float]]]] = {
+    "stats": ("stats_confidence", _stats_check),
+    "contradictions": ("contradictions", _contradiction_check),
+}
+
+# Latency and rejection rate per check, which order the checks (see check_stats).
+_check_stats = CheckStats(CHECKS)
+
+def check_stats() -> Dict[str, Any]:
+    """Per-check latency and rejection statistics, and the order checks currently run in."""
+    return _check_stats.snapshot()
+
+def _gate_metrics(hyp: Dict[str, Any], facts: List[Dict[str, Any]]) -> Dict[str, float]:
+    """
+    Gating metrics for one hypothesis (see GATEKEEPER_THRESHOLDS). Checks run
+    in the adaptive order and stop at the first rejection; the metrics of checks
+    not run are missing, which fails the hypothesis. A check that raised does
+    too, failing the hypothesis, not the request.
+    """
+    metrics: Dict[str, float] = {}
+    order = _check_stats.order()
+    for i, name in enumerate(order):
+        metric, check = CHECKS[name]
+        start = time.perf_counter()
+        try:
+            metrics[metric], seconds = check(hyp, facts)
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                with _pools_lock:
+                    _pools.pop("stats", None)  # a worker died; start a fresh pool for the next request
+            log.error(f"Validation of hypothesis {hyp['hypothesis_id']} failed: {e}")
+            _check_stats.record(name, time.perf_counter() - start, True)
+            return {}
+        remaining = {CHECKS[later][0] for later in order[i + 1:]}
+        rejected = deciding_threshold(metrics, remaining, GATEKEEPER_THRESHOLDS) is not None
+        _check_stats.record(name, seconds, rejected)
+        if rejected:
+            break
+    return metrics
+
 def process_request(request: IntakeRequest) -> List[Dict[str, Any]]:
     """
     The main pipeline for the Approver GOD.
     It ingests a request, generates hypotheses, validates them, and promotes the approved ones.
     """
-    log.info(f"Processing request for objective: {request.objective}")
-    
-    # 1. Retrieval
-    relevant_facts = retrieve_relevant_facts(request.objective)
-    
+    return process_requests_batch([request])[0]
+
+def process_requests_batch(requests: List[IntakeRequest]) -> List[List[Dict[str, Any]]]:
+    """
+    Runs a burst of requests through the pipeline together: one pinned store
+    generation and one retrieval pass for the whole batch, then one hypothesis
+    write, one validation stage and one promotion per domain. Returns each
+    request's approved facts, in request order.
+    """
+    log.info(f"Processing {len(requests)} request(s)")
+
+    # 1. Retrieval, pinned to one store generation so every check sees the same facts
+    generation = earth_generations()
+    relevant = retrieve_relevant_facts_batch([r.objective for r in requests], at_generation=generation)
+
+    by_domain: Dict[Optional[str], List[int]] = {}
+    for i, request in enumerate(requests):
+        by_domain.setdefault(request.domain, []).append(i)
+    results: List[List[Dict[str, Any]]] = [[] for _ in requests]
+    for domain, positions in by_domain.items():
+        outputs = _process_domain(domain, [requests[i] for i in positions], [relevant[i] for i in positions])
+        for i, facts in zip(positions, outputs):
+            results[i] = facts
+    return results
+
+def _process_domain(domain: Optional[str], requests: List[IntakeRequest],
+                    relevant: List[List[Dict[str, Any]]]) -> List[List[Dict[str, Any]]]:
     # 2. Hypothesis Generation
-    hypotheses = generate_hypotheses(request.objective, relevant_facts)
-    
-    approved_facts = []
-    for hyp in hypotheses:
-        add_universe_hypothesis(hyp)
-        
-        # 3. Validation
-        confidence = run_stats_tests(hyp)
-        is_consistent = check_for_contradictions(hyp, relevant_facts)
-        
-        # 4. Gating
-        if confidence >= 0.95 and is_consistent:
+    hypotheses, owners = [], []
+    for n, (request, facts) in enumerate(zip(requests, relevant)):
+        log.info(f"Processing request for objective: {request.objective}")
+        for hyp in generate_hypotheses(request.objective, facts):
+            hypotheses.append(hyp)
+            owners.append(n)
+
+    stored = add_universe_hypotheses_bulk(hypotheses, domain)
+
+    # Duplicates of earlier hypotheses were already validated: reuse the outcome.
+    # Duplicates within this batch follow the hypothesis they duplicate.
+    results: List[List[Dict[str, Any]]] = [[] for _ in requests]
+    fresh, pending = [], []
+    for owner, hyp, kept in zip(owners, hypotheses, stored):
+        if kept.get("hypothesis_id") == hyp.get("hypothesis_id"):
+            fresh.append((owner, kept))
+            continue
+        log.info(f"Hypothesis {hyp['hypothesis_id']} duplicates {kept['hypothesis_id']}; skipping validation.")
+        pending.append((owner, kept))
+    fresh_ids = {hyp["hypothesis_id"] for _, hyp in fresh}
+    for owner, kept in pending:
+        if kept["hypothesis_id"] not in fresh_ids:
+            fact = find_earth_fact_by_content(kept["content_hash"], domain)
+            if fact is not None:
+                results[owner].append(fact)
+
+    # 3. Validation of all hypotheses at once, so latency follows the slowest one;
+    # each hypothesis runs its checks in cost order and stops at a rejection
+    validations = [_pool("checks").submit(_gate_metrics, hyp, relevant[owner]) for owner, hyp in fresh]
+
+    # 4. Gating, all hypotheses in one policy evaluation, in generation order
+    # so promotion order does not depend on timing
+    policy = compile_policy(GATEKEEPER_THRESHOLDS)
+    metrics = [validation.result() for validation in validations]
+    passed, failures = policy.evaluate(policy.metrics_array(metrics))
+    approved, approved_owners, outcomes = [], [], {}
+    for (owner, hyp), ok, failed in zip(fresh, passed, policy.failure_names(failures)):
+        if ok:
             log.info(f"Hypothesis {hyp['hypothesis_id']} passed validation.")
-            # 5. Promotion
-            fact = promote_to_earth(hyp, hyp['hypothesis_id'], "approver_god_v1")
-            approved_facts.append(fact)
+            approved.append(hyp)
+            approved_owners.append(owner)
+            outcomes[hyp["hypothesis_id"]] = APPROVED
         else:
-            log.warn(f"Hypothesis {hyp['hypothesis_id']} failed validation.")
-            
-    return approved_facts
\ No newline at end of file
+            log.warn(f"Hypothesis {hyp['hypothesis_id']} failed validation ({failed}).")
+            outcomes[hyp["hypothesis_id"]] = REJECTED
+    # Rejected hypotheses age out of the hot store (see retention)
+    set_hypothesis_statuses(outcomes, domain)
+
+    # 5. Promotion, as a single write to the domain's shard
+    promoted = {}
+    for owner, hyp, fact in zip(approved_owners, approved, promote_many_to_earth(approved, "approver_god_v1", domain)):
+        results[owner].append(fact)
+        promoted[hyp["hypothesis_id"]] = fact
+    for owner, kept in pending:
+        if kept["hypothesis_id"] in promoted:
+            results[owner].append(promoted[kept["hypothesis_id"]])
+    return results
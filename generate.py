@@ -1,10 +1,16 @@
 from typing import List, Dict, Any
 from src.common.ids import make_id
 
+# Retrieval returns the nearest facts, best first; a hypothesis builds on the top
+# few. Only those are lineage parents (see lineage): retracting a fact cascades
+# to what derives from it, not to everything it was retrieved next to.
+MAX_SOURCE_FACTS = 3
+
 def generate_hypotheses(objective: str, relevant_facts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Generates novel hypotheses based on an objective and existing facts."""
     # Placeholder for a sophisticated generative model.
-    claim = f"A novel approach for '{objective}' could involve combining concepts from {len(relevant_facts)} facts."
+    sources = [f["fact_id"] for f in relevant_facts if f.get("fact_id")]
+    claim = f"A novel approach for '{objective}' could involve combining concepts from {len(sources[:MAX_SOURCE_FACTS])} facts."
     
     hypothesis = {
         "hypothesis_id": make_id("HYP"),
@@ -12,6 +18,8 @@ def generate_hypotheses(objective: str, relevant_facts: List[Dict[str, Any]]) ->
         "assumptions": ["Standard operating conditions", "Data from facts is accurate"],
         "validation_plan": ["stats_tests", "contradiction_checks"],
         "novelty_score": 0.75, # Placeholder score
+        "derived_from": sources[:MAX_SOURCE_FACTS],
+        "retrieved_context": sources[MAX_SOURCE_FACTS:],  # seen but not built on; not lineage
     }
     
     return [hypothesis]
\ No newline at end of file
@@ -1,7 +1,11 @@
 import time
 import hashlib
+import itertools
+
+# Disambiguates IDs minted within the same clock tick (e.g. in bulk inserts).
+_counter = itertools.count()
 
 def make_id(prefix: str) -> str:
     """Creates a unique ID with a given prefix."""
-    ts = str(time.time_ns())
+    ts = f"{time.time_ns()}-{next(_counter)}"
     return f"{prefix.upper()}_{hashlib.sha256(ts.encode()).hexdigest()[:12]}"
\ No newline at end of file
@@ -0,0 +1,137 @@
+"""
+Lineage graph of the Motherboard.
+
+Edges point from a record to what it was derived from: a fact to its `lineage`
+(usually the hypothesis it was promoted from, or an ingestion source), and a
+hypothesis to the facts listed in its `derived_from`. Both directions are kept
+as adjacency sets, so ancestor / descendant walks only touch the affected
+subgraph. The graph is checkpointed to lineage_map.json together with the
+stream generations it covers; on startup only the tail of each stream after
+those generations is replayed. Streams are named "facts" / "hypotheses", or
+"<shard>:facts" / "<shard>:hypotheses" for shards other than the default one,
+so one graph spans every shard.
+"""
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from src.common.fileio import read_json, write_json
+from src.motherboard.mvcc import UPDATE
+from src.motherboard.storage import FACTS, Stream
+
+def _kind(stream: str) -> str:
+    return stream.rsplit(":", 1)[-1]
+
+def _parents_of(stream: str, record: Dict[str, Any]) -> Tuple[Optional[str], List[str]]:
+    """(node id, parent ids) described by one base record of `stream`."""
+    if _kind(stream) == FACTS:
+        parent = record.get("lineage")
+        return record.get("fact_id"), [parent] if parent else []
+    return record.get("hypothesis_id"), [p for p in record.get("derived_from") or () if p]
+
+class LineageGraph:
+    """In-memory parent/child adjacency lists with an incremental JSON checkpoint."""
+
+    def __init__(self, path: Path, backend: str = "", checkpoint_every: int = 1000):
+        self.path = path
+        self.backend = backend
+        self.checkpoint_every = checkpoint_every
+        self._lock = threading.RLock()
+        self.parents: Dict[str, Set[str]] = {}
+        self.children: Dict[str, Set[str]] = {}
+        self.generations: Dict[str, int] = {}
+        self._dirty = 0
+
+    def load(self, streams: Dict[str, Stream]) -> None:
+        """Restores the checkpoint, unless it does not match the current streams."""
+        data = read_json(str(self.path))
+        generations = data.get("generations", {})
+        if data.get("backend", self.backend) != self.backend or any(
+            generations.get(name, 0) > stream.refresh() for name, stream in streams.items()
+        ):
+            return
+        with self._lock:
+            for child, parents in data.get("lineage", {}).items():
+                self._set_parents(child, parents)
+            self.generations.update({name: int(seq) for name, seq in generations.items()})
+            self._dirty = 0
+
+    def save(self) -> None:
+        """Writes the checkpoint (atomically, see fileio.write_json)."""
+        with self._lock:
+            data = {
+                "backend": self.backend,
+                "generations": dict(self.generations),
+                "lineage": {child: sorted(parents) for child, parents in self.parents.items()},
+            }
+            self._dirty = 0
+        write_json(str(self.path), data)
+
+    def _set_parents(self, child: str, parents: Iterable[str]) -> None:
+        new = set(parents)
+        old = self.parents.get(child, set())
+        for parent in old - new:
+            self.children[parent].discard(child)
+        for parent in new - old:
+            self.children.setdefault(parent, set()).add(child)
+        self.parents[child] = new
+        self._dirty += 1
+
+    def feed(self, stream: str, records: Iterator[Tuple[int, Dict[str, Any]]]) -> None:
+        """Applies records of `stream` in sequence order."""
+        with self._lock:
+            for seq, record in records:
+                if seq <= self.generations.get(stream, 0):
+                    continue
+                op = record.get("op")
+                if op is None:
+                    node, parents = _parents_of(stream, record)
+                    if node is not None:
+                        self._set_parents(node, parents)
+                elif op == UPDATE and _kind(stream) == FACTS and "lineage" in record.get("changes", {}):
+                    parent = record["changes"]["lineage"]
+                    self._set_parents(record.get("fact_id"), [parent] if parent else [])
+                self.generations[stream] = seq
+
+    def refresh(self, streams: Dict[str, Stream]) -> None:
+        """Catches up with every stream, checkpointing once enough edges changed."""
+        with self._lock:
+            for name, stream in streams.items():
+                if stream.refresh() > self.generations.get(name, 0):
+                    self.feed(name, stream.replay(after=self.generations.get(name, 0)))
+            dirty = self._dirty >= self.checkpoint_every
+        if dirty:
+            self.save()
+
+    def _walk(self, start: str, edges: Dict[str, Set[str]], max_depth: Optional[int]) -> List[str]:
+        """Breadth-first walk from `start` (excluded), nearest nodes first."""
+        with self._lock:
+            seen = {start}
+            order: List[str] = []
+            queue = deque([(start, 0)])
+            while queue:
+                node, depth = queue.popleft()
+                if max_depth is not None and depth >= max_depth:
+                    continue
+                for nxt in edges.get(node, ()):
+                    if nxt not in seen:
+                        seen.add(nxt)
+                        order.append(nxt)
+                        queue.append((nxt, depth + 1))
+            return order
+
+    def ancestors(self, node: str, max_depth: Optional[int] = None) -> List[str]:
+        """Everything `node` was derived from, directly or transitively."""
+        return self._walk(node, self.parents, max_depth)
+
+    def descendants(self, node: str, max_depth: Optional[int] = None) -> List[str]:
+        """Everything derived from `node`, directly or transitively."""
+        return self._walk(node, self.children, max_depth)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "nodes": len(self.parents.keys() | self.children.keys()),
+                "edges": sum(len(p) for p in self.parents.values()),
+                **{f"{name}_generation": seq for name, seq in self.generations.items()},
+            }
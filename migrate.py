@@ -0,0 +1,113 @@
+"""
+Online migration of the Motherboard into the SQLite (WAL) engine.
+
+Copies facts, hypotheses and lineage from the file-based stores into SQLite in
+small batches: the default shard into one database, every other shard into
+the motherboard.db in its own directory, where the SQLite engine opens it.
+Every batch commits together with a per-stream watermark (the last copied
+sequence number), so the tool can run next to a live service, be interrupted,
+and be re-run to pick up whatever was written since. Once a final run reports
+nothing new, switch the service over with MOTHERBOARD_BACKEND=sqlite.
+
+Usage:
+    python -m src.motherboard.migrate [--db PATH] [--batch-size N]
+"""
+import argparse
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+from src.common.logging import get_logger
+from src.motherboard import api
+from src.motherboard.sharding import DEFAULT_SHARD
+from src.motherboard.sqlite_store import SQL_INSERT_LINEAGE, SQLiteBackend
+from src.motherboard.storage import backend_kind
+
+log = get_logger("migrate")
+
+SQL_GET_WATERMARK = "SELECT position FROM migrations WHERE source = ?"
+SQL_SET_WATERMARK = "INSERT OR REPLACE INTO migrations (source, position) VALUES (?, ?)"
+
+def _watermark(backend: SQLiteBackend, source: str) -> int:
+    row = backend.reader().execute(SQL_GET_WATERMARK, (source,)).fetchone()
+    return row[0] if row else 0
+
+def _batches(items: Iterable, size: int) -> Iterator[List]:
+    it = iter(items)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+def _copy_stream(backend: SQLiteBackend, key: str, batch_size: int) -> int:
+    """
+    Copies the records of stream `key` (see api.stream_generations) after its
+    watermark. The default shard's log is seeded from the legacy JSON files in
+    order when first opened, so a legacy installation migrates the same way.
+    """
+    watermark = f"stream:{key}"
+    target = backend.stream(key.rpartition(":")[2])
+    copied = 0
+    for batch in _batches(api.replay_stream(key, after=_watermark(backend, watermark)), batch_size):
+        with backend.write() as conn:
+            target._insert(conn, [record for _, record in batch])
+            conn.execute(SQL_SET_WATERMARK, (watermark, batch[-1][0]))
+        copied += len(batch)
+    log.info(f"Migrated {copied} records of '{key}' into {backend.path}")
+    return copied
+
+def _copy_lineage(backend: SQLiteBackend, batch_size: int) -> int:
+    if not api.EARTH_LINEAGE.exists():
+        return 0
+    source = str(api.EARTH_LINEAGE)
+    position = _watermark(backend, source)
+    with open(api.EARTH_LINEAGE, "r", encoding="utf-8") as f:
+        lines = ((n, line) for n, line in enumerate(f, start=1) if n > position)
+        copied = 0
+        for batch in _batches(lines, batch_size):
+            pairs = []
+            for _, line in batch:
+                if line.startswith("#") or "|" not in line:
+                    continue
+                fact_id, parent = (part.strip() for part in line.split("|", 1))
+                pairs.append((fact_id, parent))
+            with backend.write() as conn:
+                conn.executemany(SQL_INSERT_LINEAGE, pairs)
+                conn.execute(SQL_SET_WATERMARK, (source, batch[-1][0]))
+            copied += len(pairs)
+    log.info(f"Migrated {copied} lineage edges from {source}")
+    return copied
+
+def migrate_to_sqlite(db_path: Optional[Path] = None, batch_size: int = 500) -> Dict[str, int]:
+    """
+    Copies everything not yet migrated: the default shard into `db_path`
+    (SQLITE_DB by default), every other shard into SHARDS_DIR/<shard>/motherboard.db.
+    Returns the records copied per stream plus "lineage". Safe to re-run.
+    """
+    if backend_kind() != "log":
+        raise ValueError("migrate reads the log engine; unset MOTHERBOARD_BACKEND while migrating")
+    targets = {DEFAULT_SHARD: SQLiteBackend(db_path or api.SQLITE_DB)}
+    try:
+        counts = {}
+        for key in api.stream_generations():
+            shard = key.rpartition(":")[0] or DEFAULT_SHARD
+            if shard not in targets:
+                targets[shard] = SQLiteBackend(api.SHARDS_DIR / shard / "motherboard.db")
+            counts[key] = _copy_stream(targets[shard], key, batch_size)
+        counts["lineage"] = _copy_lineage(targets[DEFAULT_SHARD], batch_size)
+        return counts
+    finally:
+        api.close_stores()
+        for target in targets.values():
+            target.close()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Migrate the Motherboard into SQLite (WAL).")
+    parser.add_argument("--db", type=Path, default=None, help="Target database file of the default shard")
+    parser.add_argument("--batch-size", type=int, default=500, help="Records per transaction")
+    args = parser.parse_args()
+    counts = migrate_to_sqlite(args.db, args.batch_size)
+    log.info(f"Migration finished: {counts}")
+
+if __name__ == "__main__":
+    main()
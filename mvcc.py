@@ -0,0 +1,101 @@
+"""
+Multi-version records for the Motherboard.
+
+A store stream holds base records (version 1) and delta records of the form
+{"op": "update", <key>: ..., "changes": {...}, "timestamp": ...}; retractions
+are {"op": "retract", <key>: ..., "reason": ...} (see retractions). Versions are
+numbered by their order in the stream, so every process that replays the same
+stream sees the same history. Readers pin a generation (sequence number) and
+never block writers, who only ever append.
+"""
+from bisect import bisect_right
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+from src.motherboard.records import Record
+from src.motherboard.retractions import RETRACT
+
+UPDATE = "update"
+
+def apply_delta(current: Mapping[str, Any], delta: Dict[str, Any], key: str) -> Mapping[str, Any]:
+    """
+    Materializes the next version from the previous one and a delta record.
+    Slotted records (see records) stay records and share the previous payload.
+    """
+    changes = {k: v for k, v in delta.get("changes", {}).items() if k not in (key, "version")}
+    if isinstance(current, Record):
+        changes["version"] = int(current.get("version") or 1) + 1
+        changes["updated_at"] = delta.get("timestamp")
+        return current.replace(changes)
+    version = dict(current)
+    version.update(changes)
+    version["version"] = int(current.get("version") or 1) + 1
+    version["updated_at"] = delta.get("timestamp")
+    return version
+
+def _read_only(record: Mapping[str, Any]) -> Mapping[str, Any]:
+    return record if isinstance(record, Record) else MappingProxyType(record)
+
+class VersionChain:
+    """All versions of one record, oldest first, with the seq and time each became visible."""
+
+    __slots__ = ("seqs", "timestamps", "versions")
+
+    def __init__(self, seq: int, record: Mapping[str, Any]):
+        self.seqs = [seq]
+        self.timestamps = [int(record.get("timestamp") or 0)]
+        self.versions: List[Mapping[str, Any]] = [_read_only(record)]
+
+    @property
+    def latest(self) -> Mapping[str, Any]:
+        return self.versions[-1]
+
+    def add(self, seq: int, timestamp: int, record: Mapping[str, Any]) -> Mapping[str, Any]:
+        view = _read_only(record)
+        # Append order matters for lock-free readers: seqs last, so a reader
+        # that sees the new seq always finds its version.
+        self.versions.append(view)
+        self.timestamps.append(int(timestamp or 0))
+        self.seqs.append(seq)
+        return view
+
+    def at_seq(self, seq: int) -> Optional[Mapping[str, Any]]:
+        """The version visible to a reader pinned at generation `seq`."""
+        if len(self.seqs) == 1:
+            return self.versions[0] if self.seqs[0] <= seq else None
+        i = bisect_right(self.seqs, seq) - 1
+        return self.versions[i] if i >= 0 else None
+
+    def as_of(self, timestamp: int) -> Optional[Mapping[str, Any]]:
+        """The version that was current at wall-clock `timestamp`."""
+        i = bisect_right(self.timestamps, timestamp) - 1
+        return self.versions[i] if i >= 0 else None
+
+class DeltaOverlay:
+    """
+    Keeps only the delta records of a stream (memory grows with the number of
+    updates, not with the store), so a streaming reader can hand out current
+    versions without materializing the base records.
+    """
+
+    def __init__(self, key: str, retractions=None):
+        self.key = key
+        self.retractions = retractions
+        self.generation = 0
+        self.deltas: Dict[Any, List[Tuple[int, Dict[str, Any]]]] = {}
+
+    def feed(self, records: Iterator[Tuple[int, Dict[str, Any]]]) -> None:
+        for seq, record in records:
+            op = record.get("op")
+            if op == UPDATE:
+                self.deltas.setdefault(record.get(self.key), []).append((seq, record))
+            elif op == RETRACT and self.retractions is not None:
+                self.retractions.add(record.get(self.key), seq, record.get("timestamp"), record.get("reason", ""))
+            self.generation = seq
+
+    def merge(self, record: Dict[str, Any], upto: int) -> Dict[str, Any]:
+        """Applies every delta for `record` with a seq up to `upto`."""
+        for seq, delta in self.deltas.get(record.get(self.key), ()):
+            if seq > upto:
+                break
+            record = apply_delta(record, delta, self.key)
+        return record
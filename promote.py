@@ -1,14 +1,30 @@
-from typing import Dict, Any
-from ...motherboard.api import add_earth_fact
+from typing import Dict, Any, List, Optional
+from ...motherboard.api import add_earth_fact, add_earth_facts_bulk
 from ..common.logging import get_logger
 
 log = get_logger("promoter")
 
-def promote_to_earth(approved_hypothesis: Dict[str, Any], lineage: str, source: str) -> Dict[str, Any]:
+def promote_to_earth(approved_hypothesis: Dict[str, Any], lineage: str, source: str, domain: Optional[str] = None) -> Dict[str, Any]:
     """Promotes a validated hypothesis to an Earth Fact."""
     confidence = approved_hypothesis.get("confidence_score", 0.98)
     trust_tier = "approved_simulation"
     
-    fact = add_earth_fact(approved_hypothesis, source, lineage, trust_tier, confidence)
+    fact = add_earth_fact(approved_hypothesis, source, lineage, trust_tier, confidence, domain)
     log.info(f"Promoted to Earth Fact: {fact['fact_id']}")
-    return fact
\ No newline at end of file
+    return fact
+
+def promote_many_to_earth(approved_hypotheses: List[Dict[str, Any]], source: str,
+                          domain: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Promotes a batch of validated hypotheses in a single write to the domain's shard. Lineage is each hypothesis_id."""
+    entries = [{
+        "content": hyp,
+        "source": source,
+        "lineage": hyp["hypothesis_id"],
+        "trust_tier": "approved_simulation",
+        "confidence": hyp.get("confidence_score", 0.98),
+    } for hyp in approved_hypotheses]
+
+    facts = add_earth_facts_bulk(entries, domain)
+    for fact in facts:
+        log.info(f"Promoted to Earth Fact: {fact['fact_id']}")
+    return facts
\ No newline at end of file
@@ -0,0 +1,170 @@
+"""
+Compact, immutable record types for Motherboard facts and hypotheses.
+
+A record keeps the store encoding of its JSON payload as-is, plus the few
+header fields that indexes, filters and the pipeline read in `__slots__`.
+Everything else (the fact `content`, hypothesis claims and assumptions, ...)
+is decoded from the store bytes on first access and kept in the record from
+then on, so a held record whose body is never read costs its encoded size plus
+a small fixed header instead of a tree of dicts. Records are read-only Mappings, so code written against dicts keeps
+working; `to_dict()` decodes the whole record at once.
+
+Reading from a stream hands the store's bytes to the record without copying
+(`from_store`), and an unmodified record is written back from the same bytes
+(`to_store`).
+"""
+import json
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Tuple, Type, Union
+
+_MISSING = object()
+_layouts: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+def encode(record: Mapping) -> bytes:
+    """Store encoding of a record: compact UTF-8 JSON."""
+    if isinstance(record, Record):
+        return record.to_store()
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+class Record(Mapping):
+    """
+    Base of the slotted record types. Subclasses list their header fields in
+    HEADER (and in __slots__); string values of INTERNED fields are interned,
+    as they repeat across millions of records.
+    """
+
+    __slots__ = ("_raw", "_body", "_overrides", "_decoded")
+    HEADER: Tuple[str, ...] = ()
+    INTERNED: frozenset = frozenset()
+    _header_set: frozenset = frozenset()
+
+    @classmethod
+    def from_store(cls, raw: Union[bytes, str]) -> "Record":
+        """A record over one store payload, without copying it."""
+        if isinstance(raw, str):
+            raw = raw.encode("utf-8")
+        return cls._build(json.loads(raw), raw)
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "Record":
+        if isinstance(data, cls):
+            return data
+        return cls._build(data, encode(data))
+
+    @classmethod
+    def _build(cls, data: Mapping[str, Any], raw: bytes) -> "Record":
+        record = cls.__new__(cls)
+        for name in cls.HEADER:
+            value = data.get(name, _MISSING)
+            if value is not _MISSING:
+                if name in cls.INTERNED and isinstance(value, str):
+                    value = sys.intern(value)
+                object.__setattr__(record, name, value)
+        body = tuple(k for k in data if k not in cls._header_set)
+        record._raw = raw
+        record._body = _layouts.setdefault(body, body)
+        record._overrides = None
+        record._decoded = None
+        return record
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._header_set = frozenset(cls.HEADER)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._header_set:
+            value = getattr(self, key, _MISSING)
+        elif self._overrides is not None and key in self._overrides:
+            value = self._overrides[key]
+        elif key in self._body:
+            return self._payload()[key]
+        else:
+            value = _MISSING
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        for name in self.HEADER:
+            if getattr(self, name, _MISSING) is not _MISSING:
+                yield name
+        yield from self._body
+        if self._overrides is not None:
+            yield from (k for k in self._overrides if k not in self._body)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._header_set:
+            return getattr(self, key, _MISSING) is not _MISSING
+        return key in self._body or (self._overrides is not None and key in self._overrides)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in self._header_set:
+            raise AttributeError(f"{type(self).__name__} is read-only")
+        object.__setattr__(self, name, value)
+
+    def _payload(self) -> Dict[str, Any]:
+        """The decoded payload, parsed on first use and kept."""
+        if self._decoded is None:
+            self._decoded = json.loads(self._raw)
+        return self._decoded
+
+    def to_dict(self) -> Dict[str, Any]:
+        """A plain dict copy. Its values are decoded afresh, so callers may modify them."""
+        data = {name: getattr(self, name) for name in self.HEADER if getattr(self, name, _MISSING) is not _MISSING}
+        if self._body:
+            decoded = json.loads(self._raw)
+            data.update((k, decoded[k]) for k in self._body)
+        if self._overrides is not None:
+            data.update(self._overrides)
+        return data
+
+    def to_store(self) -> bytes:
+        """The store encoding; the original bytes unless the record was derived with replace()."""
+        if self._overrides is None:
+            return self._raw
+        return encode(self.to_dict())
+
+    def replace(self, changes: Mapping[str, Any]) -> "Record":
+        """A new version with `changes` applied. The payload bytes are shared, not copied."""
+        record = type(self).__new__(type(self))
+        for name in self.HEADER:
+            value = changes.get(name, getattr(self, name, _MISSING))
+            if value is not _MISSING:
+                object.__setattr__(record, name, value)
+        overrides = dict(self._overrides or {})
+        overrides.update((k, v) for k, v in changes.items() if k not in self._header_set)
+        record._raw = self._raw
+        record._body = self._body
+        record._overrides = overrides
+        record._decoded = self._decoded
+        return record
+
+    def __reduce__(self):
+        # Pickles as the store encoding (e.g. to hand records to a process pool).
+        return type(self).from_store, (self.to_store(),)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+class Fact(Record):
+    __slots__ = ("fact_id", "version", "status", "trust_tier", "source", "confidence",
+                 "lineage", "timestamp", "updated_at", "domain")
+    HEADER = __slots__
+    INTERNED = frozenset({"status", "trust_tier", "source", "domain"})
+
+class Hypothesis(Record):
+    __slots__ = ("hypothesis_id", "version", "status", "novelty_score",
+                 "confidence_score", "timestamp", "updated_at", "domain")
+    HEADER = __slots__
+    INTERNED = frozenset({"status", "domain"})
+
+def decode(raw: Union[bytes, str], record_type: Type[Record]) -> Union[Record, Dict[str, Any]]:
+    """One store payload: a `record_type` for base records, a plain dict for op records (see mvcc)."""
+    data = json.loads(raw)
+    if data.get("op") is not None:
+        return data
+    return record_type._build(data, raw.encode("utf-8") if isinstance(raw, str) else raw)
@@ -1,14 +1,19 @@
 from typing import Dict, Any
-from ...motherboard.api import get_earth_facts
+from ...motherboard.api import query_facts
+from ...motherboard.records import Record
 from ..common.logging import get_logger
 
 log = get_logger("baby_science")
 
 def respond(request: Dict[str, Any]) -> Dict[str, Any]:
     """Responds to a request using only approved Earth knowledge."""
-    facts = get_earth_facts()
-    if not facts:
+    # The newest live fact, straight from the Motherboard's timestamp index:
+    # nothing is copied into this process, and retracted facts never show up.
+    found = query_facts(descending=True, limit=1)["facts"]
+    if not found:
         return {"response": "I have no approved knowledge to answer this request."}
     
-    log.info(f"Responding with guidance from {len(facts)} Earth facts.")
-    return {"response": "Based on approved Earth knowledge, here is a novel insight:", "guidance": facts[-1]}
\ No newline at end of file
+    latest = found[0]
+    log.info(f"Responding with guidance from Earth fact {latest.get('fact_id')}.")
+    guidance = latest.to_dict() if isinstance(latest, Record) else dict(latest)
+    return {"response": "Based on approved Earth knowledge, here is a novel insight:", "guidance": guidance}
@@ -0,0 +1,216 @@
+"""
+Retention for the Universe: TTLs by status, compaction and a cold tier.
+
+Hypotheses are stored "provisional"; the gatekeeper marks them "approved" or
+"rejected" with update records (see mvcc). A compaction run moves every
+hypothesis whose last change is older than the TTL of its status out of the
+hot hypotheses stream into a gzip-compressed cold segment, so the stream the
+gatekeeper replays (content index, overlays) only holds the recent working
+set. Each cold segment has a small JSON sidecar index; together they keep
+archived hypotheses queryable by ID, content hash, status and time without
+decompressing anything.
+
+TTLs are in seconds, overridable with UNIVERSE_TTL_<STATUS> ("none" keeps
+hypotheses of that status hot forever). Hypotheses without a timestamp (seeded
+from a pre-retention installation) stay hot until a later change dates them.
+
+Usage:
+    python -m src.motherboard.retention
+"""
+import gzip
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, NamedTuple, Optional, Tuple
+from src.common.fileio import atomic_write_bytes, read_json, write_json
+from src.common.logging import get_logger
+from src.motherboard.content_hash import hypothesis_hash
+from src.motherboard.mvcc import UPDATE, apply_delta
+from src.motherboard.storage import Stream
+
+log = get_logger("retention")
+
+PROVISIONAL = "provisional"
+APPROVED = "approved"
+REJECTED = "rejected"
+STATUSES = (PROVISIONAL, APPROVED, REJECTED)
+
+DAY = 86400
+DEFAULT_TTLS: Dict[str, Optional[int]] = {PROVISIONAL: 30 * DAY, REJECTED: 7 * DAY, APPROVED: None}
+
+SEGMENT_SUFFIX = ".jsonl.gz"
+INDEX_SUFFIX = ".idx.json"
+KEY = "hypothesis_id"
+
+def retention_ttls() -> Dict[str, Optional[int]]:
+    ttls = dict(DEFAULT_TTLS)
+    for status in STATUSES:
+        value = os.getenv(f"UNIVERSE_TTL_{status.upper()}")
+        if value is not None:
+            ttls[status] = None if value.strip().lower() == "none" else int(value)
+    return ttls
+
+class ArchiveEntry(NamedTuple):
+    segment: str
+    status: Optional[str]
+    timestamp: Optional[int]
+    content_hash: Optional[str]
+
+class ColdArchive:
+    """
+    Compressed, immutable segments of archived hypotheses (all their records)
+    plus an in-memory index built from the segments' sidecars. Segments written
+    by other processes are picked up on the next lookup.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        self._segments: set = set()
+        self._entries: Dict[str, ArchiveEntry] = {}
+        self._by_hash: Dict[str, str] = {}
+
+    def _refresh(self) -> None:
+        if not self.directory.is_dir():
+            return
+        with self._lock:
+            for path in sorted(self.directory.glob(f"*{INDEX_SUFFIX}")):
+                segment = path.name[:-len(INDEX_SUFFIX)]
+                if segment not in self._segments:
+                    self._index(segment, read_json(str(path)).get("hypotheses", {}))
+
+    def _index(self, segment: str, entries: Mapping[str, Mapping[str, Any]]) -> None:
+        for hypothesis_id, e in entries.items():
+            entry = ArchiveEntry(segment, e.get("status"), e.get("timestamp"), e.get("content_hash"))
+            self._entries[hypothesis_id] = entry
+            if entry.content_hash:
+                self._by_hash[entry.content_hash] = hypothesis_id
+        self._segments.add(segment)
+
+    def write(self, records: List[Tuple[int, Dict[str, Any]]], entries: Dict[str, Dict[str, Any]]) -> str:
+        """
+        Writes one segment: the compressed records first, then the sidecar that
+        makes them visible. Returns the segment name.
+        """
+        segment = f"{records[0][0]:020d}-{records[-1][0]:020d}"
+        data = "".join(
+            json.dumps({"seq": seq, "record": record}, ensure_ascii=False, separators=(",", ":")) + "\n"
+            for seq, record in records
+        ).encode("utf-8")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(str(self.directory / f"{segment}{SEGMENT_SUFFIX}"), gzip.compress(data))
+        write_json(str(self.directory / f"{segment}{INDEX_SUFFIX}"),
+                   {"archived_at": int(time.time()), "records": len(records), "hypotheses": entries})
+        with self._lock:
+            self._index(segment, entries)
+        return segment
+
+    def _read(self, segment: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        with gzip.open(self.directory / f"{segment}{SEGMENT_SUFFIX}", "rt", encoding="utf-8") as f:
+            for line in f:
+                item = json.loads(line)
+                yield item["seq"], item["record"]
+
+    def get(self, hypothesis_id: str) -> Optional[Dict[str, Any]]:
+        """The last version of an archived hypothesis, decompressing only its segment."""
+        self._refresh()
+        entry = self._entries.get(hypothesis_id)
+        if entry is None:
+            return None
+        version = None
+        for _, record in self._read(entry.segment):
+            if record.get(KEY) != hypothesis_id:
+                continue
+            if record.get("op") is None:
+                version = record
+            elif record.get("op") == UPDATE and version is not None:
+                version = apply_delta(version, record, KEY)
+        return version
+
+    def find_by_content(self, digest: str) -> Optional[str]:
+        self._refresh()
+        return self._by_hash.get(digest)
+
+    def query(self, status: Optional[str] = None, since: Optional[int] = None,
+              until: Optional[int] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Index entries of archived hypotheses, newest first."""
+        self._refresh()
+        with self._lock:
+            matches = [
+                (hypothesis_id, e) for hypothesis_id, e in self._entries.items()
+                if (status is None or e.status == status)
+                and (since is None or (e.timestamp or 0) >= since)
+                and (until is None or (e.timestamp or 0) <= until)
+            ]
+        matches.sort(key=lambda item: item[1].timestamp or 0, reverse=True)
+        return [dict(e._asdict(), hypothesis_id=hypothesis_id) for hypothesis_id, e in matches[:limit]]
+
+    def __contains__(self, hypothesis_id: object) -> bool:
+        self._refresh()
+        return hypothesis_id in self._entries
+
+    def stats(self) -> Dict[str, int]:
+        self._refresh()
+        with self._lock:
+            return {"archived": len(self._entries), "segments": len(self._segments)}
+
+def _expired(status: str, timestamp: Optional[int], ttls: Mapping[str, Optional[int]], now: float) -> bool:
+    ttl = ttls.get(status)
+    return ttl is not None and timestamp is not None and now - timestamp >= ttl
+
+def compact(stream: Stream, archive: ColdArchive, ttls: Mapping[str, Optional[int]],
+            now: Optional[float] = None, segment_hypotheses: int = 50000) -> Dict[str, Any]:
+    """
+    Moves the hypotheses of `stream` whose TTL expired into `archive`, then
+    discards their records from the stream. Only hypotheses whose records are
+    all sealed are moved; the rest wait for a later run. Returns counts and the
+    content hash of every archived hypothesis.
+    """
+    now = time.time() if now is None else now
+    sealed = stream.sealed_seq()
+    # hypothesis_id -> [status, time of last change, content hash, all records sealed]
+    state: Dict[str, list] = {}
+    for seq, record in stream.replay():
+        hypothesis_id = record.get(KEY)
+        if hypothesis_id is None:
+            continue
+        op = record.get("op")
+        if op is None:
+            state[hypothesis_id] = [record.get("status") or PROVISIONAL, record.get("timestamp"),
+                                    hypothesis_hash(record), seq <= sealed]
+        elif hypothesis_id in state:
+            entry = state[hypothesis_id]
+            if op == UPDATE and "status" in record.get("changes", {}):
+                entry[0] = record["changes"]["status"]
+            entry[1] = record.get("timestamp") or entry[1]
+            entry[3] = entry[3] and seq <= sealed
+    expired = {h: e for h, e in state.items() if e[3] and _expired(e[0], e[1], ttls, now)}
+    if not expired:
+        return {"archived": 0, "records": 0, "hashes": {}}
+
+    by_hypothesis: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+    for seq, record in stream.replay():
+        if seq > sealed:
+            break
+        if record.get(KEY) in expired:
+            by_hypothesis.setdefault(record[KEY], []).append((seq, record))
+    ids = list(by_hypothesis)
+    for start in range(0, len(ids), segment_hypotheses):
+        group = ids[start:start + segment_hypotheses]
+        records = sorted((item for h in group for item in by_hypothesis[h]), key=lambda item: item[0])
+        entries = {h: {"status": expired[h][0], "timestamp": expired[h][1], "content_hash": expired[h][2]}
+                   for h in group}
+        archive.write(records, entries)
+    removed = stream.discard(seq for items in by_hypothesis.values() for seq, _ in items)
+    log.info(f"Archived {len(ids)} hypotheses ({removed} records) to {archive.directory}")
+    return {"archived": len(ids), "records": removed, "hashes": {h: expired[h][2] for h in ids}}
+
+def main() -> None:
+    from src.motherboard.api import compact_universe
+    result = compact_universe()
+    log.info(f"Archived {result['archived']} hypotheses ({result['records']} records)")
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,17 @@
 from ..common.logging import get_logger
-from ...motherboard.api import append_line, ROOT
+from typing import List
+from ...motherboard.api import retract_earth_fact, retract_cascade as retract_with_descendants, RETRACTED_LOG
 
 log = get_logger("retractor")
-RETRACTED_LOG = ROOT / "universe" / "retracted.log"
 
 def retract_fact(fact_id: str, reason: str):
-    """Records the retraction of a fact."""
+    """Records the retraction of a fact; it is no longer served by any Motherboard read."""
     # In a real system, this would also handle downstream consequences.
     log.warn(f"Retracting fact {fact_id} due to: {reason}")
-    append_line(str(RETRACTED_LOG), f"{fact_id} | {reason}")
\ No newline at end of file
+    if not retract_earth_fact(fact_id, reason):
+        log.info(f"Fact {fact_id} was already retracted.")
+
+def retract_cascade(fact_id: str, reason: str) -> List[str]:
+    """Retracts a fact (or everything from a hypothesis or source) together with every fact derived from it."""
+    log.warn(f"Retracting {fact_id} and everything derived from it due to: {reason}")
+    return retract_with_descendants(fact_id, f"{reason} (via {fact_id})")
\ No newline at end of file
@@ -0,0 +1,74 @@
+import threading
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+
+RETRACT = "retract"
+
+class Retraction(NamedTuple):
+    seq: int
+    timestamp: int
+    reason: str
+
+class RetractionIndex:
+    """
+    In-memory set of retracted fact IDs with O(1) membership checks.
+
+    Retractions are persisted as {"op": "retract"} records in the facts stream,
+    next to the facts they retract, so every reader that replays the stream
+    (cache, streaming iterator) feeds this index as it goes. Entries from a
+    legacy retracted.log carry seq 0, i.e. they are retracted in every snapshot.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Retraction] = {}
+
+    def load_legacy(self, path: Path) -> int:
+        """Loads "FACT_ID | reason" lines written before retractions were stored in the stream."""
+        if not path.exists():
+            return 0
+        loaded = 0
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("#") or "|" not in line:
+                    continue
+                fact_id, reason = (part.strip() for part in line.split("|", 1))
+                loaded += self.add(fact_id, 0, 0, reason)
+        return loaded
+
+    def add(self, fact_id: str, seq: int, timestamp: int, reason: str) -> bool:
+        """
+        Records a retraction. The earliest stream record wins; it also replaces a
+        legacy (seq 0) entry, since retract_fact writes to both places. Returns
+        True if the fact was not retracted before.
+        """
+        with self._lock:
+            existing = self._entries.get(fact_id)
+            if existing is not None and (existing.seq or not seq):
+                return False
+            self._entries[fact_id] = Retraction(seq, int(timestamp or 0), reason)
+            return existing is None
+
+    def get(self, fact_id: str) -> Optional[Retraction]:
+        return self._entries.get(fact_id)
+
+    def is_retracted(self, fact_id: str, at_seq: Optional[int] = None, as_of: Optional[int] = None) -> bool:
+        """Whether `fact_id` is retracted now, at generation `at_seq`, or at unix time `as_of`."""
+        entry = self._entries.get(fact_id)
+        if entry is None:
+            return False
+        if at_seq is not None and entry.seq > at_seq:
+            return False
+        if as_of is not None and entry.timestamp > as_of:
+            return False
+        return True
+
+    def __contains__(self, fact_id: str) -> bool:
+        return fact_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def items(self):
+        with self._lock:
+            return list(self._entries.items())
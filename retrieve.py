@@ -1,7 +1,28 @@
-from typing import List, Dict, Any
-from ...motherboard.api import get_earth_facts
+from itertools import islice
+from typing import List, Dict, Any, Mapping, Optional, Union
+from ...motherboard.api import iter_earth_facts, search_earth_facts
 
-def retrieve_relevant_facts(objective: str) -> List[Dict[str, Any]]:
-    """Retrieves facts from Motherboard relevant to the objective."""
-    # Placeholder: In a real system, this would use semantic search (RAG).
-    return get_earth_facts()
\ No newline at end of file
+# Facts returned per objective when no limit is given.
+DEFAULT_TOP_K = 20
+
+def retrieve_relevant_facts(objective: str, limit: Optional[int] = None,
+                            at_generation: Union[int, Mapping[str, int], None] = None) -> List[Dict[str, Any]]:
+    """
+    Retrieves facts from Motherboard relevant to the objective (at most `limit`),
+    optionally as of pinned store generations (see earth_generations).
+    """
+    return retrieve_relevant_facts_batch([objective], limit, at_generation)[0]
+
+def retrieve_relevant_facts_batch(objectives: List[str], limit: Optional[int] = None,
+                                  at_generation: Union[int, Mapping[str, int], None] = None) -> List[List[Dict[str, Any]]]:
+    """
+    retrieve_relevant_facts for many objectives: the `limit` (default DEFAULT_TOP_K)
+    facts semantically closest to each, with the objectives embedded in one batch.
+    Without an embedding model installed, every objective gets the first `limit`
+    facts from a single pass over the store, as one shared (read-only) list.
+    """
+    found = search_earth_facts(objectives, limit or DEFAULT_TOP_K, at_generation)
+    if found is not None:
+        return found
+    facts = list(islice(iter_earth_facts(at_generation=at_generation), limit))
+    return [facts for _ in objectives]
\ No newline at end of file
@@ -1,4 +1,8 @@
+import asyncio
+import json
+import time
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from typing import Dict, Any
 from ..common.logging import info, warn
 
@@ -21,3 +25,88 @@ def submit_request(payload: Dict[str, Any]):
         warn("Gatekeeper not available or errored; returning provisional response")
         # minimal safe fallback
         return {"approved": [], "note": "gatekeeper unavailable", "error": str(e)}
+
+@router.post("/api/request/batch")
+def submit_requests(payload: Dict[str, Any]):
+    """Several requests in one call ({"requests": [...]}); results come back in request order."""
+    info("Received request to /api/request/batch")
+    try:
+        from src.approver_god.gating.gatekeeper import process_requests_batch  # type: ignore
+        from src.approver_god.intake.request_schema import IntakeRequest  # type: ignore
+        requests = [IntakeRequest(**item) for item in payload.get("requests", [])]
+        return {"results": [{"approved": outputs} for outputs in process_requests_batch(requests)]}
+    except Exception as e:
+        warn("Gatekeeper not available or errored; returning provisional response")
+        return {"results": [], "note": "gatekeeper unavailable", "error": str(e)}
+
+@router.get("/api/request/checks")
+def gatekeeper_check_stats() -> Dict[str, Any]:
+    """Per-check latency and rejection rate of the gatekeeper, and the order it runs the checks in."""
+    from src.approver_god.gating.gatekeeper import check_stats  # type: ignore
+    return check_stats()
+
+@router.get("/api/motherboard/cache")
+def motherboard_cache_stats() -> Dict[str, Any]:
+    from src.motherboard.api import fact_cache_stats  # type: ignore
+    return fact_cache_stats()
+
+@router.get("/api/motherboard/search")
+def motherboard_search(q: str, k: int = 10) -> Dict[str, Any]:
+    """Earth facts semantically closest to `q`, best first; see vector_index."""
+    from src.motherboard.api import search_earth_facts  # type: ignore
+    found = search_earth_facts([q], min(k, 1000))
+    if found is None:
+        raise HTTPException(status_code=503, detail="Semantic search needs sentence-transformers")
+    return {"facts": [dict(fact) for fact in found[0]]}
+
+@router.get("/api/motherboard/universe/archive")
+def universe_archive(status: str = None, since: int = None, until: int = None, limit: int = 100) -> Dict[str, Any]:
+    """Archived (compacted) hypotheses, newest first; see retention."""
+    from src.motherboard.api import query_archived_hypotheses  # type: ignore
+    return {"hypotheses": query_archived_hypotheses(status, since, until, min(limit, 10000))}
+
+@router.get("/api/motherboard/universe/archive/{hypothesis_id}")
+def universe_archived_hypothesis(hypothesis_id: str) -> Dict[str, Any]:
+    from src.motherboard.api import get_archived_hypothesis  # type: ignore
+    hypothesis = get_archived_hypothesis(hypothesis_id)
+    if hypothesis is None:
+        raise HTTPException(status_code=404, detail=f"No archived hypothesis {hypothesis_id}")
+    return hypothesis
+
+@router.get("/api/motherboard/changes")
+def motherboard_changes(since: str = "0", limit: int = 1000, wait: float = 0.0) -> Dict[str, Any]:
+    """Change feed; `since` is the previous `next_seq`, `wait` (seconds, max 60) turns the request into a long poll."""
+    from src.motherboard.api import changes_since  # type: ignore
+    try:
+        return changes_since(since, min(limit, 10000), min(max(wait, 0.0), 60.0))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/api/motherboard/changes/stream")
+def motherboard_change_stream(since: str = "0") -> StreamingResponse:
+    """Server-sent events: one `change` event per Earth fact change; the event id is a resumable `since` cursor."""
+    from src.motherboard.api import changes_since  # type: ignore
+    from src.motherboard.sharding import decode_feed_cursor  # type: ignore
+    try:
+        decode_feed_cursor(since)  # reject a bad cursor with a 400 before the stream starts
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def events():
+        # Polls without long-poll waits, so an idle client holds no worker thread.
+        seq, quiet_since = since, time.monotonic()
+        while True:
+            batch = await asyncio.to_thread(changes_since, seq, 1000)
+            for i, change in enumerate(batch["changes"], start=1):
+                event_id = f"id: {batch['next_seq']}\n" if i == len(batch["changes"]) else ""
+                yield f"{event_id}event: change\ndata: {json.dumps(change, ensure_ascii=False)}\n\n"
+            seq = batch["next_seq"]
+            if batch["changes"]:
+                quiet_since = time.monotonic()
+                continue
+            if time.monotonic() - quiet_since >= 15.0:
+                yield ": keep-alive\n\n"
+                quiet_since = time.monotonic()
+            await asyncio.sleep(0.5)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
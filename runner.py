@@ -2,34 +2,38 @@
 # This is the validation runner for the Approver GOD.
 # It takes a hypothesis, runs its validation plan, and generates metrics.
 
-import random
 from src.approver_god.policy.thresholds import meets_thresholds
+from src.approver_god.validation.scheduler import UNKNOWN_STEP, run_plan
+from src.approver_god.validation.steps import registry_version
+from src.approver_god.validation.validation_cache import Uncacheable, memoized
+from src.common.logging import get_logger
 # In a real system, this would be a more sophisticated API call
 # from src.motherboard.api import add_earth_fact, add_universe_hypothesis
 
+log = get_logger("runner")
+
+@memoized(version=registry_version)
 def run_validation_plan(hypothesis: dict, seed: int = 42) -> dict:
     """
-    Simulates the running of a validation plan for a given hypothesis.
-    In a real system, this would execute code, run simulations, perform
-    real-world tests, etc.
+    Runs the validation plan of a given hypothesis as a DAG of registered
+    steps (see steps and scheduler) and returns the metrics they produced.
+    Steps still pending once the thresholds can no longer be met are
+    cancelled, so a rejected hypothesis may come back with only some metrics.
+    Results are cached per (hypothesis, seed) and version of the registered
+    steps, see validation_cache, unless a step failed or timed out: a retry
+    runs the plan again.
     """
-    random.seed(seed)
     print(f"--- Running Validation for Hypothesis: '{hypothesis['claim']}' ---")
 
-    # Simulate metrics based on the validation plan
     # This is where the "extensive tests, experiments, PROOFING IN THE REAL WORLD" happens.
-    # For now, we simulate it with random numbers.
-    metrics = {
-        "model_confidence": hypothesis.get("confidence", 0.0),
-        "factual_precision": random.uniform(0.9, 0.99),
-        "citation_match": random.uniform(0.95, 1.0),
-        "contradiction_rate": random.uniform(0.0, 0.05),
-        "code_tests_pass_rate": 1.0 if "code_test" in hypothesis.get("validation_plan", []) else 0.0,
-        "novelty_score": hypothesis.get("novelty_score", 0.0),
-    }
+    result = run_plan(hypothesis, hypothesis.get("validation_plan", []), seed)
+    if result.failed_threshold is not None:
+        log.info(f"Stopped early: {result.failed_threshold} cannot be met; cancelled {result.cancelled}")
 
-    print(f"Generated Metrics: {metrics}")
-    return metrics
+    print(f"Generated Metrics: {result.metrics}")
+    if any(error != UNKNOWN_STEP for error in result.errors.values()):
+        raise Uncacheable(result.metrics)
+    return result.metrics
 
 def process_hypothesis(hypothesis: dict):
     """
@@ -0,0 +1,171 @@
+"""
+Runs a hypothesis' validation plan as a dependency DAG of steps (see steps).
+
+Ready steps are started cheapest first, at most `max_concurrency` at a time
+per plan, on a shared thread pool. After every finished step the scheduler
+asks whether the thresholds can still be met: a produced metric that misses
+its threshold, or a metric that no remaining step can produce, decides the
+plan. The remaining steps are then cancelled (queued ones never start, running
+ones see ctx.cancelled), so a rejection usually costs only the cheapest
+failing step. A step that raises or exceeds its timeout produces no metrics,
+and neither do the steps depending on it. Plans are free-form: an entry with
+no registered step is skipped and reported in PlanResult.errors.
+"""
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Set, Tuple
+from src.approver_god.policy.thresholds import THRESHOLDS, criteria
+from src.approver_god.validation.steps import DEFAULT_STEPS, Step, StepContext, get_step, resolve
+from src.common.logging import get_logger
+
+log = get_logger("scheduler")
+
+# PlanResult.errors value for a plan entry that matches no registered step.
+UNKNOWN_STEP = "no registered validation step"
+
+class PlanResult(NamedTuple):
+    metrics: Dict[str, float]
+    passed: bool
+    failed_threshold: Optional[str]  # the threshold that decided a rejection
+    completed: List[str]             # steps that produced their metrics, in completion order
+    cancelled: List[str]             # steps not run (or abandoned) once the outcome was decided
+    errors: Dict[str, str]           # step or unknown plan entry -> error, timeout or failed dependency
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+def _pool() -> ThreadPoolExecutor:
+    """Step pool shared by all plans, sized by VALIDATION_STEP_WORKERS."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = int(os.getenv("VALIDATION_STEP_WORKERS", "0")) or None
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="validation-step")
+        return _executor
+
+def build_dag(plan: Iterable[str]) -> Tuple[Dict[str, Step], Dict[str, str], List[str]]:
+    """
+    The steps of a plan plus DEFAULT_STEPS and every dependency, keyed by step
+    name, the plan entry each step runs for, and the plan entries that match
+    no registered step (left out).
+    """
+    dag: Dict[str, Step] = {}
+    entries: Dict[str, str] = {}
+    unknown: List[str] = []
+    todo = [(name, name) for name in DEFAULT_STEPS]
+    for entry in plan:
+        try:
+            todo.append((resolve(entry).name, entry))
+        except KeyError:
+            unknown.append(entry)
+    while todo:
+        name, entry = todo.pop()
+        if name in dag:
+            continue
+        dag[name] = get_step(name)
+        entries[name] = entry
+        todo.extend((dep, dep) for dep in dag[name].requires)
+    _check_acyclic(dag)
+    return dag, entries, unknown
+
+def _check_acyclic(dag: Mapping[str, Step]) -> None:
+    state: Dict[str, int] = {}  # 1 visiting, 2 done
+
+    def visit(name: str) -> None:
+        if state.get(name) == 2:
+            return
+        if state.get(name) == 1:
+            raise ValueError(f"Validation steps have a dependency cycle through {name!r}")
+        state[name] = 1
+        for dep in dag[name].requires:
+            visit(dep)
+        state[name] = 2
+
+    for name in dag:
+        visit(name)
+
+def deciding_threshold(metrics: Mapping[str, float], producible: Set[str],
+                       thresholds: Mapping[str, float] = THRESHOLDS) -> Optional[str]:
+    """
+    The first threshold that can no longer be met: its metric was produced and
+    misses it, or is missing and no remaining step produces it. None while
+    passing is still possible.
+    """
+    for name, metric, is_minimum, bound, missing in criteria(dict(thresholds)):
+        if metric in metrics:
+            value = metrics[metric]
+        elif metric in producible:
+            continue
+        else:
+            value = missing
+        if not (value >= bound if is_minimum else value <= bound):
+            return name
+    return None
+
+def run_plan(hypothesis: Mapping[str, Any], plan: Iterable[str], seed: int = 42,
+             max_concurrency: int = 4, thresholds: Optional[Mapping[str, float]] = None) -> PlanResult:
+    """Runs the validation plan of `hypothesis` until it passes or is decided; see the module docstring."""
+    thresholds = THRESHOLDS if thresholds is None else thresholds
+    dag, entries, unknown = build_dag(plan)
+    pending: Set[str] = set(dag)
+    running: Dict[Future, tuple] = {}  # future -> (step name, deadline, step's own cancel event)
+    metrics: Dict[str, float] = {}
+    completed: List[str] = []
+    errors: Dict[str, str] = {entry: UNKNOWN_STEP for entry in unknown}
+    for entry in unknown:
+        log.warn(f"Skipping validation plan entry {entry!r}: no registered step")
+    failed: Optional[str] = None
+
+    while True:
+        # Steps whose dependencies failed can never run.
+        for name in sorted(pending):
+            broken = [dep for dep in dag[name].requires if dep in errors]
+            if broken:
+                pending.discard(name)
+                errors[name] = f"dependency {broken[0]} failed"
+        producible = {m for name in pending for m in dag[name].metrics}
+        producible.update(m for name, _, _ in running.values() for m in dag[name].metrics)
+        failed = deciding_threshold(metrics, producible, thresholds)
+        if failed is not None or (not pending and not running):
+            break
+
+        ready = sorted((name for name in pending if all(dep in completed for dep in dag[name].requires)),
+                       key=lambda name: (dag[name].cost, name))
+        for name in ready[:max(max_concurrency, 1) - len(running)]:
+            step = dag[name]
+            step_cancelled = threading.Event()
+            inputs = {m: metrics[m] for dep in step.requires for m in dag[dep].metrics if m in metrics}
+            ctx = StepContext(entries[name], inputs, random.Random(f"{seed}:{name}"), step_cancelled)
+            pending.discard(name)
+            running[_pool().submit(step.fn, hypothesis, ctx)] = (name, time.monotonic() + step.timeout, step_cancelled)
+
+        now = time.monotonic()
+        done, _ = wait(list(running), timeout=max(min(d for _, d, _ in running.values()) - now, 0),
+                       return_when=FIRST_COMPLETED)
+        for future in done:
+            name, _, _ = running.pop(future)
+            try:
+                produced = future.result()
+            except Exception as e:
+                errors[name] = f"{type(e).__name__}: {e}"
+                log.warn(f"Validation step {name} failed: {errors[name]}")
+                continue
+            metrics.update({m: float(v) for m, v in (produced or {}).items()})
+            completed.append(name)
+        now = time.monotonic()
+        for future, (name, deadline, step_cancelled) in list(running.items()):
+            if future not in done and deadline <= now:
+                del running[future]
+                step_cancelled.set()
+                future.cancel()
+                errors[name] = f"timed out after {dag[name].timeout}s"
+                log.warn(f"Validation step {name} timed out")
+
+    abandoned = sorted(pending) + [name for name, _, _ in running.values()]
+    for future, (_, _, step_cancelled) in running.items():
+        step_cancelled.set()
+        future.cancel()
+    return PlanResult(metrics, failed is None, failed, completed, abandoned, errors)
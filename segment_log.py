@@ -0,0 +1,338 @@
+import json
+import os
+import threading
+import time
+import zlib
+from bisect import bisect_right
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from src.common.logging import get_logger
+from src.motherboard.records import encode
+
+try:
+    import fcntl
+except ImportError:  # Windows: single writer process only
+    fcntl = None
+
+log = get_logger("segment_log")
+
+SEGMENT_SUFFIX = ".seg"
+DEFAULT_SEGMENT_BYTES = 8 * 1024 * 1024
+# Writers that arrive while an fsync is in flight are covered by the next one anyway;
+# a non-zero window additionally holds the leader back to collect more of them.
+DEFAULT_GROUP_COMMIT_MS = 0.0
+
+def _segment_name(first_seq: int) -> str:
+    return f"{first_seq:020d}{SEGMENT_SUFFIX}"
+
+def _encode(seq: int, record: Dict[str, Any]) -> bytes:
+    payload = encode(record)
+    return b"%d\t%08x\t%s\n" % (seq, zlib.crc32(payload), payload)
+
+def _split(line: bytes) -> Optional[Tuple[int, bytes]]:
+    """Returns (seq, payload), or None for a torn or corrupt line."""
+    if not line.endswith(b"\n"):
+        return None
+    try:
+        seq, crc, payload = line[:-1].split(b"\t", 2)
+        if int(crc, 16) != zlib.crc32(payload):
+            return None
+        return int(seq), payload
+    except ValueError:
+        return None
+
+def _decode(line: bytes) -> Optional[Tuple[int, Dict[str, Any]]]:
+    """Returns (seq, record), or None for a torn or corrupt line."""
+    split = _split(line)
+    if split is None:
+        return None
+    try:
+        return split[0], json.loads(split[1])
+    except ValueError:
+        return None
+
+class SegmentLog:
+    """
+    Append-only record log split into fixed-size segments.
+
+    Each line is "SEQ <tab> CRC32 <tab> JSON". Appends are O(1), a full segment is
+    sealed and a fresh one is created atomically, concurrent writers share a single
+    fsync (group commit), and opening the log truncates any torn tail left by a crash.
+    """
+
+    def __init__(self, directory: Path, segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+                 group_commit_ms: float = DEFAULT_GROUP_COMMIT_MS):
+        self.directory = Path(directory)
+        self.segment_bytes = segment_bytes
+        self.group_commit_ms = group_commit_ms
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+        self._lock_path = self.directory / "LOCK"
+        self._fh = None
+        self._active: Optional[Path] = None
+        self._offset = 0
+        self._last_seq = 0
+        self._synced_seq = 0
+        with self._lock, self._file_lock():
+            self._recover()
+
+    # --- Recovery -------------------------------------------------------------
+
+    def _segments(self) -> List[Path]:
+        return sorted(self.directory.glob(f"*{SEGMENT_SUFFIX}"))
+
+    def _recover(self) -> None:
+        """Drops leftover rollover temp files and truncates a torn tail segment."""
+        for tmp in self.directory.glob("*.tmp"):
+            tmp.unlink()
+
+        segments = self._segments()
+        if not segments:
+            self._create_segment(1)
+            return
+
+        active = segments[-1]
+        last_seq, good = int(active.stem) - 1, 0
+        with open(active, "rb") as f:
+            for line in f:
+                decoded = _decode(line)
+                if decoded is None:
+                    break
+                last_seq, good = decoded[0], good + len(line)
+
+        self._truncate_torn(active, good)
+        self._open_active(active, good)
+        self._last_seq = self._synced_seq = last_seq
+
+    def _truncate_torn(self, path: Path, good: int) -> None:
+        """Cuts `path` back to its last intact record. Caller holds the file lock."""
+        size = path.stat().st_size
+        if good < size:
+            log.warn(f"Truncating torn tail of {path.name}: {size - good} bytes dropped")
+            with open(path, "r+b") as f:
+                f.truncate(good)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _open_active(self, path: Path, offset: int) -> None:
+        if self._fh is not None:
+            self._fh.close()
+        self._fh = open(path, "ab")
+        self._active = path
+        self._offset = offset
+
+    def _create_segment(self, first_seq: int) -> None:
+        """Creates the next segment via write-then-rename so it appears atomically."""
+        final = self.directory / _segment_name(first_seq)
+        tmp = final.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp, final)
+        self._fsync_dir()
+        self._open_active(final, 0)
+
+    def _fsync_dir(self) -> None:
+        if not hasattr(os, "O_DIRECTORY"):
+            return
+        fd = os.open(self.directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    # --- Writing --------------------------------------------------------------
+
+    @contextmanager
+    def _file_lock(self):
+        """Serializes writers across processes sharing the same directory."""
+        if fcntl is None:
+            yield
+            return
+        with open(self._lock_path, "a") as lf:
+            fcntl.flock(lf, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lf, fcntl.LOCK_UN)
+
+    def _catch_up(self, repair: bool = False) -> None:
+        """
+        Picks up records appended by other processes since our last write. With
+        `repair` (writers, holding the file lock) a torn tail left by a writer that
+        crashed mid-append is truncated, so the next append does not land behind it.
+        """
+        segments = self._segments()
+        if segments and segments[-1] != self._active:
+            self._open_active(segments[-1], 0)
+            self._last_seq = int(segments[-1].stem) - 1
+        size = self._active.stat().st_size
+        if size == self._offset:
+            return
+        with open(self._active, "rb") as f:
+            f.seek(self._offset)
+            for line in f:
+                decoded = _decode(line)
+                if decoded is None:
+                    break
+                self._last_seq = decoded[0]
+                self._offset += len(line)
+        if repair:
+            self._truncate_torn(self._active, self._offset)
+
+    def _roll(self) -> None:
+        """Seals the active segment and starts the next one."""
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self._synced_seq = self._last_seq
+        self._create_segment(self._last_seq + 1)
+
+    def append(self, record: Dict[str, Any]) -> int:
+        """Appends a single record and returns its sequence number."""
+        return self.append_many([record])
+
+    def append_many(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Appends records as one write and one (shared) fsync. Returns the last sequence number."""
+        records = list(records)
+        if not records:
+            return self._last_seq
+        with self._lock, self._file_lock():
+            self._catch_up(repair=True)
+            target = self._write(records)
+        self._sync_to(target)
+        return target
+
+    def _write(self, records: List[Dict[str, Any]]) -> int:
+        """Writes and flushes one batch. Caller holds both locks."""
+        if self._offset >= self.segment_bytes:
+            self._roll()
+        first = self._last_seq + 1
+        chunk = b"".join(_encode(first + i, r) for i, r in enumerate(records))
+        self._fh.write(chunk)
+        self._fh.flush()
+        self._offset += len(chunk)
+        self._last_seq = first + len(records) - 1
+        return self._last_seq
+
+    def _sync_to(self, seq: int) -> None:
+        """Group commit: the first waiter fsyncs on behalf of everyone written so far."""
+        with self._sync_lock:
+            if self._synced_seq >= seq:
+                return
+            if self.group_commit_ms:
+                time.sleep(self.group_commit_ms / 1000.0)
+            with self._lock:
+                target = self._last_seq
+                fd = os.dup(self._fh.fileno())
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            self._synced_seq = max(self._synced_seq, target)
+
+    # --- Compaction -----------------------------------------------------------
+
+    def sealed_seq(self) -> int:
+        """Last sequence number before the active segment; only sealed records can be discarded."""
+        with self._lock:
+            self._catch_up()
+            return int(self._active.stem) - 1
+
+    def discard(self, seqs: Iterable[int]) -> int:
+        """
+        Removes records from sealed segments by rewriting them (write-then-rename,
+        so readers that have a segment open keep reading the old file). The other
+        records keep their sequence numbers. Returns the number of records removed.
+        """
+        wanted = set(seqs)
+        removed = 0
+        if not wanted:
+            return removed
+        with self._lock, self._file_lock():
+            self._catch_up(repair=True)
+            sealed = self._segments()[:-1]
+            firsts = [int(p.stem) for p in sealed]
+            affected: Dict[Path, set] = {}
+            for seq in wanted:
+                i = bisect_right(firsts, seq) - 1
+                if i >= 0 and seq < int(self._active.stem):
+                    affected.setdefault(sealed[i], set()).add(seq)
+            for path, drop in sorted(affected.items()):
+                kept: List[bytes] = []
+                with open(path, "rb") as f:
+                    for line in f:
+                        split = _split(line)
+                        if split is None:
+                            break
+                        if split[0] not in drop:
+                            kept.append(line)
+                        else:
+                            removed += 1
+                if not kept:
+                    path.unlink()
+                    continue
+                tmp = path.with_suffix(".tmp")
+                with open(tmp, "wb") as f:
+                    f.writelines(kept)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, path)
+            if affected:
+                self._fsync_dir()
+        return removed
+
+    # --- Reading --------------------------------------------------------------
+
+    @property
+    def last_seq(self) -> int:
+        return self._last_seq
+
+    def refresh(self) -> int:
+        """Returns the current generation (last sequence number), including other processes' appends."""
+        with self._lock:
+            self._catch_up()
+            return self._last_seq
+
+    def replay(self, after: int = 0) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Yields (seq, record) for every record with a sequence number greater than `after`."""
+        for seq, payload in self.replay_raw(after):
+            yield seq, json.loads(payload)
+
+    def replay_raw(self, after: int = 0) -> Iterator[Tuple[int, bytes]]:
+        """Like replay, but yields each record's encoded payload (see records) without decoding it."""
+        segments = self._segments()
+        firsts = [int(p.stem) for p in segments]
+        start = max(bisect_right(firsts, after + 1) - 1, 0)
+        for path in segments[start:]:
+            try:
+                f = open(path, "rb")
+            except FileNotFoundError:
+                continue
+            with f:
+                for line in f:
+                    split = _split(line)
+                    if split is None:
+                        break
+                    if split[0] > after:
+                        yield split
+
+    def bootstrap(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Seeds an empty log (e.g. from a legacy JSON file). No-op once anything was written."""
+        records = list(records)
+        with self._lock, self._file_lock():
+            self._catch_up(repair=True)
+            if self._last_seq or not records:
+                return self._last_seq
+            target = self._write(records)
+        self._sync_to(target)
+        return target
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fh is not None:
+                self._fh.flush()
+                os.fsync(self._fh.fileno())
+                self._fh.close()
+                self._fh = None
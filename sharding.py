@@ -0,0 +1,224 @@
+"""
+Domain shards of the Motherboard.
+
+Each shard is a complete, independent store: its own storage engine (log
+directories or SQLite database), fact cache, indexes, retraction index,
+overlays and change feed. Writers of different shards never share a file,
+lock or transaction, so promotions in one domain do not queue behind another.
+Readers scatter over all shards and gather the results.
+
+Routing is selected by MOTHERBOARD_SHARDING:
+  unset / "none"  everything goes to the default shard (the original layout)
+  "domain"        one shard per request domain
+  "hash:N"        domains spread over N shards by CRC32
+Records without a domain always go to the default shard.
+"""
+import os
+import re
+import threading
+import zlib
+from bisect import bisect_right
+from collections.abc import Sequence
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple, Union
+from src.common.fileio import read_json
+from src.common.logging import get_logger
+from src.motherboard.change_feed import ChangeFeed
+from src.motherboard.content_hash import ContentIndex, fact_hash, hypothesis_hash
+from src.motherboard.fact_cache import FrozenRecords, RecordCache
+from src.motherboard.fact_index import FactIndex
+from src.motherboard.mvcc import DeltaOverlay
+from src.motherboard.records import Fact, Hypothesis
+from src.motherboard.retention import ColdArchive
+from src.motherboard.retractions import RetractionIndex
+from src.motherboard.storage import FACTS, HYPOTHESES, StorageBackend, Stream
+
+log = get_logger("sharding")
+
+DEFAULT_SHARD = "default"
+KEYS = {FACTS: "fact_id", HYPOTHESES: "hypothesis_id"}
+RECORD_TYPES = {FACTS: Fact, HYPOTHESES: Hypothesis}
+
+def sharding_mode() -> str:
+    return os.getenv("MOTHERBOARD_SHARDING", "none")
+
+def shard_name(domain: str) -> str:
+    """A file-system safe shard name for a domain."""
+    name = re.sub(r"[^a-z0-9_.-]+", "_", domain.strip().lower()).strip("._")
+    return name or DEFAULT_SHARD
+
+class ShardRouter:
+    """Maps a domain to the shard that stores its records."""
+
+    def __init__(self, mode: str = "none"):
+        mode = (mode or "none").lower()
+        self.mode = mode
+        self.buckets = 0
+        if mode.startswith("hash:"):
+            self.buckets = int(mode.split(":", 1)[1])
+            if self.buckets < 1:
+                raise ValueError(f"Invalid shard count in MOTHERBOARD_SHARDING={mode!r}")
+        elif mode not in ("none", "domain"):
+            raise ValueError(f"Unknown MOTHERBOARD_SHARDING mode: {mode!r}")
+
+    def shard_for(self, domain: Optional[str]) -> str:
+        if not domain or self.mode == "none":
+            return DEFAULT_SHARD
+        if self.buckets:
+            return f"h{zlib.crc32(domain.strip().lower().encode('utf-8')) % self.buckets:03d}"
+        return shard_name(domain)
+
+class Shard:
+    """One shard: its storage engine plus the read-side state built from it, all created on first use."""
+
+    def __init__(self, name: str, backend: StorageBackend,
+                 legacy: Optional[Dict[str, Tuple[Path, str]]] = None,
+                 retracted_log: Optional[Path] = None,
+                 cold_dir: Optional[Path] = None):
+        self.name = name
+        self.backend = backend
+        self.legacy = legacy or {}
+        self.cold_dir = cold_dir
+        self.lock = threading.RLock()
+        self.overlay_lock = threading.Lock()
+        self.retractions = RetractionIndex()
+        if retracted_log is not None:
+            self.retractions.load_legacy(retracted_log)
+        self._streams: Dict[str, Stream] = {}
+        self._cache: Optional[RecordCache] = None
+        self._overlays: Dict[str, DeltaOverlay] = {}
+        self._content: Dict[str, ContentIndex] = {}
+        self._feed: Optional[ChangeFeed] = None
+        self._archive: Optional[ColdArchive] = None
+
+    def stream(self, name: str) -> Stream:
+        """Opens a stream on first use, seeding it from its legacy JSON file (default shard only)."""
+        with self.lock:
+            if name not in self._streams:
+                stream = self.backend.stream(name)
+                if name in self.legacy:
+                    legacy_json, key = self.legacy[name]
+                    if stream.refresh() == 0 and legacy_json.exists():
+                        legacy = read_json(str(legacy_json)).get(key, [])
+                        if legacy:
+                            stream.bootstrap(legacy)
+                            log.info(f"Seeded '{name}' with {len(legacy)} records from {legacy_json.name}")
+                self._streams[name] = stream
+            return self._streams[name]
+
+    def cache(self) -> RecordCache:
+        with self.lock:
+            if self._cache is None:
+                self._cache = RecordCache(self.stream(FACTS), "fact_id", FactIndex(), self.retractions, Fact)
+            return self._cache
+
+    def overlay(self, name: str) -> DeltaOverlay:
+        with self.lock:
+            if name not in self._overlays:
+                retractions = self.retractions if name == FACTS else None
+                self._overlays[name] = DeltaOverlay(KEYS[name], retractions)
+            return self._overlays[name]
+
+    def content_index(self, name: str) -> ContentIndex:
+        """Hash index of one stream, caught up with the store. Hold its lock across check-and-insert."""
+        with self.lock:
+            if name not in self._content:
+                hasher = fact_hash if name == FACTS else hypothesis_hash
+                self._content[name] = ContentIndex(KEYS[name], hasher)
+            index = self._content[name]
+        stream = self.stream(name)
+        with index.lock:
+            if stream.refresh() > index.generation:
+                index.feed(stream.replay(after=index.generation))
+        return index
+
+    def change_feed(self) -> ChangeFeed:
+        with self.lock:
+            if self._feed is None:
+                self._feed = ChangeFeed(self.stream(FACTS))
+            return self._feed
+
+    def archive(self) -> ColdArchive:
+        """Cold tier of this shard's hypotheses (see retention)."""
+        with self.lock:
+            if self._archive is None:
+                self._archive = ColdArchive(self.cold_dir)
+            return self._archive
+
+    def notify(self) -> None:
+        """Wakes change-feed waiters in this process; other processes pick changes up by polling."""
+        if self._feed is not None:
+            self._feed.notify()
+
+    def generation(self) -> int:
+        return self.stream(FACTS).refresh()
+
+class ShardedRecords(Sequence):
+    """Read-only concatenation of per-shard FrozenRecords views, each pinned at its own generation."""
+
+    def __init__(self, views: Mapping[str, FrozenRecords]):
+        self.views = dict(views)
+        self._parts = list(self.views.values())
+        self._ends = list(accumulate(len(v) for v in self._parts))
+
+    @property
+    def generation(self) -> int:
+        """Total number of changes visible in this view, across shards."""
+        return sum(v.generation for v in self._parts)
+
+    @property
+    def generations(self) -> Dict[str, int]:
+        return {name: v.generation for name, v in self.views.items()}
+
+    def __len__(self) -> int:
+        return self._ends[-1] if self._ends else 0
+
+    def __iter__(self) -> Iterator[Mapping[str, Any]]:
+        for view in self._parts:
+            yield from view
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self[i] for i in range(*index.indices(len(self))))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("record index out of range")
+        part = bisect_right(self._ends, index)
+        start = self._ends[part - 1] if part else 0
+        return self._parts[part][index - start]
+
+    def __repr__(self) -> str:
+        return f"ShardedRecords({len(self)} records in {len(self._parts)} shards)"
+
+# Cursors that span shards. A position in the default shard keeps the
+# single-shard form, so deployments that never shard see the same cursors.
+
+def encode_query_cursor(timestamp: int, position: int, shard: str) -> str:
+    if shard == DEFAULT_SHARD:
+        return f"{timestamp}:{position}"
+    return f"{timestamp}:{position}:{shard}"
+
+def decode_query_cursor(cursor: str) -> Tuple[int, int, str]:
+    try:
+        parts = cursor.split(":", 2)
+        return int(parts[0]), int(parts[1]), parts[2] if len(parts) == 3 else DEFAULT_SHARD
+    except (ValueError, IndexError):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+
+def encode_feed_cursor(positions: Mapping[str, int]) -> Union[int, str]:
+    """An int while only the default shard has been seen, else "shard:seq,...". """
+    if set(positions) <= {DEFAULT_SHARD}:
+        return positions.get(DEFAULT_SHARD, 0)
+    return ",".join(f"{name}:{seq}" for name, seq in sorted(positions.items()))
+
+def decode_feed_cursor(cursor: Union[int, str, None]) -> Dict[str, int]:
+    if cursor is None or cursor == "":
+        return {}
+    if isinstance(cursor, int) or str(cursor).lstrip("-").isdigit():
+        return {DEFAULT_SHARD: int(cursor)}
+    try:
+        return {name: int(seq) for name, seq in (part.rsplit(":", 1) for part in str(cursor).split(","))}
+    except ValueError:
+        raise ValueError(f"Invalid change feed cursor: {cursor!r}")
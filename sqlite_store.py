@@ -0,0 +1,170 @@
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+from src.common.logging import get_logger
+from src.motherboard.records import encode
+from src.motherboard.storage import FACTS, StorageBackend, Stream
+
+log = get_logger("sqlite_store")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    stream TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    record_id TEXT,
+    body TEXT NOT NULL,
+    PRIMARY KEY (stream, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS records_by_id ON records (stream, record_id);
+CREATE TABLE IF NOT EXISTS lineage (
+    fact_id TEXT NOT NULL,
+    parent_id TEXT NOT NULL,
+    PRIMARY KEY (fact_id, parent_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS migrations (
+    source TEXT PRIMARY KEY,
+    position INTEGER NOT NULL
+);
+"""
+
+# Statements are kept constant so sqlite3's per-connection statement cache
+# reuses the prepared form on every call.
+SQL_LAST_SEQ = "SELECT COALESCE(MAX(seq), 0) FROM records WHERE stream = ?"
+SQL_INSERT = "INSERT INTO records (stream, seq, record_id, body) VALUES (?, ?, ?, ?)"
+SQL_INSERT_LINEAGE = "INSERT OR IGNORE INTO lineage (fact_id, parent_id) VALUES (?, ?)"
+SQL_REPLAY = "SELECT seq, body FROM records WHERE stream = ? AND seq > ? ORDER BY seq"
+SQL_DELETE = "DELETE FROM records WHERE stream = ? AND seq = ?"
+
+ID_FIELDS = ("fact_id", "hypothesis_id")
+
+def _record_id(record: Dict[str, Any]):
+    for field in ID_FIELDS:
+        if record.get(field) is not None:
+            return record[field]
+    return None
+
+def _dumps(record: Dict[str, Any]) -> str:
+    return encode(record).decode("utf-8")
+
+class SQLiteStream(Stream):
+    def __init__(self, backend: "SQLiteBackend", name: str):
+        self.backend = backend
+        self.name = name
+
+    def append_many(self, records: Iterable[Dict[str, Any]]) -> int:
+        records = list(records)
+        with self.backend.write() as conn:
+            return self._insert(conn, records)
+
+    def _insert(self, conn: sqlite3.Connection, records: List[Dict[str, Any]]) -> int:
+        """Inserts a batch inside the caller's write transaction."""
+        first = conn.execute(SQL_LAST_SEQ, (self.name,)).fetchone()[0] + 1
+        conn.executemany(SQL_INSERT, [
+            (self.name, first + i, _record_id(r), _dumps(r)) for i, r in enumerate(records)
+        ])
+        if self.name == FACTS:
+            conn.executemany(SQL_INSERT_LINEAGE, [
+                (r["fact_id"], r["lineage"]) for r in records if r.get("fact_id") and r.get("lineage")
+            ])
+        return first + len(records) - 1
+
+    def replay(self, after: int = 0) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        for seq, body in self.replay_raw(after):
+            yield seq, json.loads(body)
+
+    def replay_raw(self, after: int = 0) -> Iterator[Tuple[int, str]]:
+        cursor = self.backend.reader().execute(SQL_REPLAY, (self.name, after))
+        while True:
+            rows = cursor.fetchmany(1000)
+            if not rows:
+                return
+            yield from rows
+
+    def refresh(self) -> int:
+        return self.backend.reader().execute(SQL_LAST_SEQ, (self.name,)).fetchone()[0]
+
+    def bootstrap(self, records: Iterable[Dict[str, Any]]) -> int:
+        with self.backend.write() as conn:
+            last = conn.execute(SQL_LAST_SEQ, (self.name,)).fetchone()[0]
+            records = list(records)
+            if last or not records:
+                return last
+            return self._insert(conn, records)
+
+    def sealed_seq(self) -> int:
+        """Everything but the newest record, so the stream's last seq never moves back."""
+        return max(self.refresh() - 1, 0)
+
+    def discard(self, seqs: Iterable[int]) -> int:
+        with self.backend.write() as conn:
+            last = conn.execute(SQL_LAST_SEQ, (self.name,)).fetchone()[0]
+            before = conn.total_changes
+            conn.executemany(SQL_DELETE, [(self.name, seq) for seq in set(seqs) if seq < last])
+            return conn.total_changes - before
+
+class _WriteTransaction:
+    def __init__(self, backend: "SQLiteBackend"):
+        self.backend = backend
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.backend._write_lock.acquire()
+        self.conn = self.backend.reader()
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.backend._write_lock.release()
+
+class SQLiteBackend(StorageBackend):
+    """
+    Motherboard engine on a single SQLite database in WAL mode.
+
+    WAL lets any number of readers (threads or uvicorn workers) proceed while one
+    writer commits; writers queue on BEGIN IMMEDIATE plus the busy timeout. Each
+    thread gets its own connection.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: Path, busy_timeout_ms: int = 5000):
+        self.path = Path(path)
+        self.busy_timeout_ms = busy_timeout_ms
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._streams: Dict[str, SQLiteStream] = {}
+        self.reader().executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.path), isolation_level=None, cached_statements=256)
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = FULL")
+        return conn
+
+    def reader(self) -> sqlite3.Connection:
+        """This thread's connection (autocommit; reads see the latest committed state)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def write(self) -> _WriteTransaction:
+        """`with backend.write() as conn:` runs one IMMEDIATE transaction."""
+        return _WriteTransaction(self)
+
+    def stream(self, name: str) -> SQLiteStream:
+        if name not in self._streams:
+            self._streams[name] = SQLiteStream(self, name)
+        return self._streams[name]
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -0,0 +1,13 @@
+from typing import Dict, Any
+from src.approver_god.validation.validation_cache import memoized
+
+@memoized
+def run_stats_tests(hypothesis: Dict[str, Any]) -> float:
+    """
+    Runs the statistical tests of a hypothesis' validation plan and returns the
+    confidence that it holds. CPU-bound; the gatekeeper runs it in a process pool,
+    so it must stay a picklable top-level function. Results are cached by
+    content (see validation_cache).
+    """
+    # Placeholder: In a real system, this would run simulations and significance tests.
+    return float(hypothesis.get("confidence_score", 0.98))
@@ -0,0 +1,105 @@
+"""
+Registry of validation steps.
+
+A hypothesis' `validation_plan` names the steps to run ("run_simulation_alpha",
+"code_test_structural_analysis", ...). A plan entry resolves to the registered
+step with the longest name it starts with, so variants of a step share one
+implementation. Each step declares the metrics it produces, the steps it
+depends on, a relative cost (cheap steps are scheduled first) and a timeout;
+see scheduler for how a plan is run.
+
+A step function takes the hypothesis and a StepContext and returns its
+metrics. Long-running steps should check `ctx.cancelled` and stop early once
+it is set.
+"""
+import hashlib
+import json
+import random
+import threading
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Tuple
+from src.approver_god.validation.validation_cache import validator_version
+
+StepFunction = Callable[[Mapping[str, Any], "StepContext"], Dict[str, float]]
+
+class StepContext(NamedTuple):
+    plan_entry: str               # the plan entry this step runs for
+    metrics: Mapping[str, float]  # metrics produced by the step's dependencies
+    rng: random.Random            # seeded per (seed, step), so results do not depend on scheduling
+    cancelled: threading.Event    # set when the plan's outcome is decided or the step timed out
+
+class Step(NamedTuple):
+    name: str
+    fn: StepFunction
+    metrics: Tuple[str, ...]
+    requires: Tuple[str, ...] = ()
+    cost: float = 1.0
+    timeout: float = 30.0
+
+# Steps run for every plan, whether listed or not.
+DEFAULT_STEPS = ("self_assessment", "fact_check", "citation_check", "contradiction_check")
+
+_registry: Dict[str, Step] = {}
+_registry_lock = threading.Lock()
+
+def register(name: str, metrics: Tuple[str, ...], requires: Tuple[str, ...] = (),
+             cost: float = 1.0, timeout: float = 30.0) -> Callable[[StepFunction], StepFunction]:
+    """Decorator registering a step function under `name` (replacing any step of that name)."""
+    def decorator(fn: StepFunction) -> StepFunction:
+        with _registry_lock:
+            _registry[name] = Step(name, fn, tuple(metrics), tuple(requires), cost, timeout)
+        return fn
+    return decorator
+
+def get_step(name: str) -> Step:
+    return _registry[name]
+
+def resolve(plan_entry: str) -> Step:
+    """The registered step for a plan entry: an exact match, else the longest registered prefix."""
+    with _registry_lock:
+        if plan_entry in _registry:
+            return _registry[plan_entry]
+        matches = [name for name in _registry if plan_entry.startswith(name + "_")]
+        if not matches:
+            raise KeyError(f"No validation step for plan entry {plan_entry!r}")
+        return _registry[max(matches, key=len)]
+
+def registered_steps() -> List[Step]:
+    with _registry_lock:
+        return list(_registry.values())
+
+def registry_version() -> str:
+    """
+    Hash of DEFAULT_STEPS and every registered step: its source, metrics,
+    dependencies, cost and timeout. Cached plan results depend on it (see runner).
+    """
+    steps = sorted(registered_steps(), key=lambda step: step.name)
+    described = [[s.name, validator_version(s.fn), s.metrics, s.requires, s.cost, s.timeout] for s in steps]
+    return hashlib.sha256(json.dumps([DEFAULT_STEPS, described]).encode("utf-8")).hexdigest()
+
+# --- built-in steps ---
+# Placeholders: they simulate the metrics with the distributions the runner used
+# to fabricate them in one shot. Real steps would run simulations, test suites, etc.
+
+@register("self_assessment", metrics=("model_confidence", "novelty_score"), cost=0.0)
+def self_assessment(hypothesis: Mapping[str, Any], ctx: StepContext) -> Dict[str, float]:
+    return {"model_confidence": hypothesis.get("confidence", 0.0), "novelty_score": hypothesis.get("novelty_score", 0.0)}
+
+@register("citation_check", metrics=("citation_match",), cost=1.0)
+def citation_check(hypothesis: Mapping[str, Any], ctx: StepContext) -> Dict[str, float]:
+    return {"citation_match": ctx.rng.uniform(0.95, 1.0)}
+
+@register("fact_check", metrics=("factual_precision",), cost=2.0)
+def fact_check(hypothesis: Mapping[str, Any], ctx: StepContext) -> Dict[str, float]:
+    return {"factual_precision": ctx.rng.uniform(0.9, 0.99)}
+
+@register("contradiction_check", metrics=("contradiction_rate",), requires=("fact_check",), cost=2.0)
+def contradiction_check(hypothesis: Mapping[str, Any], ctx: StepContext) -> Dict[str, float]:
+    return {"contradiction_rate": ctx.rng.uniform(0.0, 0.05)}
+
+@register("code_test", metrics=("code_tests_pass_rate",), cost=5.0, timeout=300.0)
+def code_test(hypothesis: Mapping[str, Any], ctx: StepContext) -> Dict[str, float]:
+    return {"code_tests_pass_rate": 1.0}
+
+@register("run_simulation", metrics=("simulation_fit",), cost=10.0, timeout=600.0)
+def run_simulation(hypothesis: Mapping[str, Any], ctx: StepContext) -> Dict[str, float]:
+    return {"simulation_fit": ctx.rng.uniform(0.8, 1.0)}
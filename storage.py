@@ -0,0 +1,103 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Tuple, Union
+from src.motherboard.records import encode
+from src.motherboard.segment_log import SegmentLog
+
+# Names of the record streams kept by the Motherboard.
+FACTS = "facts"
+HYPOTHESES = "hypotheses"
+
+class Stream(ABC):
+    """
+    One append-only stream of records with dense, per-stream sequence numbers
+    starting at 1. Compaction (discard) may later remove old records, leaving
+    gaps. SegmentLog implements the same interface and is registered as one.
+    """
+
+    def append(self, record: Dict[str, Any]) -> int:
+        return self.append_many([record])
+
+    @abstractmethod
+    def append_many(self, records: Iterable[Dict[str, Any]]) -> int:
+        ...
+
+    @abstractmethod
+    def replay(self, after: int = 0) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        ...
+
+    def replay_raw(self, after: int = 0) -> Iterator[Tuple[int, Union[bytes, str]]]:
+        """Like replay, but yields each record's store encoding undecoded (see records)."""
+        for seq, record in self.replay(after):
+            yield seq, encode(record)
+
+    @abstractmethod
+    def refresh(self) -> int:
+        """Returns the last sequence number, including writes from other processes."""
+
+    @abstractmethod
+    def bootstrap(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Seeds the stream if (and only if) it is still empty."""
+
+    @abstractmethod
+    def sealed_seq(self) -> int:
+        """Records up to this sequence number can be discarded."""
+
+    @abstractmethod
+    def discard(self, seqs: Iterable[int]) -> int:
+        """Removes records (up to sealed_seq) from the stream. Returns how many were removed."""
+
+    @property
+    def last_seq(self) -> int:
+        return self.refresh()
+
+Stream.register(SegmentLog)
+
+class StorageBackend(ABC):
+    """A storage engine for the Motherboard: a set of named streams."""
+
+    name = "base"
+
+    @abstractmethod
+    def stream(self, name: str) -> Stream:
+        ...
+
+    def close(self) -> None:
+        pass
+
+class LogBackend(StorageBackend):
+    """One SegmentLog directory per stream (the default engine)."""
+
+    name = "log"
+
+    def __init__(self, directories: Dict[str, Path]):
+        self.directories = directories
+        self._streams: Dict[str, SegmentLog] = {}
+        self._lock = threading.Lock()
+
+    def stream(self, name: str) -> SegmentLog:
+        with self._lock:
+            if name not in self._streams:
+                self._streams[name] = SegmentLog(self.directories[name])
+            return self._streams[name]
+
+    def close(self) -> None:
+        with self._lock:
+            for store in self._streams.values():
+                store.close()
+            self._streams.clear()
+
+def open_backend(kind: str, directories: Dict[str, Path], db_path: Path) -> StorageBackend:
+    """Builds the engine selected by MOTHERBOARD_BACKEND ("log" or "sqlite")."""
+    kind = (kind or "log").lower()
+    if kind == "log":
+        return LogBackend(directories)
+    if kind == "sqlite":
+        from src.motherboard.sqlite_store import SQLiteBackend
+        return SQLiteBackend(db_path)
+    raise ValueError(f"Unknown Motherboard backend: {kind!r}")
+
+def backend_kind() -> str:
+    return os.getenv("MOTHERBOARD_BACKEND", "log")
@@ -0,0 +1,229 @@
+"""
+Incremental sync of offline Motherboard replicas.
+
+The primary publishes its stores as an export directory: per stream, chunk
+files holding the raw (seq, record) pairs appended since the previous export,
+and a manifest listing every chunk with its sequence range, record count and
+SHA-256. Only the manifest is rewritten on each export, and it is written last,
+so a reader never sees a chunk that is not complete.
+
+A replica keeps one watermark per primary stream. Catching up downloads only
+the chunks past its watermarks, verifies their checksums, imports the records
+and advances the watermark after every chunk, so an interrupted sync resumes
+where it stopped and costs time proportional to what changed. Downloads over
+HTTP resume partial files with Range requests.
+
+Merging is conflict-free: facts, hypotheses and retractions are grow-only sets
+keyed by ID (hypotheses by content hash), and updates are applied in the
+primary's order (see api.import_records), so replaying a chunk twice or
+importing from two exports of the same primary converges on the same state.
+
+The remote side is a directory (shared drive, removable disk) or any static
+HTTP server; `serve` exposes an export directory on loopback for testing.
+
+Usage:
+    python -m src.sync.sync_service publish EXPORT_DIR [--chunk-records N]
+    python -m src.sync.sync_service pull SOURCE [--state PATH]
+    python -m src.sync.sync_service serve EXPORT_DIR [--port N]
+"""
+import argparse
+import functools
+import hashlib
+import json
+import os
+import shutil
+import time
+import urllib.error
+import urllib.request
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from src.common.fileio import atomic_write_bytes, read_json, write_json
+from src.common.logging import get_logger
+from src.motherboard.api import ROOT, import_records, replay_stream, stream_generations
+
+log = get_logger("sync")
+
+FORMAT = 1
+MANIFEST = "manifest.json"
+SYNC_STATE = ROOT / "sync_state.json"
+COPY_BUFFER = 1 << 16
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(COPY_BUFFER), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _chunk_path(stream: str, first: int, last: int) -> str:
+    return f"{stream.replace(':', '__')}/{first:020d}-{last:020d}.jsonl"
+
+def _chunks_of(pairs: Iterator[Tuple[int, Dict[str, Any]]], size: int) -> Iterator[List[Tuple[int, Dict[str, Any]]]]:
+    chunk = []
+    for pair in pairs:
+        chunk.append(pair)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+# --- primary side ---
+
+def publish(export_dir: Union[str, Path], chunk_records: int = 5000) -> Dict[str, Any]:
+    """
+    Appends everything written since the last export to `export_dir` and
+    rewrites its manifest. Returns the manifest.
+    """
+    export_dir = Path(export_dir)
+    manifest = read_json(str(export_dir / MANIFEST))
+    watermarks: Dict[str, int] = dict(manifest.get("watermarks", {}))
+    chunks: List[Dict[str, Any]] = list(manifest.get("chunks", []))
+    written = 0
+    for stream, last in stream_generations().items():
+        after = watermarks.get(stream, 0)
+        if last <= after:
+            continue
+        for chunk in _chunks_of(replay_stream(stream, after), chunk_records):
+            first, last_seq = chunk[0][0], chunk[-1][0]
+            rel = _chunk_path(stream, first, last_seq)
+            data = "".join(
+                json.dumps({"seq": seq, "record": record}, ensure_ascii=False, separators=(",", ":")) + "\n"
+                for seq, record in chunk
+            ).encode("utf-8")
+            path = export_dir / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(str(path), data)
+            chunks.append({
+                "stream": stream, "path": rel, "first": first, "last": last_seq,
+                "records": len(chunk), "bytes": len(data), "sha256": hashlib.sha256(data).hexdigest(),
+            })
+            watermarks[stream] = last_seq
+            written += len(chunk)
+    manifest = {"format": FORMAT, "generated_at": int(time.time()), "watermarks": watermarks, "chunks": chunks}
+    write_json(str(export_dir / MANIFEST), manifest, pretty=True)
+    log.info(f"Published {written} records to {export_dir}")
+    return manifest
+
+# --- transports ---
+
+class DirectoryRemote:
+    """An export directory on a local or mounted file system."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.name = str(self.path.resolve())
+
+    def manifest(self) -> Dict[str, Any]:
+        return read_json(str(self.path / MANIFEST))
+
+    def fetch(self, rel: str, dest: Path) -> None:
+        shutil.copyfile(self.path / rel, dest)
+
+class HttpRemote:
+    """An export directory behind a static HTTP server (see `serve`)."""
+
+    def __init__(self, base_url: str, timeout: float = 30.0):
+        self.base_url = base_url.rstrip("/")
+        self.name = self.base_url
+        self.timeout = timeout
+
+    def manifest(self) -> Dict[str, Any]:
+        with urllib.request.urlopen(f"{self.base_url}/{MANIFEST}", timeout=self.timeout) as resp:
+            return json.loads(resp.read().decode("utf-8"))
+
+    def fetch(self, rel: str, dest: Path) -> None:
+        """Downloads into dest.part, resuming a partial download left by an earlier attempt."""
+        part = dest.with_name(dest.name + ".part")
+        offset = part.stat().st_size if part.exists() else 0
+        request = urllib.request.Request(f"{self.base_url}/{rel}")
+        if offset:
+            request.add_header("Range", f"bytes={offset}-")
+        try:
+            resp = urllib.request.urlopen(request, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            if e.code != 416:  # 416: the partial file is already complete
+                raise
+        else:
+            with resp:
+                # A server that ignores Range answers 200 with the whole file.
+                with open(part, "ab" if resp.status == 206 else "wb") as f:
+                    shutil.copyfileobj(resp, f, COPY_BUFFER)
+        os.replace(part, dest)
+
+def remote_for(source: str) -> Union[DirectoryRemote, HttpRemote]:
+    if source.startswith(("http://", "https://")):
+        return HttpRemote(source)
+    return DirectoryRemote(source)
+
+def serve(directory: Union[str, Path], host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    """An HTTP server for an export directory; call serve_forever() on the result."""
+    handler = functools.partial(SimpleHTTPRequestHandler, directory=str(directory))
+    return ThreadingHTTPServer((host, port), handler)
+
+# --- replica side ---
+
+def sync_from(remote: Union[DirectoryRemote, HttpRemote], state_path: Optional[Path] = None) -> Dict[str, int]:
+    """
+    Imports every chunk of `remote` past this replica's watermarks. Returns
+    {"chunks": fetched, "records": received, "stored": new to this replica}.
+    """
+    state_path = Path(state_path or SYNC_STATE)
+    state = read_json(str(state_path))
+    watermarks: Dict[str, int] = state.setdefault(remote.name, {})
+    staging = state_path.parent / "sync_staging"
+    staging.mkdir(parents=True, exist_ok=True)
+    totals = {"chunks": 0, "records": 0, "stored": 0}
+
+    manifest = remote.manifest()
+    if manifest.get("format", FORMAT) != FORMAT:
+        raise ValueError(f"Unsupported export format {manifest.get('format')!r} at {remote.name}")
+    for chunk in manifest.get("chunks", []):
+        stream, after = chunk["stream"], watermarks.get(chunk["stream"], 0)
+        if chunk["last"] <= after:
+            continue
+        staged = staging / Path(chunk["path"]).name
+        remote.fetch(chunk["path"], staged)
+        if _sha256(staged) != chunk["sha256"]:
+            staged.unlink()
+            raise ValueError(f"Checksum mismatch for {chunk['path']} from {remote.name}")
+        with open(staged, "r", encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+        records = [line["record"] for line in lines if line["seq"] > after]
+        totals["stored"] += import_records(stream.rsplit(":", 1)[-1], records)
+        totals["records"] += len(records)
+        totals["chunks"] += 1
+        watermarks[stream] = chunk["last"]
+        write_json(str(state_path), state, pretty=True)
+        staged.unlink()
+    log.info(f"Synced from {remote.name}: {totals}")
+    return totals
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Incremental sync of offline Motherboard replicas.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    pub = commands.add_parser("publish", help="Export changes since the last publish")
+    pub.add_argument("export_dir", type=Path)
+    pub.add_argument("--chunk-records", type=int, default=5000, help="Records per chunk file")
+    pull = commands.add_parser("pull", help="Catch this replica up from an export directory or URL")
+    pull.add_argument("source")
+    pull.add_argument("--state", type=Path, default=SYNC_STATE, help="Replica watermark file")
+    srv = commands.add_parser("serve", help="Serve an export directory over HTTP")
+    srv.add_argument("export_dir", type=Path)
+    srv.add_argument("--host", default="127.0.0.1")
+    srv.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    if args.command == "publish":
+        manifest = publish(args.export_dir, args.chunk_records)
+        print(f"{len(manifest['chunks'])} chunks, watermarks {manifest['watermarks']}")
+    elif args.command == "pull":
+        print(sync_from(remote_for(args.source), args.state))
+    else:
+        server = serve(args.export_dir, args.host, args.port)
+        print(f"Serving {args.export_dir} on http://{args.host}:{server.server_address[1]}")
+        server.serve_forever()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import pytest
+from src.motherboard import analytics
+
+def test_snapshot_columns_and_aggregates(motherboard, add_fact, tmp_path):
+    for i, (tier, confidence) in enumerate([("T1", 0.9), ("T1", 0.7), ("T2", 0.5), ("T2", 0.3), ("T3", 0.99)]):
+        add_fact(f"claim {i}", trust_tier=tier, confidence=confidence, source="lab" if i < 2 else "field")
+    directory = tmp_path / "analytics"
+
+    manifest = analytics.build_snapshot(directory)
+    snapshot = analytics.FactSnapshot(directory)
+
+    assert manifest["rows"] == len(snapshot) == 5
+    assert snapshot.generation == motherboard.earth_generation()
+    assert snapshot.count() == 5
+    assert snapshot.count(min_confidence=0.6) == 3
+    assert snapshot.count(source="lab") == 2
+    assert snapshot.count(tier="missing") == 0
+    assert snapshot.tier_histogram() == {"T1": 2, "T2": 2, "T3": 1}
+    groups = snapshot.group_by_tier()
+    assert groups["T1"]["count"] == 2
+    assert groups["T1"]["mean"] == pytest.approx(0.8)
+    assert (groups["T2"]["min"], groups["T2"]["max"]) == (0.3, 0.5)
+    assert sum(snapshot.confidence_histogram(bins=5)["counts"]) == 5
+    assert sum(snapshot.time_buckets(width=60)["counts"]) == 5
+
+def test_get_snapshot_rebuilds_once_stale(motherboard, add_fact, tmp_path, monkeypatch):
+    monkeypatch.setattr(analytics, "_snapshot", None)
+    directory = tmp_path / "analytics"
+    add_fact("first")
+    first = analytics.get_snapshot(directory=directory)
+    assert len(first) == 1
+
+    add_fact("second")
+    assert analytics.get_snapshot(max_age=3600, directory=directory) is first, "a fresh enough snapshot is kept"
+    rebuilt = analytics.get_snapshot(max_age=0, directory=directory)
+    assert len(rebuilt) == 2
+    assert (directory / "CURRENT").read_text(encoding="utf-8") == rebuilt.version
@@ -0,0 +1,43 @@
+from src.common.ids import make_id
+from src.motherboard.storage import FACTS, HYPOTHESES
+
+def _count_appends(motherboard, monkeypatch, name):
+    """Counts append_many calls on the default shard's `name` stream."""
+    stream = motherboard._shard("default").stream(name)
+    calls = []
+    original = stream.append_many
+
+    def counting(records):
+        records = list(records)
+        calls.append(len(records))
+        return original(records)
+
+    monkeypatch.setattr(stream, "append_many", counting)
+    return calls
+
+def test_bulk_fact_insert_is_one_write(motherboard, monkeypatch):
+    calls = _count_appends(motherboard, monkeypatch, FACTS)
+    entries = [{"content": {"claim": f"claim {i}"}, "source": "bulk", "lineage": f"HYP_{i}",
+                "trust_tier": "T1", "confidence": 0.9} for i in range(50)]
+
+    facts = motherboard.add_earth_facts_bulk(entries)
+
+    assert calls == [50]
+    assert [f["content"]["claim"] for f in facts] == [f"claim {i}" for i in range(50)]
+    assert len({f["fact_id"] for f in facts}) == 50
+    assert len(motherboard.get_earth_facts()) == 50
+    lines = motherboard.EARTH_LINEAGE.read_text(encoding="utf-8").splitlines()
+    assert lines == [f"{f['fact_id']} | HYP_{i}" for i, f in enumerate(facts)]
+
+def test_bulk_hypothesis_insert_is_one_write(motherboard, monkeypatch):
+    calls = _count_appends(motherboard, monkeypatch, HYPOTHESES)
+    hyps = [{"hypothesis_id": f"HYP_{i}", "claim": f"claim {i}"} for i in range(20)]
+
+    stored = motherboard.add_universe_hypotheses_bulk(hyps)
+
+    assert calls == [20]
+    assert [h["hypothesis_id"] for h in stored] == [f"HYP_{i}" for i in range(20)]
+    assert len(motherboard.get_universe_hypotheses()) == 20
+
+def test_ids_minted_in_one_tick_are_unique():
+    assert len({make_id("FACT") for _ in range(10000)}) == 10000
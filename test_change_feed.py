@@ -0,0 +1,47 @@
+import itertools
+import threading
+import pytest
+from src.babies.baby_science.respond import respond
+
+def test_promotions_updates_and_retractions_are_events(motherboard, add_fact):
+    assert motherboard.changes_since(0)["changes"] == []
+    fact = add_fact("copper conducts electricity")
+    motherboard.update_earth_fact(fact["fact_id"], {"confidence": 0.99})
+    motherboard.retract_earth_fact(fact["fact_id"], "duplicate")
+
+    feed = motherboard.changes_since(0)
+    assert [(e["op"], e["fact_id"]) for e in feed["changes"]] == [
+        ("promote", fact["fact_id"]), ("update", fact["fact_id"]), ("retract", fact["fact_id"])]
+    assert feed["changes"][0]["fact"]["content"] == {"claim": "copper conducts electricity"}
+    assert feed["changes"][1]["changes"] == {"confidence": 0.99}
+    assert feed["changes"][2]["reason"] == "duplicate"
+
+    first = motherboard.changes_since(0, limit=1)
+    assert len(first["changes"]) == 1
+    rest = motherboard.changes_since(first["next_seq"])
+    assert [e["op"] for e in rest["changes"]] == ["update", "retract"]
+    assert motherboard.changes_since(feed["next_seq"])["changes"] == []
+
+def test_invalid_cursors_are_rejected(motherboard):
+    with pytest.raises(ValueError):
+        motherboard.changes_since("not a cursor")
+
+def test_long_poll_wakes_on_a_write(motherboard, add_fact):
+    start = motherboard.changes_since(0)["next_seq"]
+    timer = threading.Timer(0.1, add_fact, args=("tin melts at 232C",))
+    timer.start()
+    try:
+        feed = motherboard.changes_since(start, wait=5.0)
+    finally:
+        timer.join()
+    assert [e["fact"]["content"]["claim"] for e in feed["changes"]] == ["tin melts at 232C"]
+
+def test_respond_uses_the_newest_live_fact(motherboard, add_fact, monkeypatch):
+    clock = itertools.count(1_000_000)
+    monkeypatch.setattr("time.time", lambda: next(clock))
+    assert "guidance" not in respond({})
+    older = add_fact("older insight")
+    newer = add_fact("newer insight")
+    assert respond({})["guidance"]["fact_id"] == newer["fact_id"]
+    motherboard.retract_earth_fact(newer["fact_id"], "wrong")
+    assert respond({})["guidance"]["fact_id"] == older["fact_id"]
@@ -0,0 +1,48 @@
+import time
+import pytest
+from src.approver_god.gating import check_stats
+from src.approver_god.gating.check_stats import EXPLORE_EVERY, MIN_SAMPLES, CheckStats, timed
+
+def _train(stats, name, latency, rejection_rate, runs=100):
+    """Records `runs` runs with the rejections spread evenly, as the estimates decay."""
+    for i in range(runs):
+        stats.record(name, latency, int((i + 1) * rejection_rate) > int(i * rejection_rate))
+
+def test_declared_order_until_every_check_has_samples():
+    stats = CheckStats(["slow", "fast"])
+    _train(stats, "fast", 0.001, 0.5)
+    _train(stats, "slow", 0.1, 0.5, runs=MIN_SAMPLES - 1)
+    assert stats.snapshot()["order"] == ["slow", "fast"]
+    stats.record("slow", 0.1, True)
+    assert stats.snapshot()["order"] == ["fast", "slow"]
+
+def test_ordered_by_latency_per_rejection():
+    stats = CheckStats(["a", "b", "c"])
+    _train(stats, "a", 0.010, 0.10)   # 0.1 s per rejection
+    _train(stats, "b", 0.020, 0.50)   # 0.04
+    _train(stats, "c", 0.001, 0.0)    # never rejects: scored against MIN_REJECTION_RATE, 0.1
+    assert stats.snapshot()["order"][0] == "b"
+    snapshot = stats.snapshot()["checks"]
+    assert snapshot["b"]["runs"] == 100 and snapshot["b"]["rejections"] == 50
+    assert snapshot["b"]["latency_ms"] == pytest.approx(20.0)
+    assert snapshot["c"]["score"] == pytest.approx(0.001 / check_stats.MIN_REJECTION_RATE)
+
+def test_estimates_follow_drift():
+    stats = CheckStats(["a", "b"])
+    _train(stats, "a", 0.001, 0.5)
+    _train(stats, "b", 0.010, 0.5)
+    assert stats.snapshot()["order"] == ["a", "b"]
+    _train(stats, "a", 0.100, 0.5)  # "a" got slower
+    assert stats.snapshot()["order"] == ["b", "a"]
+
+def test_every_nth_order_is_rotated():
+    stats = CheckStats(["a", "b", "c"])
+    orders = [stats.order() for _ in range(2 * EXPLORE_EVERY)]
+    rotated = [i for i, order in enumerate(orders, start=1) if order != ["a", "b", "c"]]
+    assert rotated == [EXPLORE_EVERY, 2 * EXPLORE_EVERY]
+    assert orders[EXPLORE_EVERY - 1] == ["b", "c", "a"]
+    assert CheckStats(["only"]).order() == ["only"]
+
+def test_timed_measures_the_call():
+    result, seconds = timed(lambda x: time.sleep(0.05) or x * 2, 21)
+    assert result == 42 and 0.04 <= seconds < 1
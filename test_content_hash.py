@@ -0,0 +1,37 @@
+from src.motherboard.content_hash import canonicalize, content_hash, hypothesis_hash
+
+def test_canonical_form_ignores_spelling_order_and_bookkeeping():
+    a = {"claim": "Water  boils at\n100C", "assumptions": ["sea level", "pure water"],
+         "hypothesis_id": "HYP_1", "novelty_score": 0.3, "derived_from": ["F1"]}
+    b = {"assumptions": ["Pure water", "sea level"], "claim": "water boils at 100c",
+         "hypothesis_id": "HYP_2", "novelty_score": 0.9, "retrieved_context": ["F7"]}
+    assert canonicalize(a) == canonicalize(b)
+    assert hypothesis_hash(a) == hypothesis_hash(b)
+    assert hypothesis_hash(dict(a, content_hash="precomputed")) == "precomputed"
+
+    c = dict(a, payload={"steps": ["heat", "measure"]})
+    assert content_hash(c) != content_hash(a)
+    assert content_hash(dict(c, payload={"steps": ["measure", "heat"]})) != content_hash(c), \
+        "only assumptions are unordered"
+
+def test_duplicate_hypotheses_keep_the_first_id(motherboard):
+    first, dup, other = motherboard.add_universe_hypotheses_bulk([
+        {"hypothesis_id": "HYP_a", "claim": "Iron rusts in water", "assumptions": ["oxygen"]},
+        {"hypothesis_id": "HYP_b", "claim": "iron rusts  in water", "assumptions": ["Oxygen"]},
+        {"hypothesis_id": "HYP_c", "claim": "gold does not rust"},
+    ])
+    assert (first["hypothesis_id"], dup["hypothesis_id"], other["hypothesis_id"]) == ("HYP_a", "HYP_a", "HYP_c")
+    again = motherboard.add_universe_hypothesis({"hypothesis_id": "HYP_d", "claim": "IRON RUSTS IN WATER",
+                                                 "assumptions": ["oxygen"]})
+    assert again["hypothesis_id"] == "HYP_a"
+    assert [h["hypothesis_id"] for h in motherboard.iter_universe_hypotheses()] == ["HYP_a", "HYP_c"]
+
+def test_duplicate_facts_are_stored_once_until_retracted(motherboard, add_fact):
+    fact = add_fact("salt dissolves in water")
+    assert add_fact("Salt dissolves in  water")["fact_id"] == fact["fact_id"]
+    assert len(motherboard.get_earth_facts()) == 1
+
+    motherboard.retract_earth_fact(fact["fact_id"], "imprecise")
+    fresh = add_fact("salt dissolves in water")
+    assert fresh["fact_id"] != fact["fact_id"]
+    assert [f["fact_id"] for f in motherboard.get_earth_facts()] == [fresh["fact_id"]]
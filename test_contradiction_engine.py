@@ -0,0 +1,59 @@
+from src.approver_god.validation import contradiction_engine
+from src.approver_god.validation.contradiction_engine import ContradictionEngine, terms
+
+HYP = {"hypothesis_id": "HYP_1", "claim": "Aluminium resists corrosion in seawater"}
+
+def _facts(*claims):
+    return [{"fact_id": f"F{i}", "version": 1, "content": {"claim": claim}} for i, claim in enumerate(claims)]
+
+class RecordingScorer:
+    """Scores 0.9 when the fact says "not", else 0.1, and records each batch's size."""
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, pairs):
+        self.batches.append(len(pairs))
+        return [0.9 if "not" in terms(fact) else 0.1 for fact, _ in pairs]
+
+def test_terms_drop_stopwords_but_keep_negations():
+    assert terms("The alloy does NOT corrode in water") == {"alloy", "not", "corrode", "water"}
+
+def test_candidates_prefer_shared_terms_and_keep_zero_overlap_facts():
+    facts = _facts("iron rusts quickly", "glass is brittle", "gold is inert",
+                   "aluminium forms an oxide layer in seawater", "copper is ductile")
+    engine = ContradictionEngine(k=2)
+    assert [f["fact_id"] for _, f in engine.candidates(HYP, facts)] == ["F3", "F0"]
+    assert len(engine.candidates(HYP, facts[:2])) == 2, "with k or fewer facts, all are candidates"
+
+def test_the_hypothesis_own_promoted_fact_is_not_a_candidate():
+    facts = _facts("aluminium corrosion rate", "seawater salinity") + [{"fact_id": "F_own", "content": dict(HYP)}]
+    engine = ContradictionEngine(k=2)
+    assert [f["fact_id"] for _, f in engine.candidates(HYP, facts)] == ["F0", "F1"]
+
+def test_scoring_is_batched_and_memoized_by_content():
+    scorer = RecordingScorer()
+    engine = ContradictionEngine(scorer, k=5, batch_size=2)
+    facts = _facts("aluminium does not resist seawater", "seawater is salty", "aluminium is light",
+                   "corrosion needs oxygen", "resists scratches")
+    assert [f["fact_id"] for f in engine.contradictions(HYP, facts)] == ["F0"]
+    assert scorer.batches == [2, 2, 1]
+
+    resubmitted = dict(HYP, hypothesis_id="HYP_2")
+    assert not engine.is_consistent(resubmitted, facts)
+    assert scorer.batches == [2, 2, 1], "the same claim against the same facts is not scored again"
+    stats = engine.stats()
+    assert (stats["checks"], stats["scored"], stats["memo_hits"], stats["memo_size"]) == (2, 5, 5, 5)
+
+def test_without_facts_the_vector_index_is_asked(monkeypatch):
+    asked = []
+    def search(queries, k):
+        asked.append((queries, k))
+        return [_facts("aluminium is not corrosion resistant")]
+    monkeypatch.setattr(contradiction_engine, "search_earth_facts", search)
+    engine = ContradictionEngine(RecordingScorer(), k=3)
+    assert not engine.is_consistent(HYP, None)
+    assert asked == [(["Aluminium resists corrosion in seawater"], 3)]
+
+    monkeypatch.setattr(contradiction_engine, "search_earth_facts", lambda queries, k: None)
+    assert engine.is_consistent(HYP, None), "no embedding model: nothing to check against"
@@ -0,0 +1,31 @@
+import pytest
+
+def test_reads_are_served_from_the_cache(motherboard, add_fact):
+    """
+    Repeated reads at an unchanged generation hit the cache; a write moves the
+    generation, and the next read only catches up with the new tail.
+    """
+    add_fact("water boils at 100C")
+    first = motherboard.get_earth_facts()
+    before = motherboard.fact_cache_stats()
+    again = motherboard.get_earth_facts()
+    after = motherboard.fact_cache_stats()
+
+    assert [f["content"]["claim"] for f in again] == ["water boils at 100C"]
+    assert after["hits"] == before["hits"] + 1
+    assert after["misses"] == before["misses"]
+
+    add_fact("ice melts at 0C")
+    latest = motherboard.get_earth_facts()
+    assert len(latest) == 2
+    assert motherboard.fact_cache_stats()["generation"] == before["generation"] + 1
+    assert len(first) == 1, "a view handed out earlier never changes"
+
+def test_views_are_read_only(motherboard, add_fact):
+    add_fact("the sky is blue")
+    fact = motherboard.get_earth_facts()[0]
+    with pytest.raises(TypeError):
+        fact["confidence"] = 0.1
+    copy = dict(fact)
+    copy["confidence"] = 0.1
+    assert motherboard.get_earth_facts()[0]["confidence"] == 0.9
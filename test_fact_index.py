@@ -0,0 +1,54 @@
+import pytest
+from src.motherboard.fact_index import FactIndex
+
+def test_query_facts_filters_and_pages(motherboard, add_fact):
+    """
+    Equality filters combine with AND, and following next_cursor visits every
+    match exactly once, in timestamp order.
+    """
+    for i in range(7):
+        add_fact(f"claim {i}", source="lab" if i % 2 else "field", trust_tier="T1" if i < 4 else "T2")
+
+    assert len(motherboard.query_facts(source="lab")["facts"]) == 3
+    assert [f["content"]["claim"] for f in motherboard.query_facts(source="lab", trust_tier="T2")["facts"]] == ["claim 5"]
+
+    seen, cursor = [], None
+    while True:
+        page = motherboard.query_facts(limit=3, cursor=cursor)
+        seen.extend(f["content"]["claim"] for f in page["facts"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [f"claim {i}" for i in range(7)]
+
+    newest = motherboard.query_facts(descending=True, limit=2)["facts"]
+    assert [f["content"]["claim"] for f in newest] == ["claim 6", "claim 5"]
+
+def test_empty_pages_have_no_cursor(motherboard, add_fact):
+    add_fact("only fact")
+    assert motherboard.query_facts(limit=0) == {"facts": [], "next_cursor": None}
+    assert motherboard.query_facts(source="nowhere")["next_cursor"] is None
+    with pytest.raises(ValueError):
+        motherboard.query_facts(cursor="not-a-cursor")
+
+class _Records:
+    def __init__(self, records):
+        self.records = records
+
+    def at_position(self, position):
+        return self.records[position]
+
+def test_fact_index_time_range_and_limit_zero():
+    records = [{"fact_id": f"F{i}", "timestamp": 100 + i, "source": "a" if i % 2 else "b"} for i in range(6)]
+    index = FactIndex()
+    for position, record in enumerate(records):
+        index.add(position, record)
+    view = _Records(records)
+
+    page, cursor = index.query(view, {"source": "a"}, since=101, until=104)
+    assert [r["fact_id"] for r in page] == ["F1", "F3"]
+    assert cursor is None
+    assert index.query(view, {}, limit=0) == ([], None)
+    page, cursor = index.query(view, {}, limit=2)
+    assert [r["fact_id"] for r in page] == ["F0", "F1"]
+    assert [r["fact_id"] for r in index.query(view, {}, limit=2, cursor=cursor)[0]] == ["F2", "F3"]
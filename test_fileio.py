@@ -0,0 +1,53 @@
+import json
+import pytest
+from src.common import fileio
+from src.common.fileio import Codec, read_json, register_codec, write_json
+
+DOC = {"facts": [{"fact_id": "F1", "content": {"claim": "café"}, "confidence": 0.9}], "count": 1}
+
+def test_json_round_trip(tmp_path):
+    path = str(tmp_path / "facts.json")
+    write_json(path, DOC)
+    assert read_json(path) == DOC
+    assert json.loads(open(path, encoding="utf-8").read()) == DOC
+    write_json(path, DOC, pretty=True)
+    assert "\n  " in open(path, encoding="utf-8").read()
+    assert read_json(path) == DOC
+    assert [p.name for p in tmp_path.iterdir()] == ["facts.json"], "no temporary files are left behind"
+
+def test_msgpack_is_picked_by_extension_and_sniffed_on_read(tmp_path):
+    pytest.importorskip("msgpack")
+    packed = str(tmp_path / "facts.msgpack")
+    write_json(packed, DOC)
+    assert open(packed, "rb").read()[:1] not in b"{["
+    assert read_json(packed) == DOC
+
+    # A file converted in place keeps its name; reading goes by the header.
+    renamed = str(tmp_path / "facts.json")
+    write_json(renamed, DOC, codec=fileio.MSGPACK)
+    assert read_json(renamed) == DOC
+
+def test_missing_unreadable_and_bom_files(tmp_path):
+    assert read_json(str(tmp_path / "missing.json")) == {}
+    broken = tmp_path / "broken.json"
+    broken.write_text("{not json", encoding="utf-8")
+    assert read_json(str(broken)) == {}
+    bom = tmp_path / "bom.json"
+    bom.write_bytes(b"\xef\xbb\xbf" + json.dumps(DOC).encode("utf-8"))
+    assert read_json(str(bom)) == DOC
+
+def test_msgpack_documents_read_as_empty_without_msgpack(tmp_path, monkeypatch):
+    monkeypatch.setattr(fileio, "msgpack", None)
+    packed = b"\x81\xa5facts\x90"  # {"facts": []}
+    for name in ("facts.msgpack", "facts.json"):
+        path = tmp_path / name
+        path.write_bytes(packed)
+        assert read_json(str(path)) == {}
+
+def test_registered_codecs_are_used_by_extension(tmp_path, monkeypatch):
+    monkeypatch.setattr(fileio, "CODECS", dict(fileio.CODECS))
+    upper = Codec("upper", lambda data, pretty=False: json.dumps(data).upper().encode(), json.loads)
+    register_codec(".UP", upper)
+    path = str(tmp_path / "doc.up")
+    write_json(path, {"a": "b"})
+    assert open(path, encoding="utf-8").read() == '{"A": "B"}'
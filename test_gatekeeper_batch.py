@@ -0,0 +1,85 @@
+import time
+import pytest
+from src.approver_god.gating import gatekeeper
+from src.approver_god.gating.check_stats import CheckStats
+from src.approver_god.intake.request_schema import IntakeRequest
+from src.approver_god.validation import stats_tests
+from src.common.ids import make_id
+
+@pytest.fixture
+def gate(motherboard, monkeypatch):
+    """
+    The gatekeeper over the test Motherboard, with thread pools and stand-in
+    validators: one hypothesis per objective, claims containing "weak" fail the
+    stats tests and claims containing "contradicts" fail the contradiction check.
+    """
+    monkeypatch.setenv("VALIDATION_CACHE", "off")
+    monkeypatch.setenv("GATEKEEPER_STATS_POOL", "thread")
+    monkeypatch.setattr(gatekeeper, "_pools", {})
+    monkeypatch.setattr(gatekeeper, "_check_stats", CheckStats(gatekeeper.CHECKS))
+    monkeypatch.setattr(gatekeeper, "generate_hypotheses", lambda objective, facts: [
+        {"hypothesis_id": make_id("HYP"), "claim": objective, "assumptions": []}])
+    monkeypatch.setattr(gatekeeper, "run_stats_tests", lambda hyp: 0.2 if "weak" in hyp["claim"] else 0.99)
+    monkeypatch.setattr(gatekeeper, "check_for_contradictions",
+                        lambda hyp, facts: "contradicts" not in hyp["claim"])
+    yield gatekeeper
+    for pool in gatekeeper._pools.values():
+        pool.shutdown()
+
+def _claims(facts):
+    return [f["content"]["claim"] for f in facts]
+
+def test_batch_results_follow_request_order(gate, motherboard):
+    requests = [IntakeRequest("alloys resist corrosion", "materials"),
+                IntakeRequest("weak evidence for cold fusion", "physics"),
+                IntakeRequest("graphene conducts heat", "physics"),
+                IntakeRequest("water contradicts itself", "materials")]
+    results = gate.process_requests_batch(requests)
+    assert [_claims(r) for r in results] == [["alloys resist corrosion"], [], ["graphene conducts heat"], []]
+    assert sorted(_claims(motherboard.get_earth_facts())) == ["alloys resist corrosion", "graphene conducts heat"]
+    statuses = {h["claim"]: h["status"] for h in motherboard.iter_universe_hypotheses()}
+    assert statuses == {"alloys resist corrosion": "approved", "weak evidence for cold fusion": "rejected",
+                        "graphene conducts heat": "approved", "water contradicts itself": "rejected"}
+
+def test_duplicates_reuse_the_earlier_outcome(gate, motherboard, monkeypatch):
+    calls = []
+    monkeypatch.setattr(gate, "run_stats_tests", lambda hyp: calls.append(hyp["claim"]) or 0.99)
+    first = gate.process_request(IntakeRequest("diamond is carbon", "chemistry"))
+    again, twin = gate.process_requests_batch([IntakeRequest("Diamond is  carbon", "chemistry"),
+                                               IntakeRequest("ozone is O3", "chemistry")] * 2)[:2]
+    assert calls == ["diamond is carbon", "ozone is O3"], "duplicates are not validated again"
+    assert [f["fact_id"] for f in again] == [f["fact_id"] for f in first]
+    assert _claims(twin) == ["ozone is O3"]
+    assert len(motherboard.get_earth_facts()) == 2
+
+def test_a_failing_check_rejects_its_hypothesis_only(gate, monkeypatch):
+    def flaky(hyp, facts):
+        if "explodes" in hyp["claim"]:
+            raise RuntimeError("model unavailable")
+        return True
+    monkeypatch.setattr(gate, "check_for_contradictions", flaky)
+    results = gate.process_requests_batch([IntakeRequest("the check explodes"), IntakeRequest("iron is magnetic")])
+    assert [_claims(r) for r in results] == [[], ["iron is magnetic"]]
+
+def test_validation_runs_concurrently(gate, monkeypatch):
+    def slow(hyp):
+        time.sleep(0.2)
+        return 0.99
+    monkeypatch.setenv("GATEKEEPER_STATS_WORKERS", "8")
+    monkeypatch.setenv("GATEKEEPER_CHECKS_WORKERS", "8")
+    monkeypatch.setattr(gate, "run_stats_tests", slow)
+    start = time.perf_counter()
+    results = gate.process_requests_batch([IntakeRequest(f"claim {i}") for i in range(6)])
+    assert time.perf_counter() - start < 0.2 * 6 / 2
+    assert [_claims(r) for r in results] == [[f"claim {i}"] for i in range(6)]
+
+def test_stats_tests_run_in_worker_processes(gate, monkeypatch, tmp_path):
+    monkeypatch.setenv("GATEKEEPER_STATS_POOL", "process")
+    monkeypatch.setenv("VALIDATION_CACHE_DB", str(tmp_path / "cache.db"))
+    monkeypatch.setattr(gate, "run_stats_tests", stats_tests.run_stats_tests)
+    monkeypatch.setattr(gate, "generate_hypotheses", lambda objective, facts: [
+        {"hypothesis_id": make_id("HYP"), "claim": objective, "confidence_score": 0.5 if "weak" in objective else 0.98}])
+    results = gate.process_requests_batch([IntakeRequest("nickel is magnetic"), IntakeRequest("weak signal")])
+    assert [_claims(r) for r in results] == [["nickel is magnetic"], []]
+    assert gate._pools["stats"]._mp_context.get_start_method() != "fork"
+    assert gate.check_stats()["checks"]["stats"]["runs"] == 2
@@ -0,0 +1,29 @@
+from src.approver_god.hypothesis.generate import MAX_SOURCE_FACTS, generate_hypotheses
+
+def test_generated_hypotheses_derive_from_their_top_sources_only():
+    facts = [{"fact_id": f"F{i}"} for i in range(MAX_SOURCE_FACTS + 2)]
+    hyp = generate_hypotheses("cheaper batteries", facts)[0]
+    assert hyp["derived_from"] == ["F0", "F1", "F2"]
+    assert hyp["retrieved_context"] == ["F3", "F4"]
+
+def test_walks_and_cascading_retraction(motherboard, add_fact):
+    source = add_fact("lithium is a metal", lineage="SRC_textbook")
+    bystander = add_fact("cobalt is a metal", lineage="SRC_textbook")
+    hyp = motherboard.add_universe_hypothesis({
+        "hypothesis_id": "HYP_alloys",
+        "claim": "lithium alloys store more charge",
+        "derived_from": [source["fact_id"]],
+        "retrieved_context": [bystander["fact_id"]],
+    })
+    derived = add_fact("lithium alloys store more charge", lineage=hyp["hypothesis_id"])
+
+    assert motherboard.get_ancestors(derived["fact_id"]) == [hyp["hypothesis_id"], source["fact_id"], "SRC_textbook"]
+    assert motherboard.get_ancestors(derived["fact_id"], max_depth=1) == [hyp["hypothesis_id"]]
+    assert motherboard.get_descendants(source["fact_id"]) == [hyp["hypothesis_id"], derived["fact_id"]]
+    assert motherboard.get_descendants(bystander["fact_id"]) == [], "retrieved_context is not lineage"
+
+    retracted = motherboard.retract_cascade(source["fact_id"], "lithium reclassified")
+    assert sorted(retracted) == sorted([source["fact_id"], derived["fact_id"]])
+    assert [f["fact_id"] for f in motherboard.get_earth_facts()] == [bystander["fact_id"]]
+    assert motherboard.retract_cascade(source["fact_id"], "again") == []
+    assert motherboard.lineage_stats()["edges"] == 4
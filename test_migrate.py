@@ -0,0 +1,56 @@
+import sqlite3
+import pytest
+from src.common.fileio import write_json
+from src.motherboard import migrate
+from src.motherboard.segment_log import SegmentLog
+
+# Migration reads the file-based stores, so only the log engine applies.
+pytestmark = pytest.mark.parametrize("motherboard", ["log"], indirect=True)
+
+@pytest.fixture
+def legacy_store(motherboard):
+    """A pre-segment-log installation: facts in the legacy JSON file, nothing else."""
+    motherboard.EARTH_DIR.mkdir(parents=True)
+    facts = [{"fact_id": f"F{i}", "content": {"claim": f"claim {i}"}, "lineage": "HYP_0"} for i in range(3)]
+    write_json(str(motherboard.EARTH_FACTS), {"facts": facts})
+    motherboard.EARTH_LINEAGE.write_text("".join(f"F{i} | HYP_0\n" for i in range(3)), encoding="utf-8")
+    return facts
+
+def _fact_ids(db):
+    with sqlite3.connect(str(db)) as conn:
+        return [row[0] for row in conn.execute("SELECT record_id FROM records WHERE stream = 'facts' ORDER BY seq")]
+
+def test_rerun_copies_nothing_twice(legacy_store, tmp_path):
+    db = tmp_path / "target.db"
+    assert migrate.migrate_to_sqlite(db) == {"facts": 3, "hypotheses": 0, "lineage": 3}
+    assert migrate.migrate_to_sqlite(db) == {"facts": 0, "hypotheses": 0, "lineage": 0}
+    assert _fact_ids(db) == ["F0", "F1", "F2"]
+
+def test_records_written_since_resume_at_the_watermark(legacy_store, motherboard, tmp_path):
+    """The segment log is seeded from the legacy file in order, so only records written since are copied."""
+    db = tmp_path / "target.db"
+    migrate.migrate_to_sqlite(db, batch_size=2)
+
+    log = SegmentLog(motherboard.EARTH_LOG_DIR)
+    log.append_many([{"fact_id": "F3"}, {"fact_id": "F4"}])
+    log.close()
+
+    assert migrate.migrate_to_sqlite(db, batch_size=2)["facts"] == 2
+    assert migrate.migrate_to_sqlite(db)["facts"] == 0
+    assert _fact_ids(db) == ["F0", "F1", "F2", "F3", "F4"]
+
+def test_domain_shards_migrate_into_their_own_database(motherboard, add_fact, monkeypatch, tmp_path):
+    monkeypatch.setenv("MOTHERBOARD_SHARDING", "domain")
+    plain = add_fact("water boils at 100 C")
+    physics = add_fact("light bends near mass", domain="physics")
+
+    counts = migrate.migrate_to_sqlite(tmp_path / "target.db")
+    assert counts["facts"] == 1 and counts["physics:facts"] == 1
+    assert _fact_ids(tmp_path / "target.db") == [plain["fact_id"]]
+    assert _fact_ids(motherboard.SHARDS_DIR / "physics" / "motherboard.db") == [physics["fact_id"]]
+    assert not any(migrate.migrate_to_sqlite(tmp_path / "target.db").values())
+
+def test_refuses_to_read_the_sqlite_engine(motherboard, monkeypatch):
+    monkeypatch.setenv("MOTHERBOARD_BACKEND", "sqlite")
+    with pytest.raises(ValueError):
+        migrate.migrate_to_sqlite()
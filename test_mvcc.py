@@ -0,0 +1,32 @@
+import pytest
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controls the store's clock: set clock.now to pick the timestamp of the next write."""
+    class Clock:
+        now = 1_000_000
+    monkeypatch.setattr("time.time", lambda: Clock.now)
+    return Clock
+
+def test_updates_keep_every_version(motherboard, add_fact, clock):
+    fact = add_fact("the boiling point of water is 100C", confidence=0.8)
+    before = motherboard.snapshot()
+    clock.now += 60
+    updated = motherboard.update_earth_fact(fact["fact_id"], {"confidence": 0.95})
+
+    assert updated["version"] == 2
+    assert updated["confidence"] == 0.95
+    assert updated["content"] == fact["content"]
+    assert [v["confidence"] for v in motherboard.get_fact_history(fact["fact_id"])] == [0.8, 0.95]
+    assert motherboard.get_fact(fact["fact_id"])["confidence"] == 0.95
+    assert motherboard.get_fact(fact["fact_id"], as_of=clock.now - 30)["confidence"] == 0.8
+    assert motherboard.get_fact(fact["fact_id"], as_of=clock.now - 3600) is None
+
+    assert before.get_fact(fact["fact_id"])["confidence"] == 0.8, "snapshots do not see later versions"
+    assert [f["confidence"] for f in before.facts] == [0.8]
+    assert [f["confidence"] for f in motherboard.iter_earth_facts()] == [0.95]
+    assert motherboard.query_facts(fact_id=fact["fact_id"])["facts"][0]["version"] == 2
+
+def test_updating_an_unknown_fact_raises(motherboard):
+    with pytest.raises(KeyError):
+        motherboard.update_earth_fact("FACT_missing", {"confidence": 0.1})
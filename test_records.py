@@ -0,0 +1,45 @@
+import pickle
+import pytest
+from src.motherboard.records import Fact, Hypothesis, decode, encode
+
+RAW = encode({"fact_id": "F1", "version": 1, "source": "test", "confidence": 0.9,
+              "content": {"claim": "argon is a noble gas"}, "content_hash": "abc"})
+
+def test_body_is_decoded_once_on_first_access():
+    fact = Fact.from_store(RAW)
+    assert fact.fact_id == "F1" and fact["source"] == "test"
+    assert fact._decoded is None, "header fields are read without decoding the body"
+    content = fact["content"]
+    assert content == {"claim": "argon is a noble gas"}
+    assert fact["content"] is content
+    assert fact.to_store() is RAW
+
+def test_records_behave_as_read_only_mappings():
+    fact = Fact.from_store(RAW)
+    assert set(fact) == {"fact_id", "version", "source", "confidence", "content", "content_hash"}
+    assert len(fact) == 6 and "trust_tier" not in fact and fact.get("trust_tier") is None
+    with pytest.raises(KeyError):
+        fact["trust_tier"]
+    with pytest.raises(TypeError):
+        fact["confidence"] = 0.1
+    with pytest.raises(AttributeError):
+        fact.confidence = 0.1
+    plain = fact.to_dict()
+    plain["content"]["claim"] = "changed"
+    assert fact["content"]["claim"] == "argon is a noble gas"
+
+def test_replace_shares_the_payload():
+    fact = Fact.from_store(RAW)
+    newer = fact.replace({"version": 2, "confidence": 0.5, "note": "recalibrated"})
+    assert (newer["version"], newer["confidence"], newer["note"]) == (2, 0.5, "recalibrated")
+    assert newer["content"] == fact["content"]
+    assert newer._raw is fact._raw
+    assert fact["version"] == 1
+    assert Fact.from_store(newer.to_store()) == newer
+
+def test_pickles_as_store_bytes_and_decodes_ops_as_dicts():
+    hyp = Hypothesis.from_dict({"hypothesis_id": "H1", "status": "provisional", "claim": "x"})
+    assert pickle.loads(pickle.dumps(hyp)) == hyp
+    assert isinstance(decode(RAW, Fact), Fact)
+    op = decode(encode({"op": "retract", "fact_id": "F1"}), Fact)
+    assert type(op) is dict and op["op"] == "retract"
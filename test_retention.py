@@ -0,0 +1,71 @@
+from src.common.fileio import write_json
+from src.motherboard.retention import APPROVED, PROVISIONAL, REJECTED
+
+TTLS = {PROVISIONAL: 100, REJECTED: 10, APPROVED: None}
+
+def _small_segments(motherboard):
+    """Seals a log segment after every write: compaction only touches sealed segments."""
+    stream = motherboard._shard(motherboard.shard_for(None)).stream("hypotheses")
+    if hasattr(stream, "segment_bytes"):
+        stream.segment_bytes = 1
+
+def test_compaction_archives_expired_hypotheses_only(motherboard, monkeypatch):
+    class Clock:
+        now = 1_000_000
+    monkeypatch.setattr("time.time", lambda: Clock.now)
+    _small_segments(motherboard)
+    start = Clock.now
+    motherboard.add_universe_hypotheses_bulk([
+        {"hypothesis_id": "HYP_pending", "claim": "zinc protects steel"},
+        {"hypothesis_id": "HYP_rejected", "claim": "lead floats on water"},
+        {"hypothesis_id": "HYP_approved", "claim": "copper is ductile"},
+    ])
+    motherboard.set_hypothesis_statuses({"HYP_rejected": REJECTED, "HYP_approved": APPROVED})
+    Clock.now += 150
+    motherboard.add_universe_hypothesis({"hypothesis_id": "HYP_recent", "claim": "tin is soft"})
+
+    result = motherboard.compact_universe(TTLS, now=start + 50)
+    assert result["archived"] == 1
+    hot = [h["hypothesis_id"] for h in motherboard.iter_universe_hypotheses()]
+    assert hot == ["HYP_pending", "HYP_approved", "HYP_recent"]
+    assert motherboard.get_archived_hypothesis("HYP_rejected")["status"] == REJECTED
+
+    assert motherboard.compact_universe(TTLS, now=start + 200)["archived"] == 1
+    hot = [h["hypothesis_id"] for h in motherboard.iter_universe_hypotheses()]
+    assert hot == ["HYP_approved", "HYP_recent"], "approved never expires; recent is within its TTL"
+    assert {e["hypothesis_id"] for e in motherboard.query_archived_hypotheses()} == {"HYP_rejected", "HYP_pending"}
+    assert [e["hypothesis_id"] for e in motherboard.query_archived_hypotheses(status=PROVISIONAL)] == ["HYP_pending"]
+    assert motherboard.get_archived_hypothesis("HYP_pending")["claim"] == "zinc protects steel"
+    assert motherboard.compact_universe(TTLS, now=start + 200)["archived"] == 0
+
+def test_archived_content_is_still_deduplicated(motherboard):
+    _small_segments(motherboard)
+    motherboard.add_universe_hypotheses_bulk([
+        {"hypothesis_id": "HYP_old", "claim": "silver tarnishes"},
+        {"hypothesis_id": "HYP_new", "claim": "platinum does not tarnish"},
+    ])
+    motherboard.set_hypothesis_statuses({"HYP_old": REJECTED})
+    motherboard.add_universe_hypothesis({"hypothesis_id": "HYP_last", "claim": "gold is malleable"})
+    assert motherboard.compact_universe({REJECTED: 0})["archived"] == 1
+
+    again = motherboard.add_universe_hypothesis({"hypothesis_id": "HYP_again", "claim": "Silver  tarnishes"})
+    assert again["hypothesis_id"] == "HYP_old"
+    assert "HYP_again" not in [h["hypothesis_id"] for h in motherboard.iter_universe_hypotheses()]
+    assert motherboard.find_hypothesis_by_content(again["content_hash"]) == "HYP_old"
+
+def test_undated_hypotheses_stay_hot_until_a_change_dates_them(motherboard):
+    """Hypotheses seeded from a pre-retention installation carry no timestamp."""
+    motherboard.UNIVERSE_DIR.mkdir(parents=True)
+    write_json(str(motherboard.UNIVERSE_HYPS), {"hypotheses": [
+        {"hypothesis_id": "HYP_legacy", "claim": "iron rusts"},
+        {"hypothesis_id": "HYP_legacy_rejected", "claim": "glass is a liquid"},
+    ]})
+    _small_segments(motherboard)
+    motherboard.add_universe_hypothesis({"hypothesis_id": "HYP_new", "claim": "nickel is magnetic"})
+    assert motherboard.compact_universe({PROVISIONAL: 0, REJECTED: 0})["archived"] == 0
+
+    motherboard.set_hypothesis_statuses({"HYP_legacy_rejected": REJECTED})
+    motherboard.add_universe_hypothesis({"hypothesis_id": "HYP_last", "claim": "cobalt is blue"})
+    assert motherboard.compact_universe({REJECTED: 0})["archived"] == 1
+    assert motherboard.get_archived_hypothesis("HYP_legacy_rejected")["status"] == REJECTED
+    assert "HYP_legacy" in [h["hypothesis_id"] for h in motherboard.iter_universe_hypotheses()]
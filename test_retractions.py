@@ -0,0 +1,22 @@
+def test_retracted_facts_disappear_from_reads(motherboard, add_fact):
+    facts = [add_fact(f"claim {i}") for i in range(6)]
+    before = motherboard.get_earth_facts()
+    gone = {facts[1]["fact_id"], facts[4]["fact_id"]}
+
+    assert motherboard.retract_earth_facts(list(gone) + ["FACT_missing"], "disproved") == list(gone)
+    assert motherboard.retract_earth_fact(facts[1]["fact_id"], "again") is False
+
+    live = [f["fact_id"] for f in facts if f["fact_id"] not in gone]
+    view = motherboard.get_earth_facts()
+    assert len(view) == 4
+    assert [view[i]["fact_id"] for i in range(len(view))] == live
+    assert [f["fact_id"] for f in view] == live
+    assert view[-1]["fact_id"] == live[-1]
+    assert [f["fact_id"] for f in motherboard.iter_earth_facts()] == live
+    assert [f["fact_id"] for f in motherboard.query_facts()["facts"]] == live
+    assert motherboard.get_fact(facts[1]["fact_id"]) is None
+    assert len(before) == 6, "a view handed out earlier keeps the retracted facts"
+
+    assert motherboard.is_retracted(facts[4]["fact_id"])
+    assert not motherboard.is_retracted(facts[0]["fact_id"])
+    assert motherboard.get_retractions()[facts[4]["fact_id"]]["reason"] == "disproved"
@@ -0,0 +1,103 @@
+import threading
+import time
+import pytest
+from src.approver_god.validation import scheduler, steps, validation_cache
+from src.approver_god.validation.runner import run_validation_plan
+from src.approver_god.validation.scheduler import deciding_threshold, run_plan
+from src.approver_god.validation.validation_cache import ValidationCache
+
+@pytest.fixture
+def register(monkeypatch):
+    """steps.register over an empty registry, with no default steps."""
+    monkeypatch.setattr(steps, "_registry", {})
+    monkeypatch.setattr(scheduler, "DEFAULT_STEPS", ())
+    return steps.register
+
+def test_deciding_threshold():
+    thresholds = {"min_a": 0.5, "max_b": 0.1}
+    assert deciding_threshold({}, {"a", "b"}, thresholds) is None
+    assert deciding_threshold({"a": 0.9}, {"b"}, thresholds) is None
+    assert deciding_threshold({"a": 0.9}, set(), thresholds) == "max_b"
+    assert deciding_threshold({"a": 0.1, "b": 0.9}, set(), thresholds) == "min_a"
+
+def test_a_cheap_rejection_cancels_the_rest(register):
+    started = []
+    register("cheap", ("a",), cost=1)(lambda hyp, ctx: started.append("cheap") or {"a": 0.0})
+    register("costly", ("b",), cost=5)(lambda hyp, ctx: started.append("costly") or {"b": 1.0})
+    result = run_plan({}, ["costly", "cheap"], max_concurrency=1, thresholds={"min_a": 0.5, "min_b": 0.5})
+    assert (result.passed, result.failed_threshold) == (False, "min_a")
+    assert started == ["cheap"] and result.cancelled == ["costly"]
+
+def test_running_steps_see_the_cancellation(register):
+    seen = threading.Event()
+    register("fails", ("a",), cost=1)(lambda hyp, ctx: time.sleep(0.05) or {"a": 0.0})
+
+    @register("waits", ("b",), cost=2)
+    def waits(hyp, ctx):
+        if ctx.cancelled.wait(5):
+            seen.set()
+        return {"b": 1.0}
+
+    start = time.monotonic()
+    result = run_plan({}, ["fails", "waits"], thresholds={"min_a": 0.5, "min_b": 0.5})
+    assert result.cancelled == ["waits"]
+    assert seen.wait(1) and time.monotonic() - start < 2
+
+def test_unknown_entries_are_reported_and_variants_resolve(register):
+    entries = []
+    register("simulate", ("a",))(lambda hyp, ctx: entries.append(ctx.plan_entry) or {"a": 1.0})
+    result = run_plan({}, ["simulate_alpha", "consult_oracle"], thresholds={"min_a": 0.5})
+    assert result.passed and result.completed == ["simulate"]
+    assert entries == ["simulate_alpha"]
+    assert result.errors == {"consult_oracle": "no registered validation step"}
+
+def test_timeouts_fail_dependents_and_inputs_flow_downstream(register):
+    register("hangs", ("a",), timeout=0.1)(lambda hyp, ctx: ctx.cancelled.wait(5) and {})
+    register("after_hang", ("b",), requires=("hangs",))(lambda hyp, ctx: {"b": 1.0})
+    register("base", ("c",))(lambda hyp, ctx: {"c": ctx.rng.random()})
+    register("derived", ("d",), requires=("base",))(lambda hyp, ctx: {"d": ctx.metrics["c"] * 2})
+
+    result = run_plan({}, ["after_hang", "derived"], thresholds={"min_c": 0.0, "min_b": 0.5})
+    assert result.errors == {"hangs": "timed out after 0.1s", "after_hang": "dependency hangs failed"}
+    assert result.failed_threshold == "min_b"
+    assert result.metrics["d"] == pytest.approx(2 * result.metrics["c"])
+    assert run_plan({}, ["derived"], thresholds={"min_c": 0.0}).metrics["c"] == result.metrics["c"], \
+        "step randomness is seeded per step"
+
+def test_dependency_cycles_are_rejected(register):
+    register("x", ("a",), requires=("y",))(lambda hyp, ctx: {})
+    register("y", ("b",), requires=("x",))(lambda hyp, ctx: {})
+    with pytest.raises(ValueError):
+        run_plan({}, ["x"])
+
+def test_plans_with_failed_steps_are_not_cached(register, tmp_path, monkeypatch):
+    monkeypatch.setattr(validation_cache, "_cache", ValidationCache(tmp_path / "cache.db"))
+    runs = []
+
+    passing = {"model_confidence": 0.99, "factual_precision": 0.99, "citation_match": 0.99,
+               "contradiction_rate": 0.0, "code_tests_pass_rate": 1.0, "novelty_score": 0.5}
+
+    @register("flaky", tuple(passing))
+    def flaky(hyp, ctx):
+        runs.append(hyp["claim"])
+        if hyp["claim"] == "unlucky":
+            raise ConnectionError("simulator unreachable")
+        return passing
+
+    for claim in ("unlucky", "unlucky", "steady", "steady"):
+        run_validation_plan({"claim": claim, "validation_plan": ["flaky", "consult_oracle"]})
+    assert runs == ["unlucky", "unlucky", "steady"], "an unknown plan entry alone does not prevent caching"
+
+def test_editing_a_step_invalidates_cached_plans(register, tmp_path, monkeypatch):
+    monkeypatch.setattr(validation_cache, "_cache", ValidationCache(tmp_path / "cache.db"))
+    metrics = {"model_confidence": 0.99, "factual_precision": 0.99, "citation_match": 0.99,
+               "contradiction_rate": 0.0, "code_tests_pass_rate": 1.0, "novelty_score": 0.5}
+    register("assess", tuple(metrics))(lambda hyp, ctx: metrics)
+    hyp = {"claim": "steel is an alloy", "validation_plan": ["assess"]}
+    assert run_validation_plan(hyp)["novelty_score"] == 0.5
+
+    assert run_validation_plan(hyp)["novelty_score"] == 0.5
+    register("assess", tuple(metrics))(lambda hyp, ctx: dict(metrics, novelty_score=0.7))
+    assert run_validation_plan(hyp)["novelty_score"] == 0.7
+    monkeypatch.setattr(steps, "DEFAULT_STEPS", ("assess",))
+    assert validation_cache._cache.get(run_validation_plan, hyp, {"seed": 42}) is None
@@ -0,0 +1,78 @@
+from src.motherboard.segment_log import SegmentLog
+
+def test_append_replay_and_rollover(tmp_path):
+    """
+    Records survive reopening and are spread over several sealed segments.
+    """
+    store = SegmentLog(tmp_path, segment_bytes=256)
+    for i in range(50):
+        assert store.append({"n": i}) == i + 1
+    store.close()
+
+    assert len(list(tmp_path.glob("*.seg"))) > 1
+    reopened = SegmentLog(tmp_path, segment_bytes=256)
+    assert reopened.last_seq == 50
+    assert [r["n"] for _, r in reopened.replay()] == list(range(50))
+    assert [seq for seq, _ in reopened.replay(after=47)] == [48, 49, 50]
+
+def test_recovery_truncates_torn_tail(tmp_path):
+    """
+    A partially written record at the end of the active segment is dropped on open.
+    """
+    store = SegmentLog(tmp_path)
+    store.append_many([{"n": 1}, {"n": 2}])
+    store.close()
+
+    segment = sorted(tmp_path.glob("*.seg"))[-1]
+    with open(segment, "ab") as f:
+        f.write(b'3\t00000000\t{"n": 3')
+
+    recovered = SegmentLog(tmp_path)
+    assert recovered.last_seq == 2
+    assert recovered.append({"n": 3}) == 3
+    assert [r["n"] for _, r in recovered.replay()] == [1, 2, 3]
+
+def test_discard_rewrites_sealed_segments_only(tmp_path):
+    """
+    Discarded records vanish from replay (also after reopening); the others keep
+    their sequence numbers, and the active segment is never touched.
+    """
+    store = SegmentLog(tmp_path, segment_bytes=256)
+    for i in range(40):
+        store.append({"n": i})
+    sealed = store.sealed_seq()
+    segments = list(tmp_path.glob("*.seg"))
+    assert 0 < sealed < 40
+
+    assert store.discard([2, 3, 5, sealed + 1, 99]) == 3
+    expected = [seq for seq in range(1, 41) if seq not in (2, 3, 5)]
+    assert [seq for seq, _ in store.replay()] == expected
+    assert [r["n"] for _, r in store.replay(after=4)] == [n - 1 for n in expected if n > 4]
+
+    second_segment_start = int(sorted(tmp_path.glob("*.seg"))[1].stem)
+    first_segment = range(1, second_segment_start)
+    assert store.discard(first_segment) > 0
+    assert len(list(tmp_path.glob("*.seg"))) == len(segments) - 1, "an emptied segment is deleted"
+    store.close()
+    reopened = SegmentLog(tmp_path, segment_bytes=256)
+    assert reopened.last_seq == 40
+    assert [seq for seq, _ in reopened.replay()] == [seq for seq in expected if seq not in first_segment]
+    assert reopened.append({"n": 40}) == 41
+
+def test_writers_truncate_a_torn_tail_left_by_another_writer(tmp_path):
+    """
+    A record appended after another writer crashed mid-append lands after the
+    last intact record, so it is readable and survives recovery.
+    """
+    crashed = SegmentLog(tmp_path)
+    crashed.append({"n": 1})
+    live = SegmentLog(tmp_path)
+    segment = sorted(tmp_path.glob("*.seg"))[-1]
+    with open(segment, "ab") as f:
+        f.write(b'2\t00000000\t{"n": 2')
+
+    assert live.append({"n": 2}) == 2
+    assert [r["n"] for _, r in live.replay()] == [1, 2]
+    crashed.close()
+    live.close()
+    assert [r["n"] for _, r in SegmentLog(tmp_path).replay()] == [1, 2]
@@ -0,0 +1,54 @@
+import pytest
+from src.motherboard.sharding import (DEFAULT_SHARD, ShardRouter, decode_feed_cursor, decode_query_cursor,
+                                      encode_feed_cursor, encode_query_cursor, shard_name)
+
+def test_router_modes():
+    assert ShardRouter("none").shard_for("physics") == DEFAULT_SHARD
+    domain = ShardRouter("domain")
+    assert domain.shard_for(" Quantum Physics/Optics ") == "quantum_physics_optics"
+    assert domain.shard_for(None) == DEFAULT_SHARD
+    assert shard_name("...") == DEFAULT_SHARD
+    hashed = ShardRouter("hash:4")
+    assert hashed.shard_for("Physics") == hashed.shard_for("physics ")
+    assert {hashed.shard_for(f"domain {i}") for i in range(100)} == {"h000", "h001", "h002", "h003"}
+    for mode in ("hash:0", "by-domain"):
+        with pytest.raises(ValueError):
+            ShardRouter(mode)
+
+def test_cursors_keep_the_single_shard_form():
+    assert encode_query_cursor(100, 3, DEFAULT_SHARD) == "100:3"
+    assert decode_query_cursor("100:3") == (100, 3, DEFAULT_SHARD)
+    assert decode_query_cursor(encode_query_cursor(100, 3, "physics")) == (100, 3, "physics")
+    assert encode_feed_cursor({DEFAULT_SHARD: 7}) == 7
+    assert decode_feed_cursor(encode_feed_cursor({DEFAULT_SHARD: 7, "physics": 2})) == {DEFAULT_SHARD: 7, "physics": 2}
+    with pytest.raises(ValueError):
+        decode_query_cursor("yesterday")
+
+def test_domains_are_stored_apart_and_read_together(motherboard, add_fact, monkeypatch):
+    monkeypatch.setenv("MOTHERBOARD_SHARDING", "domain")
+    clock = iter(range(1_000_000, 1_000_000_000, 10))
+    monkeypatch.setattr("time.time", lambda: next(clock))
+    physics = add_fact("light bends near mass", domain="physics")
+    chemistry = add_fact("noble gases are inert", domain="chemistry")
+    plain = add_fact("the earth is round")
+    assert physics["domain"] == "physics" and "domain" not in plain
+    assert sorted(p.name for p in motherboard.SHARDS_DIR.iterdir()) == ["chemistry", "physics"]
+
+    assert add_fact("light bends near mass", domain="physics")["fact_id"] == physics["fact_id"]
+    assert add_fact("light bends near mass", domain="chemistry")["fact_id"] != physics["fact_id"], \
+        "content is deduplicated within a shard"
+
+    ids = {f["fact_id"] for f in motherboard.get_earth_facts()}
+    assert {physics["fact_id"], chemistry["fact_id"], plain["fact_id"]} <= ids and len(ids) == 4
+    assert [f["fact_id"] for f in motherboard.query_facts(domain="physics")["facts"]] == [physics["fact_id"]]
+
+    first = motherboard.query_facts(limit=2)
+    rest = motherboard.query_facts(limit=2, cursor=first["next_cursor"])
+    assert [f["fact_id"] for f in first["facts"] + rest["facts"]][:3] == \
+        [physics["fact_id"], chemistry["fact_id"], plain["fact_id"]]
+
+    motherboard.update_earth_fact(chemistry["fact_id"], {"confidence": 0.5})
+    assert motherboard.get_fact(chemistry["fact_id"])["confidence"] == 0.5
+    feed = motherboard.changes_since(0)
+    assert len(feed["changes"]) == 5
+    assert set(decode_feed_cursor(feed["next_seq"])) == {DEFAULT_SHARD, "physics", "chemistry"}
@@ -0,0 +1,59 @@
+import pytest
+from src.motherboard.storage import FACTS, HYPOTHESES, StorageBackend, Stream, open_backend
+
+def _open(kind, tmp_path):
+    return open_backend(kind, {FACTS: tmp_path / "facts", HYPOTHESES: tmp_path / "hyps"}, tmp_path / "mb.db")
+
+@pytest.mark.parametrize("kind", ["log", "sqlite"])
+def test_streams_append_replay_and_bootstrap(kind, tmp_path):
+    """
+    Both engines number each stream's records from 1, seed only an empty stream,
+    and see appends made through another instance of the same store.
+    """
+    backend = _open(kind, tmp_path)
+    facts = backend.stream(FACTS)
+    assert isinstance(facts, Stream)
+    assert facts.bootstrap([{"n": 0}, {"n": 1}]) == 2
+    assert facts.bootstrap([{"n": 99}]) == 2
+    assert facts.append_many([{"n": 2}, {"n": 3}]) == 4
+    assert backend.stream(HYPOTHESES).append({"h": 1}) == 1
+
+    other = _open(kind, tmp_path)
+    assert other.stream(FACTS).refresh() == 4
+    other.stream(FACTS).append({"n": 4})
+    other.close()
+
+    assert facts.refresh() == 5
+    assert [r["n"] for _, r in facts.replay()] == [0, 1, 2, 3, 4]
+    assert [seq for seq, _ in facts.replay(after=3)] == [4, 5]
+    assert [seq for seq, _ in facts.replay_raw(after=4)] == [5]
+    backend.close()
+
+def test_unknown_engine_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        _open("papyrus", tmp_path)
+
+def test_incomplete_engines_fail_at_construction():
+    class NoDiscard(Stream):
+        def append_many(self, records):
+            return 0
+
+        def replay(self, after=0):
+            return iter(())
+
+        def refresh(self):
+            return 0
+
+        def bootstrap(self, records):
+            return 0
+
+        def sealed_seq(self):
+            return 0
+
+    class NoStreams(StorageBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        NoDiscard()
+    with pytest.raises(TypeError):
+        NoStreams()
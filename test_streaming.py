@@ -0,0 +1,28 @@
+import json
+
+def test_iter_earth_facts_filters_projects_and_pins(motherboard, add_fact):
+    for i in range(5):
+        add_fact(f"claim {i}", source="lab" if i % 2 else "field")
+    pinned = motherboard.earth_generations()
+    add_fact("claim 5", source="lab")
+
+    assert len(list(motherboard.iter_earth_facts())) == 6
+    assert [f["content"]["claim"] for f in motherboard.iter_earth_facts({"source": "lab"})] == ["claim 1", "claim 3", "claim 5"]
+    high = motherboard.iter_earth_facts(lambda f: f["content"]["claim"] >= "claim 4")
+    assert [f["content"]["claim"] for f in high] == ["claim 4", "claim 5"]
+    assert all(set(f) == {"fact_id", "source"} for f in motherboard.iter_earth_facts(projection=("fact_id", "source")))
+    assert len(list(motherboard.iter_earth_facts(at_generation=pinned))) == 5
+
+def test_export_streams_json_lines(motherboard, add_fact, tmp_path):
+    for i in range(3):
+        add_fact(f"claim {i}")
+    path = tmp_path / "out" / "facts.jsonl"
+
+    assert motherboard.export_earth_facts(str(path), projection=("content",)) == 3
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert lines == [{"content": {"claim": f"claim {i}"}} for i in range(3)]
+
+def test_iter_universe_hypotheses(motherboard):
+    motherboard.add_universe_hypotheses_bulk([{"hypothesis_id": f"HYP_{i}", "claim": f"claim {i}"} for i in range(4)])
+    ids = [h["hypothesis_id"] for h in motherboard.iter_universe_hypotheses({"status": "provisional"})]
+    assert ids == [f"HYP_{i}" for i in range(4)]
@@ -0,0 +1,60 @@
+import threading
+import pytest
+from src.sync.sync_service import DirectoryRemote, HttpRemote, publish, serve, sync_from
+
+def test_replica_catches_up_incrementally(motherboard, add_fact, switch_motherboard, tmp_path):
+    primary, replica, export = tmp_path, tmp_path / "replica", tmp_path / "export"
+    first = add_fact("mercury is a liquid metal")
+    motherboard.add_universe_hypothesis({"hypothesis_id": "HYP_1", "claim": "gallium melts in the hand"})
+    manifest = publish(export, chunk_records=1)
+    assert len(manifest["chunks"]) == 2
+
+    state = replica / "sync_state.json"
+    switch_motherboard(replica)
+    assert sync_from(DirectoryRemote(export), state) == {"chunks": 2, "records": 2, "stored": 2}
+    assert [f["fact_id"] for f in motherboard.get_earth_facts()] == [first["fact_id"]]
+    assert sync_from(DirectoryRemote(export), state)["chunks"] == 0
+
+    switch_motherboard(primary)
+    second = add_fact("bromine is a liquid non-metal")
+    motherboard.update_earth_fact(first["fact_id"], {"confidence": 0.99})
+    motherboard.retract_earth_fact(second["fact_id"], "mislabelled")
+    assert len(publish(export)["chunks"]) == 3
+
+    switch_motherboard(replica)
+    assert sync_from(DirectoryRemote(export), state) == {"chunks": 1, "records": 3, "stored": 3}
+    facts = motherboard.get_earth_facts()
+    assert [(f["fact_id"], f["confidence"]) for f in facts] == [(first["fact_id"], 0.99)]
+    assert motherboard.is_retracted(second["fact_id"])
+
+    # Re-importing the whole export from scratch stores nothing new.
+    state.unlink()
+    assert sync_from(DirectoryRemote(export), state)["stored"] == 0
+
+def test_corrupt_chunks_are_rejected(motherboard, add_fact, switch_motherboard, tmp_path):
+    export = tmp_path / "export"
+    add_fact("helium is lighter than air")
+    chunk = publish(export)["chunks"][0]
+    (export / chunk["path"]).write_text("{}\n", encoding="utf-8")
+    switch_motherboard(tmp_path / "replica")
+    with pytest.raises(ValueError):
+        sync_from(DirectoryRemote(export), tmp_path / "replica" / "sync_state.json")
+    assert len(motherboard.get_earth_facts()) == 0
+
+def test_http_fetch_completes_a_partial_download(motherboard, add_fact, tmp_path):
+    export = tmp_path / "export"
+    add_fact("neon glows red")
+    chunk = publish(export)["chunks"][0]
+    data = (export / chunk["path"]).read_bytes()
+    dest = tmp_path / "chunk.jsonl"
+    (tmp_path / "chunk.jsonl.part").write_bytes(data[:10])
+
+    server = serve(export, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        HttpRemote(f"http://127.0.0.1:{server.server_address[1]}").fetch(chunk["path"], dest)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert dest.read_bytes() == data
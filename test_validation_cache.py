@@ -0,0 +1,74 @@
+import pytest
+from src.approver_god.validation import validation_cache as vc
+from src.approver_god.validation.validation_cache import ValidationCache, memoized
+
+def score(hypothesis, seed=0):
+    return {"score": len(hypothesis["claim"]) + seed}
+
+HYP = {"hypothesis_id": "HYP_1", "claim": "zinc galvanizes steel", "domain": "materials"}
+
+@pytest.fixture
+def clock(monkeypatch):
+    class Clock:
+        now = 1_000_000
+    monkeypatch.setattr("time.time", lambda: Clock.now)
+    return Clock
+
+def test_keys_ignore_identity_but_not_domain_or_arguments(tmp_path):
+    cache = ValidationCache(tmp_path / "cache.db")
+    cache.put(score, HYP, {"score": 1}, {"seed": 0})
+    assert cache.get(score, dict(HYP, hypothesis_id="HYP_2", timestamp=5), {"seed": 0}) == {"score": 1}
+    assert cache.get(score, dict(HYP, domain="biology"), {"seed": 0}) is None
+    assert cache.get(score, HYP, {"seed": 1}) is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+def test_a_policy_change_purges_old_results(tmp_path, monkeypatch):
+    path = tmp_path / "cache.db"
+    ValidationCache(path).put(score, HYP, {"score": 1})
+    assert ValidationCache(path).get(score, HYP) == {"score": 1}
+
+    monkeypatch.setattr(vc, "GATEKEEPER_THRESHOLDS", dict(vc.GATEKEEPER_THRESHOLDS, min_stats_confidence=0.5))
+    reopened = ValidationCache(path)
+    assert reopened.get(score, HYP) is None
+    assert reopened.stats()["entries"] == 0, "rows of the old fingerprint are dropped, not just missed"
+
+def test_eviction_drops_the_least_recently_used(tmp_path, clock):
+    cache = ValidationCache(tmp_path / "cache.db", max_entries=3)
+    hyps = [dict(HYP, claim=f"claim {i}") for i in range(5)]
+    for i, hyp in enumerate(hyps):
+        clock.now += 1
+        cache.put(score, hyp, {"score": i})
+    clock.now += vc.TOUCH_RESOLUTION
+    assert cache.get(score, hyps[0]) == {"score": 0}
+
+    assert cache.evict() == 2
+    assert [cache.get(score, hyp) is not None for hyp in hyps] == [True, False, False, True, True]
+
+def test_memoized_validators(tmp_path, monkeypatch):
+    monkeypatch.setattr(vc, "_cache", ValidationCache(tmp_path / "cache.db"))
+    calls = []
+
+    @memoized
+    def validate(hypothesis, seed=0):
+        calls.append(seed)
+        return {"ok": True, "seed": seed}
+
+    assert validate(HYP) == validate(dict(HYP, hypothesis_id="HYP_9")) == {"ok": True, "seed": 0}
+    assert validate(HYP, seed=3)["seed"] == 3
+    assert calls == [0, 3]
+    monkeypatch.setenv("VALIDATION_CACHE", "off")
+    validate(HYP)
+    assert calls == [0, 3, 0]
+    assert validate.__name__ == "validate"
+
+def test_uncacheable_results_are_returned_but_not_stored(tmp_path, monkeypatch):
+    monkeypatch.setattr(vc, "_cache", ValidationCache(tmp_path / "cache.db"))
+    calls = []
+
+    @memoized
+    def validate(hypothesis):
+        calls.append(hypothesis["claim"])
+        raise vc.Uncacheable({})
+
+    assert validate(HYP) == {} and validate(HYP) == {}
+    assert len(calls) == 2 and vc._cache.stats()["entries"] == 0
@@ -0,0 +1,69 @@
+import zlib
+import numpy as np
+from src.motherboard.segment_log import SegmentLog
+from src.motherboard.vector_index import VectorIndex
+
+DIM = 32
+
+def bag_of_words(texts):
+    """A stand-in embedder: the sum of one fixed random vector per word."""
+    vectors = np.zeros((len(texts), DIM), dtype=np.float32)
+    for i, text in enumerate(texts):
+        for word in text.lower().split():
+            vectors[i] += np.random.default_rng(zlib.crc32(word.encode())).standard_normal(DIM)
+    return vectors
+
+def _unit(rows, seed=0):
+    vectors = np.random.default_rng(seed).standard_normal((rows, DIM)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+def test_fed_from_the_facts_stream(tmp_path):
+    stream = SegmentLog(tmp_path / "facts")
+    stream.append_many([
+        {"fact_id": "F1", "content": {"claim": "copper conducts electricity"}},
+        {"fact_id": "F2", "content": {"claim": "glass is an insulator"}},
+        {"fact_id": "F3", "content": "silver conducts electricity best"},
+    ])
+    index = VectorIndex(tmp_path / "index.npz", embedder=bag_of_words, dim=DIM)
+    index.refresh({"facts": stream})
+    assert sorted(fact_id for fact_id, _ in index.search(["what conducts electricity"], k=2)[0]) == ["F1", "F3"]
+
+    stream.append({"op": "update", "fact_id": "F2", "changes": {"content": {"claim": "gold conducts electricity"}}})
+    stream.append({"op": "retract", "fact_id": "F1", "reason": "test"})
+    index.refresh({"facts": stream})
+    hits = index.search(["conducts electricity"], k=10)[0]
+    assert sorted(fact_id for fact_id, _ in hits) == ["F2", "F3"]
+    assert index.stats()["vectors"] == 2 and index.stats()["masked"] >= 1
+    assert index.stats()["facts_generation"] == 5
+
+def test_ivf_search_with_every_list_probed_is_exact(tmp_path):
+    vectors = _unit(600)
+    ids = [f"F{i}" for i in range(600)]
+    index = VectorIndex(tmp_path / "index.npz", embedder=bag_of_words, dim=DIM, flat_limit=100, nprobe=1000)
+    index.add(ids, vectors)
+    assert index.stats()["trained"] and index.stats()["lists"] > 1
+
+    queries = _unit(5, seed=1)
+    exact = np.argsort(-(queries @ vectors.T), axis=1)[:, :10]
+    for hits, expected in zip(index.search_vectors(queries, k=10), exact):
+        assert [fact_id for fact_id, _ in hits] == [ids[i] for i in expected]
+
+    index.nprobe = 2
+    assert all(len(hits) == 10 for hits in index.search_vectors(queries, k=10))
+
+def test_checkpoint_round_trip(tmp_path):
+    stream = SegmentLog(tmp_path / "facts")
+    stream.append_many([{"fact_id": f"F{i}", "content": f"fact number {i} about topic {i % 3}"} for i in range(30)])
+    index = VectorIndex(tmp_path / "index.npz", embedder=bag_of_words, dim=DIM)
+    index.refresh({"facts": stream})
+    index.remove("F4")
+    index.save()
+
+    restored = VectorIndex(tmp_path / "index.npz", embedder=bag_of_words, dim=DIM)
+    restored.load({"facts": stream})
+    assert len(restored) == 29
+    assert restored.search(["topic 1"], k=5) == index.search(["topic 1"], k=5)
+
+    stale = VectorIndex(tmp_path / "index.npz", embedder=bag_of_words, dim=DIM)
+    stale.load({"facts": SegmentLog(tmp_path / "other")})
+    assert len(stale) == 0, "a checkpoint ahead of the streams is ignored"
@@ -0,0 +1,51 @@
+import math
+import random
+import pytest
+from src.approver_god.policy.thresholds import GATEKEEPER_THRESHOLDS, THRESHOLDS, criteria, first_failing_threshold
+from src.approver_god.policy.vectorized import NO_FAILURE, compile_policy
+
+def _random_rows(thresholds, count, seed=7):
+    """Metric dicts around each bound: below, at and above it, missing, and NaN."""
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        row = {}
+        for _, metric, _, bound, _ in criteria(thresholds):
+            choice = rng.random()
+            if choice < 0.1:
+                continue
+            if choice < 0.15:
+                row[metric] = math.nan
+            elif choice < 0.35:
+                row[metric] = bound
+            else:
+                row[metric] = bound + rng.uniform(-0.05, 0.05)
+        rows.append(row)
+    return rows
+
+@pytest.mark.parametrize("thresholds", [THRESHOLDS, GATEKEEPER_THRESHOLDS], ids=["policy", "gatekeeper"])
+def test_matches_first_failing_threshold(thresholds):
+    rows = _random_rows(thresholds, 2000)
+    policy = compile_policy(thresholds)
+    passed, failures = policy.evaluate(policy.metrics_array(rows))
+    expected = [first_failing_threshold(row, thresholds) for row in rows]
+    assert list(policy.failure_names(failures)) == expected
+    assert list(passed) == [name is None for name in expected]
+    assert any(passed) and not all(passed)
+
+def test_missing_columns_and_empty_batches():
+    policy = compile_policy(GATEKEEPER_THRESHOLDS)
+    stats_only = compile_policy({"min_stats_confidence": 0.5}).metrics_array([{"stats_confidence": 1.0}])
+    passed, failures = policy.evaluate(stats_only)
+    assert list(policy.failure_names(failures)) == ["max_contradictions"]
+    passed, failures = policy.evaluate(policy.metrics_array([]))
+    assert len(passed) == len(failures) == 0
+    assert failures.dtype.kind == "i" and NO_FAILURE == -1
+
+def test_compilations_are_cached_by_content():
+    edited = dict(GATEKEEPER_THRESHOLDS)
+    assert compile_policy(edited) is compile_policy(GATEKEEPER_THRESHOLDS)
+    edited["min_stats_confidence"] = 0.5
+    assert compile_policy(edited) is not compile_policy(GATEKEEPER_THRESHOLDS)
+    with pytest.raises(ValueError):
+        compile_policy({"stats_confidence": 0.5})
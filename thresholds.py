@@ -23,15 +23,40 @@ THRESHOLDS = {
     "min_novelty_score": 0.3,
 }
 
+# The gatekeeper's quick gate, applied before promotion: the stats tests'
+# confidence and the number of contradictions with the relevant Earth facts.
+GATEKEEPER_THRESHOLDS = {
+    "min_stats_confidence": 0.95,
+    "max_contradictions": 0,
+}
+
+# Each "min_<metric>" / "max_<metric>" entry is one criterion on <metric>.
+# A missing metric counts as the worst value: 0.0 for a minimum, 1.0 for a maximum.
+def criteria(thresholds: dict = THRESHOLDS) -> list:
+    """
+    The policy as (name, metric, is_minimum, bound, missing value) tuples, in policy order.
+    """
+    compiled = []
+    for name, bound in thresholds.items():
+        kind, _, metric = name.partition("_")
+        if kind not in ("min", "max") or not metric:
+            raise ValueError(f"Threshold {name!r} must be named min_<metric> or max_<metric>")
+        compiled.append((name, metric, kind == "min", bound, 0.0 if kind == "min" else 1.0))
+    return compiled
+
+def first_failing_threshold(metrics: dict, thresholds: dict = THRESHOLDS):
+    """
+    The name of the first threshold the metrics miss, or None if they meet them all.
+    """
+    for name, metric, is_minimum, bound, missing in criteria(thresholds):
+        value = metrics.get(metric, missing)
+        if not (value >= bound if is_minimum else value <= bound):
+            return name
+    return None
+
 def meets_thresholds(metrics: dict) -> bool:
     """
     Checks if a given set of metrics meets the defined thresholds.
+    For many hypotheses at once, see policy/vectorized.py.
     """
-    return (
-        metrics.get("model_confidence", 0.0) >= THRESHOLDS["min_model_confidence"] and
-        metrics.get("factual_precision", 0.0) >= THRESHOLDS["min_factual_precision"] and
-        metrics.get("citation_match", 0.0) >= THRESHOLDS["min_citation_match"] and
-        metrics.get("contradiction_rate", 1.0) <= THRESHOLDS["max_contradiction_rate"] and
-        metrics.get("code_tests_pass_rate", 0.0) >= THRESHOLDS["min_code_tests_pass_rate"] and
-        metrics.get("novelty_score", 0.0) >= THRESHOLDS["min_novelty_score"]
-    )
+    return first_failing_threshold(metrics) is None
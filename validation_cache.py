@@ -0,0 +1,254 @@
+"""
+Persistent cache of validation results.
+
+Validators (stats tests, validation plans) are deterministic for a given
+hypothesis, arguments (e.g. the seed) and validator code, so their results are
+kept in a small SQLite database keyed by a hash of:
+
+- the hypothesis, without identity and bookkeeping fields, so a resubmitted or
+  retried claim hits whatever its ID (its domain is kept: validators may
+  depend on it);
+- the validator's other arguments (the seed, ...);
+- the validator's version: a hash of its source code, plus whatever else it
+  declared its results depend on (memoized(version=...), e.g. the registered
+  validation steps for run_validation_plan);
+- the policy fingerprint: a hash of THRESHOLDS and GATEKEEPER_THRESHOLDS.
+
+Editing a validator or the policy therefore changes every key, and the rows
+written under the old fingerprint are purged the first time it is seen.
+The cache is bounded to `max_entries` rows, evicting the least recently used.
+WAL mode lets the gatekeeper and its worker processes share one file.
+
+The database lives at VALIDATION_CACHE_DB (default: validation_cache.db in
+the motherboard directory). Set VALIDATION_CACHE=off to disable it.
+"""
+import functools
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Mapping, Optional, Set, Tuple
+from src.approver_god.policy.thresholds import GATEKEEPER_THRESHOLDS, THRESHOLDS
+from src.common.logging import get_logger
+
+log = get_logger("validation_cache")
+
+# Not imported from motherboard.api: worker processes would load the whole store for a path.
+VALIDATION_CACHE_DB = Path(os.getenv(
+    "VALIDATION_CACHE_DB", str(Path(__file__).resolve().parents[2] / "motherboard" / "validation_cache.db")))
+
+# Fields that identify a submission rather than state what is validated.
+IDENTITY_FIELDS = frozenset({
+    "hypothesis_id", "content_hash", "timestamp", "created_at", "updated_at", "version", "status",
+})
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    validator TEXT NOT NULL,
+    result TEXT NOT NULL,
+    last_used INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_by_use ON results (last_used);
+CREATE TABLE IF NOT EXISTS fingerprints (
+    validator TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL
+);
+"""
+
+SQL_GET = "SELECT result, last_used FROM results WHERE key = ?"
+SQL_TOUCH = "UPDATE results SET last_used = ? WHERE key = ?"
+SQL_PUT = "INSERT OR REPLACE INTO results (key, validator, result, last_used) VALUES (?, ?, ?, ?)"
+SQL_COUNT = "SELECT COUNT(*) FROM results"
+SQL_EVICT = "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY last_used, rowid LIMIT ?)"
+SQL_FINGERPRINT = "SELECT fingerprint FROM fingerprints WHERE validator = ?"
+SQL_SET_FINGERPRINT = "INSERT OR REPLACE INTO fingerprints (validator, fingerprint) VALUES (?, ?)"
+SQL_PURGE = "DELETE FROM results WHERE validator = ?"
+
+# last_used is only rewritten when older than this, so hits are reads. Rows
+# with equal last_used are evicted in insertion (rowid) order.
+TOUCH_RESOLUTION = 60
+EVICT_EVERY = 100
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+
+def validator_name(validator: Callable) -> str:
+    validator = inspect.unwrap(validator)
+    return f"{validator.__module__}.{validator.__qualname__}"
+
+@functools.lru_cache(maxsize=None)
+def validator_version(validator: Callable) -> str:
+    """Hash of the validator's source (its bytecode if the source is unavailable)."""
+    validator = inspect.unwrap(validator)
+    try:
+        return _sha256(inspect.getsource(validator))
+    except (OSError, TypeError):
+        return hashlib.sha256(validator.__code__.co_code).hexdigest()
+
+# Validator name -> callable returning the version of code it delegates to (see memoized).
+_dependency_versions: Dict[str, Callable[[], str]] = {}
+
+def policy_fingerprint() -> str:
+    return _sha256(_dumps([THRESHOLDS, GATEKEEPER_THRESHOLDS]))
+
+def hypothesis_key(hypothesis: Mapping[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in hypothesis.items() if k not in IDENTITY_FIELDS}
+
+class ValidationCache:
+    """Size-bounded LRU of validator results in SQLite; see the module docstring."""
+
+    def __init__(self, path: Path, max_entries: int = 100000, busy_timeout_ms: int = 5000):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.busy_timeout_ms = busy_timeout_ms
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._checked: Set[Tuple[str, str]] = set()
+        self._puts = 0
+        self._stats = {"hits": 0, "misses": 0, "puts": 0, "evicted": 0}
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(str(self.path), isolation_level=None, cached_statements=64)
+            conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
+
+    def _key(self, validator: Callable, hypothesis: Mapping[str, Any], args: Mapping[str, Any]) -> Tuple[str, str]:
+        """(validator name, cache key), after purging rows of an outdated fingerprint."""
+        name = validator_name(validator)
+        dependencies = _dependency_versions.get(name)
+        version = validator_version(validator) + (dependencies() if dependencies is not None else "")
+        fingerprint = _sha256(version + policy_fingerprint())
+        if (name, fingerprint) not in self._checked:
+            conn = self._conn()
+            row = conn.execute(SQL_FINGERPRINT, (name,)).fetchone()
+            if row is None or row[0] != fingerprint:
+                purged = conn.execute(SQL_PURGE, (name,)).rowcount
+                conn.execute(SQL_SET_FINGERPRINT, (name, fingerprint))
+                if purged:
+                    log.info(f"{name} or the policy changed; dropped {purged} cached results")
+            with self._lock:
+                self._checked.add((name, fingerprint))
+        return name, _sha256(_dumps([name, fingerprint, hypothesis_key(hypothesis), dict(args)]))
+
+    def get(self, validator: Callable, hypothesis: Mapping[str, Any],
+            args: Optional[Mapping[str, Any]] = None) -> Optional[Any]:
+        """The cached result of validator(hypothesis, **args), or None."""
+        _, key = self._key(validator, hypothesis, args or {})
+        conn = self._conn()
+        row = conn.execute(SQL_GET, (key,)).fetchone()
+        with self._lock:
+            self._stats["hits" if row is not None else "misses"] += 1
+        if row is None:
+            return None
+        now = int(time.time())
+        if now - row[1] >= TOUCH_RESOLUTION:
+            conn.execute(SQL_TOUCH, (now, key))
+        return json.loads(row[0])
+
+    def put(self, validator: Callable, hypothesis: Mapping[str, Any], result: Any,
+            args: Optional[Mapping[str, Any]] = None) -> None:
+        if result is None:
+            return
+        name, key = self._key(validator, hypothesis, args or {})
+        conn = self._conn()
+        conn.execute(SQL_PUT, (key, name, _dumps(result), int(time.time())))
+        with self._lock:
+            self._stats["puts"] += 1
+            self._puts += 1
+            evict = self._puts % EVICT_EVERY == 0
+        if evict:
+            self.evict()
+
+    def evict(self) -> int:
+        """Drops the least recently used rows beyond max_entries. Returns how many."""
+        conn = self._conn()
+        excess = conn.execute(SQL_COUNT).fetchone()[0] - self.max_entries
+        if excess <= 0:
+            return 0
+        removed = conn.execute(SQL_EVICT, (excess,)).rowcount
+        with self._lock:
+            self._stats["evicted"] += removed
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["entries"] = self._conn().execute(SQL_COUNT).fetchone()[0]
+        return stats
+
+_cache: Optional[ValidationCache] = None
+_cache_lock = threading.Lock()
+
+def validation_cache() -> Optional[ValidationCache]:
+    """
+    This process' cache (VALIDATION_CACHE_SIZE rows, default 100000), or None
+    when VALIDATION_CACHE=off.
+    """
+    global _cache
+    if os.getenv("VALIDATION_CACHE", "on").lower() in ("off", "0", "false"):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ValidationCache(VALIDATION_CACHE_DB, int(os.getenv("VALIDATION_CACHE_SIZE", "100000")))
+        return _cache
+
+class Uncacheable(Exception):
+    """
+    Raised by a memoized validator to return `result` without caching it, e.g.
+    when a step failed or timed out and a retry may well come out differently.
+    """
+
+    def __init__(self, result: Any):
+        super().__init__(result)
+        self.result = result
+
+def memoized(validator: Optional[Callable] = None, *, version: Optional[Callable[[], str]] = None) -> Callable:
+    """
+    Caches validator(hypothesis, ...) by content (see the module docstring).
+    The decorated function keeps its name, so it still pickles for process pools.
+    A validator raising Uncacheable returns its result uncached. A validator
+    that delegates its work elsewhere passes `version`, returning a hash of that
+    code, so editing it invalidates the cached results too.
+    """
+    if validator is None:
+        return functools.partial(memoized, version=version)
+    if version is not None:
+        _dependency_versions[validator_name(validator)] = version
+    signature = inspect.signature(validator)
+    first = next(iter(signature.parameters))
+
+    @functools.wraps(validator)
+    def wrapper(hypothesis, *args, **kwargs):
+        cache = validation_cache()
+        if cache is None:
+            try:
+                return validator(hypothesis, *args, **kwargs)
+            except Uncacheable as e:
+                return e.result
+        bound = signature.bind(hypothesis, *args, **kwargs)
+        bound.apply_defaults()
+        extra = {k: v for k, v in bound.arguments.items() if k != first}
+        result = cache.get(validator, hypothesis, extra)
+        if result is None:
+            try:
+                result = validator(hypothesis, *args, **kwargs)
+            except Uncacheable as e:
+                return e.result
+            cache.put(validator, hypothesis, result, extra)
+        return result
+
+    return wrapper
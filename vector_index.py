@@ -0,0 +1,356 @@
+"""
+Semantic vector index over the Earth facts.
+
+Facts are embedded with the same sentence-transformers model as the ingestion
+workers (all-MiniLM-L6-v2, 384 dimensions, unit length, so cosine similarity
+is a dot product) and kept in an in-process IVF index: k-means centroids
+partition the vectors into inverted lists, and a search only scores the lists
+whose centroids are closest to the query. Below FLAT_LIMIT vectors the index
+is a single list searched exhaustively, which is both exact and fast at that
+size; the centroids are trained once it grows past it, and retrained whenever
+it has grown 4x since the last training, so lists stay around sqrt(N) vectors.
+
+Like the lineage graph, the index is fed from the facts streams: promotions
+add vectors, content updates re-embed, retractions remove (removed rows are
+masked until the next rebuild). It is checkpointed to a single .npz file with
+the stream generations it covers, and only the tail after those is replayed
+on startup.
+
+Without sentence-transformers installed, embedding_available() is False and
+callers fall back to scanning the store.
+"""
+import json
+import math
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+import numpy as np
+from src.common.logging import get_logger
+from src.motherboard.mvcc import UPDATE
+from src.motherboard.retractions import RETRACT
+from src.motherboard.storage import Stream
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # no embeddings: semantic search is unavailable
+    SentenceTransformer = None
+
+log = get_logger("vector_index")
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+DIM = 384
+FLAT_LIMIT = 20000
+DEFAULT_NPROBE = 16
+EMBED_BATCH = 256
+TRAIN_SAMPLE_PER_LIST = 64
+KMEANS_ITERATIONS = 10
+ASSIGN_CHUNK = 16384
+
+Embedder = Callable[[List[str]], np.ndarray]
+
+_model = None
+_model_lock = threading.Lock()
+
+def embedding_available() -> bool:
+    return SentenceTransformer is not None
+
+def embed(texts: List[str]) -> np.ndarray:
+    """Unit-length float32 embeddings of `texts`, one row each."""
+    global _model
+    with _model_lock:
+        if _model is None:
+            _model = SentenceTransformer(MODEL_NAME)
+    vectors = _model.encode(texts, batch_size=64, convert_to_numpy=True, normalize_embeddings=True)
+    return np.asarray(vectors, dtype=np.float32).reshape(len(texts), -1)
+
+def fact_text(content: Any) -> str:
+    """The text embedded for a fact's content: a promoted hypothesis' claim and assumptions, or the text itself."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, Mapping) and content.get("claim"):
+        assumptions = content.get("assumptions") or ()
+        return " ".join([str(content["claim"]), *(str(a) for a in assumptions)])
+    return json.dumps(content, ensure_ascii=False, sort_keys=True, default=str)
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+def _nearest(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the closest centroid for each vector, in chunks to bound memory."""
+    out = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), ASSIGN_CHUNK):
+        out[start:start + ASSIGN_CHUNK] = np.argmax(vectors[start:start + ASSIGN_CHUNK] @ centroids.T, axis=1)
+    return out
+
+def kmeans(vectors: np.ndarray, k: int, iterations: int = KMEANS_ITERATIONS, seed: int = 0) -> np.ndarray:
+    """Spherical k-means: `k` unit-length centroids. Empty clusters keep their previous centroid."""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), size=k, replace=False)].copy()
+    for _ in range(iterations):
+        assign = _nearest(vectors, centroids)
+        order = np.argsort(assign, kind="stable")
+        counts = np.bincount(assign, minlength=k)
+        used = np.flatnonzero(counts)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[used]
+        centroids[used] = np.add.reduceat(vectors[order], starts, axis=0)
+        centroids = _normalize(centroids)
+    return centroids
+
+class _InvertedList:
+    """The vectors of one IVF list, stored contiguously so a probe is a single matrix product."""
+
+    __slots__ = ("vectors", "rows", "size")
+
+    def __init__(self, dim: int, capacity: int = 16):
+        self.vectors = np.empty((capacity, dim), dtype=np.float32)
+        self.rows = np.empty(capacity, dtype=np.int64)
+        self.size = 0
+
+    def extend(self, vectors: np.ndarray, rows: np.ndarray) -> None:
+        end = self.size + len(rows)
+        if end > len(self.rows):
+            capacity = max(end, 2 * len(self.rows))
+            grown = np.empty((capacity, self.vectors.shape[1]), dtype=np.float32)
+            grown[:self.size] = self.vectors[:self.size]
+            self.vectors = grown
+            self.rows = np.resize(self.rows, capacity)
+        self.vectors[self.size:end] = vectors
+        self.rows[self.size:end] = rows
+        self.size = end
+
+class VectorIndex:
+    """IVF index of fact embeddings keyed by fact_id, with an incremental .npz checkpoint."""
+
+    def __init__(self, path: Path, backend: str = "", embedder: Optional[Embedder] = None,
+                 dim: int = DIM, nprobe: int = DEFAULT_NPROBE, flat_limit: int = FLAT_LIMIT,
+                 checkpoint_every: int = 10000):
+        self.path = Path(path)
+        self.backend = backend
+        self.embedder = embedder or embed
+        self.dim = dim
+        self.nprobe = nprobe
+        self.flat_limit = flat_limit
+        self.checkpoint_every = checkpoint_every
+        self.generations: Dict[str, int] = {}
+        self._lock = threading.RLock()
+        self._reset()
+        self._dirty = 0
+
+    def _reset(self, centroids: Optional[np.ndarray] = None) -> None:
+        self.centroids = centroids
+        self.trained_size = 0
+        self._lists = [_InvertedList(self.dim) for _ in range(1 if centroids is None else len(centroids))]
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._alive = np.zeros(0, dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    # --- writes ---
+
+    def add(self, fact_ids: List[str], vectors: np.ndarray) -> None:
+        """Adds (or replaces) the vectors of `fact_ids`; `vectors` must be unit length."""
+        with self._lock:
+            for fact_id in fact_ids:
+                self._remove_locked(fact_id)
+            self._append_locked(fact_ids, np.asarray(vectors, dtype=np.float32))
+            self._dirty += len(fact_ids)
+            live = len(self._rows)
+            if (self.centroids is None and live > self.flat_limit) or (
+                self.centroids is not None and live > 4 * self.trained_size
+            ):
+                self.rebuild()
+
+    def _append_locked(self, fact_ids: List[str], vectors: np.ndarray) -> None:
+        first = len(self._ids)
+        rows = np.arange(first, first + len(fact_ids), dtype=np.int64)
+        self._ids.extend(fact_ids)
+        self._rows.update(zip(fact_ids, rows.tolist()))
+        if len(self._ids) > len(self._alive):
+            self._alive = np.resize(self._alive, max(len(self._ids), 2 * len(self._alive)))
+        self._alive[first:len(self._ids)] = True
+        if self.centroids is None:
+            self._lists[0].extend(vectors, rows)
+            return
+        assign = _nearest(vectors, self.centroids)
+        for list_no in np.unique(assign):
+            mask = assign == list_no
+            self._lists[list_no].extend(vectors[mask], rows[mask])
+
+    def remove(self, fact_id: str) -> bool:
+        with self._lock:
+            removed = self._remove_locked(fact_id)
+            self._dirty += removed
+            if len(self._ids) > 2 * max(len(self._rows), self.flat_limit):
+                self.rebuild()  # mostly masked rows: compact
+            return removed
+
+    def _remove_locked(self, fact_id: str) -> bool:
+        row = self._rows.pop(fact_id, None)
+        if row is None:
+            return False
+        self._alive[row] = False
+        return True
+
+    def _live_vectors(self) -> Tuple[List[str], np.ndarray]:
+        ids, blocks = [], []
+        for lst in self._lists:
+            rows = lst.rows[:lst.size]
+            live = self._alive[rows]
+            blocks.append(lst.vectors[:lst.size][live])
+            ids.extend(self._ids[row] for row in rows[live].tolist())
+        vectors = np.concatenate(blocks) if blocks else np.empty((0, self.dim), dtype=np.float32)
+        return ids, vectors
+
+    def rebuild(self) -> None:
+        """Drops removed rows and retrains the centroids for the current size (or goes back to flat)."""
+        with self._lock:
+            ids, vectors = self._live_vectors()
+            centroids = None
+            if len(ids) > self.flat_limit:
+                nlist = int(math.sqrt(len(ids)))
+                rng = np.random.default_rng(0)
+                sample_size = min(len(ids), nlist * TRAIN_SAMPLE_PER_LIST)
+                sample = vectors[rng.choice(len(ids), size=sample_size, replace=False)]
+                centroids = kmeans(sample, nlist)
+            self._reset(centroids)
+            self._append_locked(ids, vectors)
+            self.trained_size = len(ids)
+            log.info(f"Rebuilt vector index: {len(ids)} vectors, {len(self._lists)} lists")
+
+    # --- feeding from the facts streams ---
+
+    def feed(self, stream: str, records: Iterator[Tuple[int, Dict[str, Any]]]) -> None:
+        """Applies facts-stream records in sequence order, embedding new content in batches."""
+        with self._lock:
+            pending: Dict[str, str] = {}
+            for seq, record in records:
+                if seq <= self.generations.get(stream, 0):
+                    continue
+                op, fact_id = record.get("op"), record.get("fact_id")
+                if fact_id is None:
+                    pass
+                elif op is None:
+                    pending[fact_id] = fact_text(record.get("content"))
+                elif op == UPDATE and "content" in record.get("changes", {}):
+                    pending[fact_id] = fact_text(record["changes"]["content"])
+                elif op == RETRACT:
+                    pending.pop(fact_id, None)
+                    self.remove(fact_id)
+                if len(pending) >= EMBED_BATCH:
+                    self._embed_and_add(pending)
+                self.generations[stream] = seq
+            self._embed_and_add(pending)
+
+    def _embed_and_add(self, pending: Dict[str, str]) -> None:
+        if pending:
+            fact_ids = list(pending)
+            self.add(fact_ids, _normalize(np.asarray(self.embedder(list(pending.values())), dtype=np.float32)))
+            pending.clear()
+
+    def refresh(self, streams: Dict[str, Stream]) -> None:
+        """Catches up with every facts stream, checkpointing once enough vectors changed."""
+        with self._lock:
+            for name, stream in streams.items():
+                if stream.refresh() > self.generations.get(name, 0):
+                    self.feed(name, stream.replay(after=self.generations.get(name, 0)))
+            dirty = self._dirty >= self.checkpoint_every
+        if dirty:
+            self.save()
+
+    # --- reads ---
+
+    def search(self, queries: List[str], k: int = 10) -> List[List[Tuple[str, float]]]:
+        """The `k` nearest facts to each query text, as (fact_id, cosine similarity), best first."""
+        if not queries:
+            return []
+        vectors = _normalize(np.asarray(self.embedder(queries), dtype=np.float32))
+        return self.search_vectors(vectors, k)
+
+    def search_vectors(self, vectors: np.ndarray, k: int = 10) -> List[List[Tuple[str, float]]]:
+        vectors = np.asarray(vectors, dtype=np.float32)  # float64 queries would upcast every probed list
+        with self._lock:
+            if self.centroids is None:
+                probes = np.zeros((len(vectors), 1), dtype=np.int64)
+            else:
+                nprobe = min(self.nprobe, len(self.centroids))
+                closeness = vectors @ self.centroids.T
+                probes = np.argpartition(-closeness, nprobe - 1, axis=1)[:, :nprobe]
+            results = []
+            for query, lists in zip(vectors, probes):
+                scores, rows = [], []
+                for list_no in lists:
+                    lst = self._lists[list_no]
+                    if lst.size:
+                        scores.append(lst.vectors[:lst.size] @ query)
+                        rows.append(lst.rows[:lst.size])
+                if not scores:
+                    results.append([])
+                    continue
+                scores, rows = np.concatenate(scores), np.concatenate(rows)
+                scores[~self._alive[rows]] = -np.inf
+                top = min(k, len(scores))
+                best = np.argpartition(-scores, top - 1)[:top]
+                best = best[np.argsort(-scores[best], kind="stable")]
+                results.append([(self._ids[rows[i]], float(scores[i])) for i in best if scores[i] > -np.inf])
+            return results
+
+    # --- checkpoint ---
+
+    def save(self) -> None:
+        """Writes the live vectors, grouped by list, with the generations they cover (atomically)."""
+        with self._lock:
+            ids, vectors = self._live_vectors()
+            sizes = [int(np.count_nonzero(self._alive[lst.rows[:lst.size]])) for lst in self._lists]
+            meta = {"model": MODEL_NAME, "dim": self.dim, "backend": self.backend,
+                    "generations": dict(self.generations), "trained_size": self.trained_size}
+            centroids = self.centroids if self.centroids is not None else np.empty((0, self.dim), dtype=np.float32)
+            self._dirty = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, meta=np.array(json.dumps(meta)), centroids=centroids, vectors=vectors,
+                     sizes=np.array(sizes, dtype=np.int64), ids=np.array(ids, dtype=str))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def load(self, streams: Dict[str, Stream]) -> None:
+        """Restores the checkpoint, unless it was built by another model or does not match the streams."""
+        if not self.path.exists():
+            return
+        with np.load(self.path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            generations = meta.get("generations", {})
+            if (meta.get("model"), meta.get("dim"), meta.get("backend", self.backend)) != (MODEL_NAME, self.dim, self.backend) \
+                    or any(generations.get(name, 0) > stream.refresh() for name, stream in streams.items()):
+                return
+            centroids, vectors, sizes = data["centroids"], data["vectors"], data["sizes"]
+            ids = data["ids"].tolist()
+        with self._lock:
+            self._reset(centroids if len(centroids) else None)
+            offsets = np.concatenate(([0], np.cumsum(sizes)))
+            first = 0
+            for list_no, (start, end) in enumerate(zip(offsets[:-1], offsets[1:])):
+                rows = np.arange(first, first + end - start, dtype=np.int64)
+                self._lists[list_no].extend(vectors[start:end], rows)
+                first += end - start
+            self._ids = ids
+            self._rows = {fact_id: row for row, fact_id in enumerate(ids)}
+            self._alive = np.ones(len(ids), dtype=bool)
+            self.trained_size = meta.get("trained_size", 0)
+            self.generations.update({name: int(seq) for name, seq in generations.items()})
+            self._dirty = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "vectors": len(self._rows),
+                "masked": len(self._ids) - len(self._rows),
+                "lists": len(self._lists),
+                "trained": self.centroids is not None,
+                **{f"{name}_generation": seq for name, seq in self.generations.items()},
+            }
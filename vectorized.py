@@ -0,0 +1,74 @@
+"""
+Vectorized evaluation of threshold policies (see thresholds.py).
+
+A policy dict such as THRESHOLDS is compiled once into one column comparison
+per criterion, and evaluated over a NumPy structured array of metrics, one row
+per hypothesis. Evaluation returns a pass mask and, per row, the index of the
+first criterion that failed (-1 when all passed), so re-gating a large history
+after a policy change costs a few array passes instead of a Python loop.
+
+    policy = compile_policy(THRESHOLDS)
+    passed, failures = policy.evaluate(policy.metrics_array(rows))
+    policy.failure_names(failures)   # "min_citation_match", ..., None
+"""
+import threading
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+import numpy as np
+from src.approver_god.policy.thresholds import THRESHOLDS, criteria
+
+NO_FAILURE = -1
+
+class CompiledPolicy:
+    """One threshold policy, compiled for evaluation over structured arrays."""
+
+    def __init__(self, thresholds: Mapping[str, float]):
+        self.criteria = criteria(dict(thresholds))
+        self.names = tuple(name for name, *_ in self.criteria)
+        metrics = dict.fromkeys(metric for _, metric, *_ in self.criteria)
+        self.dtype = np.dtype([(metric, np.float64) for metric in metrics])
+        self._missing = {metric: missing for _, metric, _, _, missing in self.criteria}
+        # Index NO_FAILURE (-1) is the trailing None.
+        self._failure_names = np.array(self.names + (None,), dtype=object)
+
+    def metrics_array(self, rows: Iterable[Mapping[str, Any]]) -> np.ndarray:
+        """Metric dicts as a structured array; a missing metric gets its worst value."""
+        rows = rows if isinstance(rows, (list, tuple)) else list(rows)
+        array = np.empty(len(rows), dtype=self.dtype)
+        for metric, missing in self._missing.items():
+            array[metric] = np.fromiter((row.get(metric, missing) for row in rows), np.float64, count=len(rows))
+        return array
+
+    def evaluate(self, metrics: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (passed, first failing criterion index) per row of `metrics`. Columns the
+        array lacks count as missing; NaN fails every criterion.
+        """
+        first = np.full(len(metrics), NO_FAILURE, dtype=np.int16)
+        names = metrics.dtype.names or ()
+        # Last criterion first, so the earliest failure is the one left in place.
+        for index in range(len(self.criteria) - 1, -1, -1):
+            _, metric, is_minimum, bound, missing = self.criteria[index]
+            column = metrics[metric] if metric in names else np.full(len(metrics), missing)
+            ok = column >= bound if is_minimum else column <= bound
+            first[~ok] = index
+        return first == NO_FAILURE, first
+
+    def failure_names(self, failures: np.ndarray) -> np.ndarray:
+        """Criterion names for evaluate()'s failure indices (None where the row passed)."""
+        return self._failure_names[failures]
+
+_compiled: Dict[Tuple, CompiledPolicy] = {}
+_compiled_lock = threading.Lock()
+
+def compile_policy(thresholds: Optional[Mapping[str, float]] = None) -> CompiledPolicy:
+    """
+    The compiled form of `thresholds` (default: THRESHOLDS). Compilations are
+    cached by content, so an edited policy is recompiled on its next use.
+    """
+    thresholds = THRESHOLDS if thresholds is None else thresholds
+    key = tuple(thresholds.items())
+    with _compiled_lock:
+        policy = _compiled.get(key)
+        if policy is None:
+            policy = _compiled[key] = CompiledPolicy(thresholds)
+        return policy